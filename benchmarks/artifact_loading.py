@@ -0,0 +1,92 @@
+"""
+Benchmark the loading of compiled contract classes.
+
+Compares parsing the artifact JSON (`DeprecatedCompiledClass.loads`) with
+loading the pickled class kept in the build cache by `get_contract_class`,
+in time and peak memory. The artifact is copied into the `artifacts`
+directory of a temporary project, the only place pickles are used.
+
+Usage: python benchmarks/artifact_loading.py [ARTIFACT] [--runs RUNS]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from starkware.starknet.services.api.contract_class.contract_class import (
+    DeprecatedCompiledClass,
+)
+
+from nile.common import (
+    BUILD_DIRECTORY,
+    NILE_BUILD_DIR,
+    _get_pickle_path,
+    clear_artifact_caches,
+    get_contract_class,
+)
+
+
+def parse_artifact(path):
+    """Load a contract class the way nile did before the build cache."""
+    with open(path, "r") as fp:
+        return DeprecatedCompiledClass.loads(fp.read())
+
+
+def load_cached(path):
+    """Load a contract class through get_contract_class, in a fresh process."""
+    build_directory, filename = os.path.split(path)
+    clear_artifact_caches()
+    return get_contract_class(os.path.splitext(filename)[0], (build_directory,))
+
+
+def measure(load, path, runs):
+    """Return the median time (s) and the peak memory (bytes) of a loader."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        load(path)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    load(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return statistics.median(timings), peak
+
+
+def main():
+    """Run the benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n")[0])
+    parser.add_argument("artifact", nargs="?", default=f"{NILE_BUILD_DIR}/Account.json")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    artifact = os.path.abspath(args.artifact)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as project:
+        # pickles are only used for the artifacts of the current project
+        os.chdir(project)
+        try:
+            os.makedirs(BUILD_DIRECTORY)
+            path = shutil.copy(artifact, BUILD_DIRECTORY)
+            # write the pickled class once, like the first load in a project
+            load_cached(path)
+            assert os.path.exists(_get_pickle_path(path)), "pickle not written"
+
+            size = os.path.getsize(path)
+            print(f"{args.artifact} ({size / 2**20:.1f} MiB), {args.runs} runs")
+            print(f"{'loader':<12}{'median time':>14}{'peak memory':>14}")
+            for name, load in (("json", parse_artifact), ("pickle", load_cached)):
+                median, peak = measure(load, path, args.runs)
+                print(f"{name:<12}{median * 1000:>11.1f} ms{peak / 2**20:>10.1f} MiB")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,24 @@
 import json
 import os
 
-from nile.common import ACCOUNTS_FILENAME
+from nile import database
+from nile.common import ACCOUNTS_FILENAME, DATABASE_FILENAME
 from nile.utils import hex_address, normalize_number
 
 
 def register(pubkey, address, index, alias, network):
     """Register a new account."""
     file = f"{network}.{ACCOUNTS_FILENAME}"
+    if database.is_enabled():
+        file = DATABASE_FILENAME
 
     if exists(pubkey, network):
         raise Exception(f"account-{index} already exists in {file}")
 
+    if database.is_enabled():
+        database.register_account(pubkey, address, index, alias, network)
+        return
+
     with open(file, "r") as fp:
         accounts = json.load(fp)
         # Save public key as hex
@@ -29,6 +36,10 @@ def register(pubkey, address, index, alias, network):
 
 def unregister(address, network):
     """Unregister an account."""
+    if database.is_enabled():
+        database.unregister_account(address, network)
+        return
+
     file = f"{network}.{ACCOUNTS_FILENAME}"
 
     with open(file, "r") as fp:
@@ -51,6 +62,12 @@ def exists(pubkey, network):
 
 def load(pubkey, network):
     """Load account that matches a pubkey."""
+    if database.is_enabled():
+        account = database.load_account(pubkey, network)
+        if account is not None:
+            yield account
+        return
+
     file = f"{network}.{ACCOUNTS_FILENAME}"
 
     if not os.path.exists(file):
@@ -68,8 +85,22 @@ def load(pubkey, network):
 
 def current_index(network):
     """Return the length of the accounts. Used as the next index."""
+    if database.is_enabled():
+        return database.count_accounts(network)
+
     file = f"{network}.{ACCOUNTS_FILENAME}"
 
     with open(file) as fp:
         accounts = json.load(fp)
         return len(accounts.keys())
+
+
+def load_all(network):
+    """Return the data of every account, by hex public key."""
+    if database.is_enabled():
+        return database.load_accounts(network)
+
+    file = f"{network}.{ACCOUNTS_FILENAME}"
+
+    with open(file) as fp:
+        return json.load(fp)
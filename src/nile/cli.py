@@ -1,15 +1,19 @@
 #!/usr/bin/env python
 """Nile CLI entry point."""
 
+import json
 import logging
 import os
 from functools import update_wrapper
 
 import asyncclick as click
+from asyncclick.core import ParameterSource
 
+from nile import database
 from nile.common import is_alias
 from nile.core.call_or_invoke import call_or_invoke as call_or_invoke_command
 from nile.core.clean import clean as clean_command
+from nile.core.compile import BACKENDS
 from nile.core.compile import compile as compile_command
 from nile.core.init import init as init_command
 from nile.core.node import node as node_command
@@ -18,7 +22,9 @@ from nile.core.run import run as run_command
 from nile.core.test import test as test_command
 from nile.core.types.account import get_counterfactual_address, try_get_account
 from nile.core.version import version as version_command
+from nile.core.watch import watch as watch_command
 from nile.signer import Signer
+from nile.starknet_cli.gateway import get_client_pool
 from nile.utils import hex_address, normalize_number, shorten_address
 from nile.utils.get_accounts import get_accounts as get_accounts_command
 from nile.utils.get_accounts import (
@@ -27,6 +33,7 @@ from nile.utils.get_accounts import (
 from nile.utils.get_balance import get_balance as get_balance_command
 from nile.utils.get_nonce import get_nonce as get_nonce_command
 from nile.utils.status import status as status_command
+from nile.utils.status import track as track_command
 
 logging.basicConfig(level=logging.DEBUG, format="%(message)s")
 logging.getLogger("asyncio").setLevel(logging.WARNING)
@@ -112,13 +119,16 @@ def _validate_network(_ctx, _param, value):
 @click.group()
 @click.option("--stack_trace/--no_stack_trace", default=False)
 @click.pass_context
-def cli(ctx, stack_trace):
+async def cli(ctx, stack_trace):
     """Nile CLI group."""
     # ensure that ctx.obj exists and is a dict
     ctx.ensure_object(dict)
 
     ctx.obj["STACK_TRACE"] = stack_trace
 
+    # close the pooled gateway connections once the command is done
+    await ctx.with_async_resource(get_client_pool())
+
 
 @cli.command()
 @enable_stack_trace
@@ -251,10 +261,15 @@ def counterfactual_address(ctx, signer, salt):
 
 @cli.command()
 @click.argument("signer", nargs=1)
-@click.argument("address_or_alias", nargs=1)
-@click.argument("method", nargs=1)
+@click.argument("address_or_alias", nargs=1, required=False)
+@click.argument("method", nargs=1, required=False)
 @click.argument("params", nargs=-1)
 @click.option("--max_fee", type=int, nargs=1)
+@click.option(
+    "--batch",
+    type=click.Path(exists=True, dir_okay=False),
+    help="JSON file with a list of [address_or_alias, method, params] calls.",
+)
 @network_option
 @query_option
 @watch_option
@@ -267,24 +282,42 @@ async def send(
     params,
     network,
     max_fee,
+    batch,
     query,
     watch_mode,
 ):
-    """Invoke a contract's method through an Account."""
+    """
+    Invoke a contract's method through an Account.
+
+    $ nile send SIGNER --batch calls.json
+      Invokes all the calls in calls.json within a single transaction
+    """
+    if batch is not None:
+        if address_or_alias is not None:
+            raise click.UsageError("--batch reads the calls from file, remove them")
+        with open(batch, "r") as fp:
+            calls = json.load(fp)
+    elif method is None:
+        raise click.UsageError("Missing ADDRESS_OR_ALIAS and METHOD, or --batch")
+
     account = await try_get_account(signer, network, watch_mode="track")
     if account is not None:
-        print(
-            "Calling {} on {} with params: {}".format(
-                method, address_or_alias, [x for x in params]
+        if batch is not None:
+            print(f"Calling {len(calls)} methods from {batch}")
+            transaction = await account.send_many(calls, max_fee=max_fee)
+        else:
+            print(
+                "Calling {} on {} with params: {}".format(
+                    method, address_or_alias, [x for x in params]
+                )
             )
-        )
 
-        transaction = await account.send(
-            address_or_alias,
-            method,
-            params,
-            max_fee=max_fee,
-        )
+            transaction = await account.send(
+                address_or_alias,
+                method,
+                params,
+                max_fee=max_fee,
+            )
 
         await run_transaction(tx=transaction, query_flag=query, watch_mode=watch_mode)
 
@@ -329,9 +362,22 @@ def test(contracts):
 @click.option("--cairo_path")
 @click.option("--account_contract", is_flag="True")
 @click.option("--disable-hint-validation", is_flag=True)
+@click.option("--jobs", "-j", type=click.IntRange(min=1), default=1)
+@click.option("--force", is_flag=True)
+@click.option("--backend", type=click.Choice(BACKENDS), default="subprocess")
+@click.option("--watch", is_flag=True)
 @enable_stack_trace
 def compile(
-    ctx, contracts, directory, cairo_path, account_contract, disable_hint_validation
+    ctx,
+    contracts,
+    directory,
+    cairo_path,
+    account_contract,
+    disable_hint_validation,
+    jobs,
+    force,
+    backend,
+    watch,
 ):
     """
     Compile cairo contracts.
@@ -344,9 +390,37 @@ def compile(
 
     $ compile.py contracts/foo.cairo contracts/bar.cairo
       Compiles foo.cairo and bar.cairo
+
+    $ compile.py --jobs 8
+      Compiles all contracts in CONTRACTS_DIRECTORY, up to 8 at a time
+
+    $ compile.py --force
+      Compiles all contracts in CONTRACTS_DIRECTORY, even if up to date
+
+    $ compile.py --backend in-process --jobs 8
+      Compiles all contracts in CONTRACTS_DIRECTORY within 8 worker processes
+
+    $ compile.py --watch
+      Compiles all contracts in CONTRACTS_DIRECTORY, then the affected ones
+      every time a Cairo file changes
     """
+    if watch:
+        if len(contracts) > 0:
+            raise click.UsageError("--watch compiles all contracts, remove the paths")
+
+        return watch_command(
+            directory, cairo_path, account_contract, disable_hint_validation, jobs
+        )
+
     compile_command(
-        contracts, directory, cairo_path, account_contract, disable_hint_validation
+        contracts,
+        directory,
+        cairo_path,
+        account_contract,
+        disable_hint_validation,
+        jobs=jobs,
+        force=force,
+        backend=backend,
     )
 
 
@@ -357,6 +431,27 @@ def clean(ctx):
     clean_command()
 
 
+@cli.group()
+def db():
+    """Keep deployments, declarations and accounts in a SQLite database."""
+
+
+@db.command("import")
+@enable_stack_trace
+def db_import(ctx):
+    """Copy the deployments, declarations and accounts files into nile.db."""
+    networks = database.import_files()
+    logging.info(f"✅ Imported {', '.join(networks) or 'no networks'}")
+
+
+@db.command("export")
+@enable_stack_trace
+def db_export(ctx):
+    """Write the deployments, declarations and accounts in nile.db to files."""
+    networks = database.export_files()
+    logging.info(f"✅ Exported {', '.join(networks) or 'no networks'}")
+
+
 @cli.command()
 @click.option("--host", default="127.0.0.1")
 @click.option("--port", default=5050)
@@ -404,12 +499,13 @@ async def debug(ctx, tx_hash, network, contracts_file):
 
 
 @cli.command()
-@click.argument("tx_hash", nargs=1)
+@click.argument("tx_hashes", nargs=-1)
 @click.option("--contracts_file", nargs=1)
+@click.option("--from-file", "from_file", type=click.Path(exists=True))
 @network_option
 @watch_option
 @enable_stack_trace
-async def status(ctx, tx_hash, network, watch_mode, contracts_file):
+async def status(ctx, tx_hashes, network, watch_mode, contracts_file, from_file):
     """
     Get the status of a transaction.
 
@@ -421,25 +517,57 @@ async def status(ctx, tx_hash, network, watch_mode, contracts_file):
 
     $ nile status --debug transaction_hash
       Same as `status --track` then locate errors if rejected using local artifacts
+
+    $ nile status transaction_hash_1 transaction_hash_2 ...
+      Get the current status of many transactions, without waiting
+
+    $ nile status --track transaction_hash_1 transaction_hash_2 ...
+      Wait for the final status of many transactions, following the new blocks
+
+    $ nile status --track --from-file hashes.txt
+      Same, reading the transaction hashes from a file (one per line)
     """
-    await status_command(
-        normalize_number(tx_hash),
-        network,
-        watch_mode=watch_mode,
-        contracts_file=contracts_file,
-    )
+    if from_file is not None:
+        with open(from_file, "r") as fp:
+            tx_hashes += tuple(line.strip() for line in fp if line.strip())
+
+    if len(tx_hashes) == 0:
+        raise click.UsageError("Missing transaction hash (TX_HASHES or --from-file)")
+
+    tx_hashes = [normalize_number(tx_hash) for tx_hash in tx_hashes]
+
+    # `--debug` is the default of the other commands, not a request to wait
+    # for many transactions (a single one keeps being tracked and debugged)
+    source = click.get_current_context().get_parameter_source("watch_mode")
+    if len(tx_hashes) > 1 and source == ParameterSource.DEFAULT:
+        watch_mode = None
+
+    if watch_mode is not None and len(tx_hashes) > 1:
+        await track_command(
+            tx_hashes, network, watch_mode=watch_mode, contracts_file=contracts_file
+        )
+    else:
+        # without a watch flag, query each status once without waiting
+        for tx_hash in tx_hashes:
+            await status_command(
+                tx_hash,
+                network,
+                watch_mode=watch_mode,
+                contracts_file=contracts_file,
+            )
 
 
 @cli.command()
 @click.option("--predeployed/--registered", default=False)
+@click.option("--seed", type=int, help="Seed the devnet node was started with.")
 @network_option
 @enable_stack_trace
-async def get_accounts(ctx, network, predeployed):
+async def get_accounts(ctx, network, predeployed, seed):
     """Retrieve and manage deployed accounts."""
     if not predeployed:
         await get_accounts_command(network)
     else:
-        await get_predeployed_accounts_command(network)
+        await get_predeployed_accounts_command(network, seed)
 
 
 @cli.command()
@@ -1,7 +1,10 @@
 """Nile common module."""
 
+import hashlib
 import json
+import logging
 import os
+import pickle
 import re
 from pathlib import Path
 
@@ -16,19 +19,46 @@ from starkware.starknet.services.api.contract_class.contract_class import (
 
 from nile.utils import normalize_number, str_to_felt
 
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:
+    import importlib_metadata
+
 CONTRACTS_DIRECTORY = "contracts"
 BUILD_DIRECTORY = "artifacts"
 TEMP_DIRECTORY = ".temp"
 ABIS_DIRECTORY = f"{BUILD_DIRECTORY}/abis"
+BUILD_CACHE_DIRECTORY = f"{BUILD_DIRECTORY}/.cache"
+BUILD_CACHE_MANIFEST = f"{BUILD_CACHE_DIRECTORY}/manifest.json"
+CLASS_HASH_INDEX_FILENAME = "class_hashes.json"
 NILE_ROOT_PATH = os.path.dirname(os.path.realpath(__file__)).replace("/core", "")
 NILE_BUILD_DIR = f"{NILE_ROOT_PATH}/{BUILD_DIRECTORY}"
 NILE_ABIS_DIR = f"{NILE_ROOT_PATH}/{ABIS_DIRECTORY}"
 NILE_ARTIFACTS_PATH = (NILE_BUILD_DIR, NILE_ABIS_DIR)
+# class hashes of the artifacts shipped with nile, see `get_account_class_hash`
+NILE_CLASS_HASHES = {
+    "Account": 0x58D97F7D76E78F44905CC30CB65B91EA49A4B908A76703C54197BCA90F81773,
+}
 DEPLOYMENTS_FILENAME = "deployments.txt"
 DECLARATIONS_FILENAME = "declarations.txt"
 ACCOUNTS_FILENAME = "accounts.json"
 NODE_FILENAME = "node.json"
+DATABASE_FILENAME = "nile.db"
+RECEIPTS_FILENAME = "receipts.jsonl"
+PREDEPLOYED_ACCOUNTS_FILENAME = "predeployed_accounts.json"
+# pooled gateway sessions, see `nile.starknet_cli.gateway.ClientPool`
+GATEWAY_CONNECTIONS_LIMIT = 100
+GATEWAY_CONNECTIONS_LIMIT_PER_HOST = 20
+GATEWAY_KEEPALIVE_SECONDS = 30
+RECEIPT_CACHE_SIZE = 10000
+# transaction status polling: fast polls first, then exponential backoff
+POLL_INITIAL_SECONDS = 0.25
+POLL_FAST_ATTEMPTS = 4
+POLL_BACKOFF_FACTOR = 2
 RETRY_AFTER_SECONDS = 20
+# batch tracking: blocks fetched per poll, polls before querying a tx directly
+TRACKER_MAX_BLOCKS_PER_POLL = 10
+TRACKER_STRAGGLER_POLLS = 3
 TRANSACTION_VERSION = 1
 QUERY_VERSION_BASE = 2**128
 QUERY_VERSION = QUERY_VERSION_BASE + TRANSACTION_VERSION
@@ -155,28 +185,264 @@ def is_alias(param):
 
 
 def get_contract_class(contract_name, overriding_path=None):
-    """Return the contract_class for a given contract name."""
-    base_path = (
-        overriding_path if overriding_path else (BUILD_DIRECTORY, ABIS_DIRECTORY)
-    )
-    with open(f"{base_path[0]}/{contract_name}.json", "r") as fp:
-        contract_class = DeprecatedCompiledClass.loads(fp.read())
+    """
+    Return the contract_class for a given contract name.
 
-    return contract_class
+    Parsed classes are cached for the whole process, and reloaded only
+    when the artifact file changes (see `get_artifact_stamp`). Across
+    processes, the classes of the project's own artifacts are loaded from
+    a pickled copy in the build cache directory, much faster to read than
+    the artifact JSON. A pickle is only loaded once its JSON header matches
+    the sha256 of the artifact and the compiler version.
+    """
+    path = _get_artifact_path(contract_name, overriding_path)
+    return _memoize(_contract_classes, path, _load_contract_class)
 
 
 def get_class_hash(contract_name, overriding_path=None):
-    """Return the class_hash for a given contract name."""
-    contract_class = get_contract_class(contract_name, overriding_path)
+    """
+    Return the class_hash for a given contract name.
+
+    The hash is read from the class hash index written by `nile compile`
+    when the indexed artifact content matches, or computed otherwise.
+    Results are cached like the contract classes.
+    """
+    path = _get_artifact_path(contract_name, overriding_path)
+    return _memoize(_class_hashes, path, _get_class_hash)
+
+
+def get_class_hash_index_path(build_directory=BUILD_DIRECTORY):
+    """Return the path of the class hash index of a build directory."""
+    return f"{build_directory}/.cache/{CLASS_HASH_INDEX_FILENAME}"
+
+
+def load_class_hash_index(build_directory=BUILD_DIRECTORY):
+    """Return the class hash index of a build directory, or {} if missing."""
+    try:
+        with open(get_class_hash_index_path(build_directory), "r") as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        # a missing or corrupt index only costs recomputing the hashes
+        return {}
+
+
+def update_class_hash_index(
+    contract_names, build_directory=BUILD_DIRECTORY, entries=None
+):
+    """
+    Index the class hashes of compiled contracts, keyed by contract name.
+
+    @param entries: Index entries already computed by the compile workers,
+        keyed by contract name. None entries are dropped from the index.
+    """
+    index = load_class_hash_index(build_directory)
+    entries = entries if entries else {}
+
+    for contract_name in contract_names:
+        if contract_name in entries:
+            entry = entries[contract_name]
+        else:
+            entry = get_class_hash_index_entry(contract_name, build_directory)
+
+        if entry is None:
+            index.pop(contract_name, None)
+        else:
+            index[contract_name] = entry
+
+    file = get_class_hash_index_path(build_directory)
+    os.makedirs(os.path.dirname(file), exist_ok=True)
+    # write aside and rename, so concurrent readers never see a partial index
+    with open(f"{file}.tmp", "w") as fp:
+        json.dump(index, fp, indent=2, sort_keys=True)
+    os.replace(f"{file}.tmp", file)
+
+
+def get_class_hash_index_entry(contract_name, build_directory=BUILD_DIRECTORY):
+    """Return the class hash index entry of a compiled contract, or None."""
+    path = _get_artifact_path(contract_name, (build_directory, None))
+    if not os.path.exists(path):
+        return None
+
+    try:
+        class_hash = get_class_hash(contract_name, (build_directory, None))
+    except Exception as e:
+        # the index is an optimization, never fail a build because of it
+        logging.warning(f"⚠️  Could not compute the class hash of {path}: {e}")
+        return None
+
+    return {"sha256": hash_file(path), "class_hash": hex(class_hash)}
+
+
+def hash_file(path):
+    """Return the sha256 hex digest of a file's content."""
+    with open(path, "rb") as fp:
+        return hashlib.sha256(fp.read()).hexdigest()
+
+
+def get_compiler_version():
+    """Return the version of the installed Cairo compiler."""
+    try:
+        return importlib_metadata.version("cairo-lang")
+    except importlib_metadata.PackageNotFoundError:
+        return None
+
+
+def compute_class_hash(contract_class):
+    """Return the class_hash of a contract class, bypassing every cache."""
     return compute_deprecated_class_hash(
         contract_class=contract_class, hash_func=pedersen_hash
     )
 
 
-def get_account_class_hash(contract="Account"):
-    """Return the class_hash of an Account contract."""
+def get_artifact_stamp(path):
+    """Return the (resolved path, mtime, size) identifying an artifact version."""
+    path = os.path.realpath(path)
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def clear_artifact_caches():
+    """Forget the contract classes and class hashes cached so far."""
+    _contract_classes.clear()
+    _class_hashes.clear()
+
+
+# resolved artifact path => (stamp, value)
+_contract_classes = {}
+_class_hashes = {}
+
+
+def _get_artifact_path(contract_name, overriding_path=None):
+    base_path = (
+        overriding_path if overriding_path else (BUILD_DIRECTORY, ABIS_DIRECTORY)
+    )
+    return f"{base_path[0]}/{contract_name}.json"
+
+
+def _memoize(cache, path, load):
+    stamp = get_artifact_stamp(path)
+    cached = cache.get(stamp[0])
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    value = load(path)
+    # keyed by path, so a rebuilt artifact replaces its stale entry
+    cache[stamp[0]] = (stamp, value)
+    return value
+
+
+def _load_contract_class(path):
+    with open(path, "rb") as fp:
+        artifact = fp.read()
+
+    # only the project's own build directory is trusted with pickles
+    if not _is_project_artifact(path):
+        return DeprecatedCompiledClass.loads(artifact.decode())
+
+    # the pickle is only valid for this very artifact and compiler version
+    header = {
+        "sha256": hashlib.sha256(artifact).hexdigest(),
+        "compiler": get_compiler_version(),
+    }
+    pickle_path = _get_pickle_path(path)
+    contract_class = _read_pickle(pickle_path, header)
+    if contract_class is not None:
+        return contract_class
+
+    contract_class = DeprecatedCompiledClass.loads(artifact.decode())
+    _write_pickle(pickle_path, header, contract_class)
+    return contract_class
+
+
+def _read_pickle(pickle_path, header):
+    """Unpickle a contract class, only if its header matches the artifact."""
+    try:
+        with open(pickle_path, "rb") as fp:
+            pickle_header = json.loads(fp.readline())
+            data = fp.read()
+    except (OSError, ValueError):
+        return None
+
+    # check the stamp before unpickling anything
+    if (
+        not isinstance(pickle_header, dict)
+        or pickle_header.pop("pickle_sha256", None) != hashlib.sha256(data).hexdigest()
+        or pickle_header != header
+    ):
+        return None
+
+    try:
+        return pickle.loads(data)
+    except Exception:
+        # unpicklable, e.g. after a cairo-lang update: fall back to the artifact
+        return None
+
+
+def _write_pickle(pickle_path, header, contract_class):
+    try:
+        data = pickle.dumps(contract_class, pickle.HIGHEST_PROTOCOL)
+        header = {**header, "pickle_sha256": hashlib.sha256(data).hexdigest()}
+        os.makedirs(os.path.dirname(pickle_path), exist_ok=True)
+        tmp_path = f"{pickle_path}.{os.getpid()}"
+        with open(tmp_path, "wb") as fp:
+            fp.write(json.dumps(header).encode() + b"\n")
+            fp.write(data)
+        os.replace(tmp_path, pickle_path)
+    except (OSError, pickle.PicklingError) as e:
+        logging.debug(f"Could not cache the contract class: {e}")
+
+
+def _get_pickle_path(path):
+    build_directory, filename = os.path.split(path)
+    return f"{build_directory}/.cache/{os.path.splitext(filename)[0]}.pickle"
+
+
+def _get_class_hash(path):
+    build_directory = os.path.dirname(path)
+    contract_name = os.path.splitext(os.path.basename(path))[0]
+    if _is_nile_artifact(path) and contract_name in NILE_CLASS_HASHES:
+        return NILE_CLASS_HASHES[contract_name]
+
+    entry = load_class_hash_index(build_directory).get(contract_name)
+    if entry is not None and entry["sha256"] == hash_file(path):
+        return int(entry["class_hash"], 16)
+
+    return _compute_class_hash(path)
+
+
+def _compute_class_hash(path):
+    contract_class = _memoize(_contract_classes, path, _load_contract_class)
+    return compute_class_hash(contract_class)
+
+
+def _is_project_artifact(path):
+    return os.path.dirname(os.path.realpath(path)) == os.path.realpath(BUILD_DIRECTORY)
+
+
+def _is_nile_artifact(path):
+    return os.path.dirname(os.path.realpath(path)) == os.path.realpath(NILE_BUILD_DIR)
+
+
+def get_account_class_hash(contract="Account", verify=False):
+    """
+    Return the class_hash of an Account contract.
+
+    The hashes of the accounts shipped with nile are precomputed. Set
+    `verify` to check them against the artifacts, hashing the contract.
+    """
     overriding_path = (NILE_BUILD_DIR, NILE_ABIS_DIR)
-    return get_class_hash(contract, overriding_path=overriding_path)
+    class_hash = get_class_hash(contract, overriding_path=overriding_path)
+
+    if verify:
+        path = _get_artifact_path(contract, overriding_path)
+        computed = _compute_class_hash(path)
+        if computed != class_hash:
+            raise Exception(
+                f"Precomputed class hash {hex(class_hash)} of {contract} "
+                f"does not match its artifact ({hex(computed)})"
+            )
+
+    return class_hash
 
 
 def get_chain_id(network):
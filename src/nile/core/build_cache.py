@@ -0,0 +1,79 @@
+"""Incremental compilation cache."""
+
+import json
+import os
+
+from nile.common import (
+    ABIS_DIRECTORY,
+    BUILD_CACHE_MANIFEST,
+    BUILD_DIRECTORY,
+    get_compiler_version,
+    hash_file,
+)
+
+
+def get_fingerprint(path, graph, account_contract, disable_hint_validation):
+    """
+    Return everything the compilation output of a contract depends on.
+
+    Return None if the contract source can't be read, so it's never cached.
+    """
+    if not os.path.isfile(path):
+        return None
+
+    sources = [os.path.normpath(path), *graph.get_dependencies(path)]
+    return {
+        "sources": {source: hash_file(source) for source in sources},
+        "cairo_path": graph.roots,
+        "compiler": get_compiler_version(),
+        "flags": {
+            "account_contract": account_contract,
+            "disable_hint_validation": disable_hint_validation,
+        },
+    }
+
+
+class BuildCache:
+    """Manifest of the inputs used to build each compiled contract."""
+
+    def __init__(self, file=BUILD_CACHE_MANIFEST):
+        """Load the manifest from disk, if any."""
+        self.file = file
+        self.entries = {}
+
+        if os.path.exists(file):
+            try:
+                with open(file, "r") as fp:
+                    self.entries = json.load(fp)
+            except ValueError:
+                # a corrupt manifest only costs a full rebuild
+                self.entries = {}
+
+    def is_fresh(self, path, fingerprint):
+        """Return whether the artifacts of a contract match its inputs."""
+        if fingerprint is None:
+            return False
+
+        filename = os.path.splitext(os.path.basename(path))[0]
+        artifacts = (
+            f"{BUILD_DIRECTORY}/{filename}.json",
+            f"{ABIS_DIRECTORY}/{filename}.json",
+        )
+        if not all(os.path.exists(artifact) for artifact in artifacts):
+            return False
+
+        return self.entries.get(os.path.normpath(path)) == fingerprint
+
+    def update(self, path, fingerprint):
+        """Record (or forget, if fingerprint is None) the inputs of a contract."""
+        key = os.path.normpath(path)
+        if fingerprint is None:
+            self.entries.pop(key, None)
+        else:
+            self.entries[key] = fingerprint
+
+    def save(self):
+        """Write the manifest to disk."""
+        os.makedirs(os.path.dirname(self.file), exist_ok=True)
+        with open(self.file, "w") as fp:
+            json.dump(self.entries, fp, indent=2, sort_keys=True)
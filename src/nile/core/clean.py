@@ -4,11 +4,15 @@ import logging
 import os
 import shutil
 
+from nile import database
 from nile.common import (
     ACCOUNTS_FILENAME,
     BUILD_DIRECTORY,
+    DATABASE_FILENAME,
     DECLARATIONS_FILENAME,
     DEPLOYMENTS_FILENAME,
+    PREDEPLOYED_ACCOUNTS_FILENAME,
+    RECEIPTS_FILENAME,
 )
 
 
@@ -18,9 +22,15 @@ def clean():
         f"localhost.{DEPLOYMENTS_FILENAME}",
         f"localhost.{DECLARATIONS_FILENAME}",
         f"localhost.{ACCOUNTS_FILENAME}",
+        f"localhost.{RECEIPTS_FILENAME}",
+        f"localhost.{PREDEPLOYED_ACCOUNTS_FILENAME}",
         BUILD_DIRECTORY,
     ]
 
+    if database.is_enabled():
+        logging.info(f"🚮 Deleting localhost entries from {DATABASE_FILENAME}")
+        database.clear("localhost")
+
     for file in local_files:
         if os.path.exists(file):
             logging.info(f"🚮 Deleting {file}")
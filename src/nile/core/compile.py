@@ -3,13 +3,23 @@
 import logging
 import os
 import subprocess
+import sys
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 from nile.common import (
     ABIS_DIRECTORY,
     BUILD_DIRECTORY,
     CONTRACTS_DIRECTORY,
     get_all_contracts,
+    get_class_hash_index_entry,
+    update_class_hash_index,
 )
+from nile.core.build_cache import BuildCache, get_fingerprint
+from nile.core.imports import DependencyGraph, get_cairo_path, is_entry_point
+
+COMPILER = "starknet-compile-deprecated"
+BACKENDS = ("subprocess", "in-process")
 
 
 def compile(
@@ -18,8 +28,27 @@ def compile(
     cairo_path=None,
     account_contract=False,
     disable_hint_validation=False,
+    jobs=1,
+    force=False,
+    backend="subprocess",
+    executor=None,
 ):
-    """Compile cairo contracts to default output directory."""
+    """Compile cairo contracts to default output directory.
+
+    Library files (Cairo files without external entry points) given in
+    `contracts` are replaced by the contracts importing them. Contracts whose
+    sources, imports, compiler and flags didn't change since the last build
+    are skipped unless `force` is set. Up to `jobs` contracts are compiled
+    concurrently. Results are always reported in the order the contracts
+    were given. The class hashes of the built contracts are then written to
+    the class hash index read by `get_class_hash`.
+
+    The `subprocess` backend runs the compiler CLI once per contract, while
+    the `in-process` backend runs it inside `jobs` long-lived worker
+    processes, paying the compiler's startup time only once per worker.
+    An `executor` created with `get_compiler_pool` can be passed to reuse
+    warm workers across calls.
+    """
     # to do: automatically support subdirectories
 
     contracts_directory = directory if directory else CONTRACTS_DIRECTORY
@@ -28,27 +57,72 @@ def compile(
         logging.info(f"📁 Creating {ABIS_DIRECTORY} to store compilation artifacts")
         os.makedirs(ABIS_DIRECTORY, exist_ok=True)
 
-    all_contracts = contracts
+    graph = DependencyGraph(get_cairo_path(cairo_path, contracts_directory))
 
     if len(contracts) == 0:
         logging.info(
             f"🤖 Compiling all Cairo contracts in the {contracts_directory} directory"
         )
         all_contracts = get_all_contracts(directory=contracts_directory)
+    else:
+        all_contracts = _expand_contracts(contracts, contracts_directory, graph)
 
-    results = [
-        _compile_contract(
+    cache = BuildCache()
+    pending = []
+    fingerprints = []
+    for contract in all_contracts:
+        fingerprint = get_fingerprint(
             contract,
-            contracts_directory,
-            cairo_path,
-            account_contract,
+            graph,
+            _is_account_contract(contract, account_contract),
             disable_hint_validation,
         )
-        for contract in all_contracts
-    ]
-    failed_contracts = [c for (c, r) in zip(all_contracts, results) if r != 0]
+        if force or not cache.is_fresh(contract, fingerprint):
+            pending.append(contract)
+            fingerprints.append(fingerprint)
+
+    up_to_date = len(all_contracts) - len(pending)
+    if up_to_date > 0:
+        logging.info(f"♻️  Skipping {up_to_date} up to date contract(s)")
+
+    args = (contracts_directory, cairo_path, account_contract, disable_hint_validation)
+
+    if executor is not None:
+        results = _run(executor, _compile_contract_in_process, pending, args)
+    elif backend == "in-process" and len(pending) > 0:
+        with get_compiler_pool(min(jobs, len(pending))) as executor:
+            results = _run(executor, _compile_contract_in_process, pending, args)
+    elif jobs > 1:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            results = _run(executor, _compile_contract, pending, args)
+    else:
+        results = []
+        for contract in pending:
+            logging.info(f"🔨 Compiling {contract}")
+            results.append(_build_contract(_compile_contract, contract, *args))
+
+    # the workers hash the contracts they built, sparing a serial pass here
+    entries = {_get_contract_name(c): entry for c, (_, entry) in zip(pending, results)}
+    results = [code for (code, _) in results]
+
+    if len(pending) > 0:
+        for contract, fingerprint, result in zip(pending, fingerprints, results):
+            cache.update(contract, fingerprint if result == 0 else None)
+        cache.save()
+
+    failed_contracts = [c for (c, r) in zip(pending, results) if r != 0]
     failures = len(failed_contracts)
 
+    if len(all_contracts) > 0:
+        update_class_hash_index(
+            (
+                _get_contract_name(contract)
+                for contract in all_contracts
+                if contract not in failed_contracts
+            ),
+            entries=entries,
+        )
+
     if failures == 0:
         logging.info("✅ Done")
     else:
@@ -60,32 +134,156 @@ def compile(
             logging.info(f"   {contract}")
 
 
+def get_compiler_pool(jobs=1):
+    """Return a pool of worker processes running the in-process compiler."""
+    return ProcessPoolExecutor(max_workers=jobs, initializer=_load_compiler)
+
+
+def _run(executor, compile_contract, contracts, args):
+    futures = []
+    for contract in contracts:
+        logging.info(f"🔨 Compiling {contract}")
+        futures.append(
+            executor.submit(_build_contract, compile_contract, contract, *args)
+        )
+
+    return [future.result() for future in futures]
+
+
+def _build_contract(compile_contract, path, *args):
+    """Compile a contract, returning the exit code and its class hash entry."""
+    code = compile_contract(path, *args)
+    if code != 0:
+        return code, None
+
+    return code, get_class_hash_index_entry(_get_contract_name(path))
+
+
 def _compile_contract(
     path,
     directory=None,
     cairo_path=None,
     account_contract=False,
     disable_hint_validation=False,
+):
+    cmd = [
+        COMPILER,
+        *_get_compiler_args(
+            path, directory, cairo_path, account_contract, disable_hint_validation
+        ),
+    ]
+
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    process.communicate()
+    return process.returncode
+
+
+def _load_compiler():
+    """Import the compiler once, when a worker process starts."""
+    # we dynamically import starknet dependencies to keep them out of
+    # the parent process when compiling with subprocesses
+    from starkware.starknet.compiler.compile import main
+
+    return main
+
+
+def _compile_contract_in_process(
+    path,
+    directory=None,
+    cairo_path=None,
+    account_contract=False,
+    disable_hint_validation=False,
+):
+    """
+    Run the compiler CLI entry point within the current (worker) process.
+
+    Going through the very same entry point as the CLI keeps the artifacts
+    byte-identical to the ones of the subprocess backend.
+    """
+    main = _load_compiler()
+    argv = sys.argv
+    sys.argv = [
+        COMPILER,
+        *_get_compiler_args(
+            path, directory, cairo_path, account_contract, disable_hint_validation
+        ),
+    ]
+
+    try:
+        return main()
+    except SystemExit as e:
+        # argparse exits on invalid arguments
+        return e.code
+    except Exception:
+        traceback.print_exc()
+        return 1
+    finally:
+        sys.argv = argv
+
+
+def _get_compiler_args(
+    path,
+    directory=None,
+    cairo_path=None,
+    account_contract=False,
+    disable_hint_validation=False,
 ):
     base = os.path.basename(path)
     filename = os.path.splitext(base)[0]
-    logging.info(f"🔨 Compiling {path}")
     contracts_directory = directory if directory else CONTRACTS_DIRECTORY
     cairo_path = cairo_path if cairo_path else contracts_directory
 
-    cmd = f"""
-    starknet-compile-deprecated {path} \
-        --cairo_path={cairo_path}
-        --output {BUILD_DIRECTORY}/{filename}.json \
-        --abi {ABIS_DIRECTORY}/{filename}.json
-    """
+    args = [
+        path,
+        f"--cairo_path={cairo_path}",
+        "--output",
+        f"{BUILD_DIRECTORY}/{filename}.json",
+        "--abi",
+        f"{ABIS_DIRECTORY}/{filename}.json",
+    ]
 
-    if account_contract or filename.endswith("Account"):
-        cmd = cmd + "\n--account_contract"
+    if _is_account_contract(path, account_contract):
+        args.append("--account_contract")
 
     if disable_hint_validation:
-        cmd = cmd + "\n--disable_hint_validation"
+        args.append("--disable_hint_validation")
 
-    process = subprocess.Popen(cmd.split(), stdout=subprocess.PIPE)
-    process.communicate()
-    return process.returncode
+    return args
+
+
+def _expand_contracts(contracts, directory, graph):
+    """Replace library files with the contracts depending on them."""
+    entry_points = None
+    expanded = {}
+
+    for contract in contracts:
+        targets = [contract]
+
+        if os.path.isfile(contract) and not is_entry_point(contract):
+            if entry_points is None:
+                entry_points = [
+                    path
+                    for path in get_all_contracts(directory=directory)
+                    if is_entry_point(path)
+                ]
+
+            dependents = graph.get_dependents(contract, entry_points)
+            if len(dependents) > 0:
+                logging.info(
+                    f"🔗 {contract} is imported by {len(dependents)} contract(s)"
+                )
+                targets = dependents
+
+        for target in targets:
+            expanded.setdefault(os.path.normpath(target), target)
+
+    return list(expanded.values())
+
+
+def _get_contract_name(path):
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _is_account_contract(path, account_contract=False):
+    filename = _get_contract_name(path)
+    return account_contract or filename.endswith("Account")
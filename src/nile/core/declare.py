@@ -3,8 +3,8 @@
 import logging
 
 from nile import deployments
-from nile.common import DECLARATIONS_FILENAME, parse_information
-from nile.utils import hex_class_hash
+from nile.common import DECLARATIONS_FILENAME
+from nile.utils import hex_class_hash, normalize_number
 
 
 async def declare(
@@ -25,7 +25,8 @@ async def declare(
 
     tx_status, output = await transaction.execute(signer=signer, watch_mode=watch_mode)
 
-    class_hash, tx_hash = parse_information(output)
+    class_hash = normalize_number(output["class_hash"])
+    tx_hash = normalize_number(output["transaction_hash"])
     padded_hash = hex_class_hash(class_hash)
     logging.info(f"⏳ Successfully sent declaration of {contract_name} as {padded_hash}")
     logging.info(f"🧾 Transaction hash: {hex(tx_hash)}")
@@ -0,0 +1,107 @@
+"""Resolve imports between Cairo modules."""
+
+import os
+import re
+
+from nile.common import CONTRACTS_DIRECTORY
+
+IMPORT_PATTERN = re.compile(
+    r"^\s*(?:from\s+([\w.]+)\s+import\b|import\s+([\w.]+))", re.MULTILINE
+)
+ENTRY_POINT_PATTERN = re.compile(
+    r"^\s*@(external|view|constructor|l1_handler)\b", re.MULTILINE
+)
+LIBS_DIR_ENVVAR = "CAIRO_PATH"
+
+
+def get_cairo_path(cairo_path=None, directory=None):
+    """
+    Return the list of roots used by the compiler to resolve imports.
+
+    Mirrors the lookup order of the Cairo compiler: the `--cairo_path`
+    entries (or the contracts directory), `CAIRO_PATH` and the working directory.
+    """
+    cairo_path = cairo_path if cairo_path else (directory or CONTRACTS_DIRECTORY)
+    paths = cairo_path.split(":") + os.getenv(LIBS_DIR_ENVVAR, "").split(":")
+    return [path for path in paths + [os.curdir] if path and os.path.isdir(path)]
+
+
+def get_imports(path):
+    """Return the names of the modules imported by a Cairo file."""
+    with open(path, "r") as fp:
+        code = fp.read()
+
+    return [a or b for a, b in IMPORT_PATTERN.findall(code)]
+
+
+def resolve_module(module, roots):
+    """Return the file implementing a Cairo module, or None if not found."""
+    relative_path = module.replace(".", os.sep) + ".cairo"
+    for root in roots:
+        path = os.path.normpath(os.path.join(root, relative_path))
+        if os.path.isfile(path):
+            return path
+
+    return None
+
+
+def is_entry_point(path):
+    """Return whether a Cairo file declares an external interface (a contract)."""
+    with open(path, "r") as fp:
+        return ENTRY_POINT_PATTERN.search(fp.read()) is not None
+
+
+class DependencyGraph:
+    """
+    Graph of the imports between Cairo files.
+
+    Imports are resolved against `roots` lazily, and memoized so a file
+    shared by many contracts is only read once. Modules that cannot be
+    found in `roots` (e.g. the `starkware` library shipped with the
+    compiler) are ignored.
+    """
+
+    def __init__(self, roots):
+        """Construct an empty graph resolving modules from roots."""
+        self.roots = roots
+        self._imports = {}
+        self._dependencies = {}
+
+    def get_imports(self, path):
+        """Return the files directly imported by a Cairo file."""
+        path = os.path.normpath(path)
+        if path not in self._imports:
+            modules = get_imports(path) if os.path.isfile(path) else []
+            resolved = (resolve_module(module, self.roots) for module in modules)
+            self._imports[path] = sorted({file for file in resolved if file})
+
+        return self._imports[path]
+
+    def get_dependencies(self, path):
+        """Return the files transitively imported by a Cairo file."""
+        path = os.path.normpath(path)
+        if path not in self._dependencies:
+            dependencies = set()
+            pending = [path]
+
+            while pending:
+                for dependency in self.get_imports(pending.pop()):
+                    if dependency not in dependencies:
+                        dependencies.add(dependency)
+                        pending.append(dependency)
+
+            dependencies.discard(path)
+            self._dependencies[path] = sorted(dependencies)
+
+        return self._dependencies[path]
+
+    def get_dependents(self, path, candidates):
+        """Return the candidates importing a file, directly or transitively."""
+        target = os.path.abspath(path)
+        dependents = []
+        for candidate in candidates:
+            dependencies = self.get_dependencies(candidate)
+            if target in (os.path.abspath(file) for file in dependencies):
+                dependents.append(candidate)
+
+        return dependents
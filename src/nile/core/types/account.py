@@ -26,7 +26,7 @@ from nile.core.types.tx_wrappers import (
 from nile.core.types.udc_helpers import create_udc_deploy_transaction
 from nile.core.types.utils import get_counterfactual_address, get_execute_calldata
 from nile.signer import Signer
-from nile.utils.get_nonce import get_nonce_without_log as get_nonce
+from nile.utils.nonce_manager import get_nonce_manager, is_nonce_error
 
 load_dotenv()
 
@@ -128,10 +128,35 @@ class Account(AsyncObject):
         max_fee, nonce, calldata = await self._process_arguments(
             max_fee, nonce, calldata
         )
-        execute_calldata = get_execute_calldata(
-            calls=[[target_address, method, calldata]]
+        return await self._create_invoke(
+            [[target_address, method, calldata]], max_fee, nonce
         )
 
+    async def send_many(self, calls, nonce=None, max_fee=None):
+        """
+        Return an InvokeTxWrapper object executing many calls at once.
+
+        @param calls: List of [address_or_alias, method, calldata] calls, all
+            packed into a single __execute__ transaction (one nonce, one fee
+            estimation and one signature).
+        """
+        assert len(calls) > 0, "No calls to send"
+
+        max_fee, nonce, _ = await self._process_arguments(max_fee, nonce)
+        calls = [
+            [
+                self._get_target_address(address_or_alias),
+                method,
+                [normalize_number(x) for x in calldata or []],
+            ]
+            for address_or_alias, method, calldata in calls
+        ]
+        return await self._create_invoke(calls, max_fee, nonce)
+
+    async def _create_invoke(self, calls, max_fee, nonce):
+        execute_calldata = get_execute_calldata(calls=calls)
+        nonce, managed_nonce = await self._get_nonce(nonce)
+
         # Create the transaction
         transaction = InvokeTransaction(
             account_address=self.address,
@@ -139,6 +164,7 @@ class Account(AsyncObject):
             max_fee=max_fee or 0,
             nonce=nonce,
             network=self.network,
+            managed_nonce=managed_nonce,
         )
 
         tx_wrapper = InvokeTxWrapper(
@@ -165,6 +191,8 @@ class Account(AsyncObject):
             assert overriding_path is None, "Cannot override path to Nile account."
             overriding_path = NILE_ARTIFACTS_PATH
 
+        nonce, managed_nonce = await self._get_nonce(nonce)
+
         # Create the transaction
         transaction = DeclareTransaction(
             account_address=self.address,
@@ -173,6 +201,7 @@ class Account(AsyncObject):
             nonce=nonce,
             network=self.network,
             overriding_path=overriding_path,
+            managed_nonce=managed_nonce,
         )
 
         tx_wrapper = DeclareTxWrapper(
@@ -248,14 +277,19 @@ class Account(AsyncObject):
         if max_fee is not None:
             max_fee = int(max_fee)
 
-        if nonce is None:
-            nonce = await get_nonce(self.address, self.network)
-
         if calldata is not None:
             calldata = [normalize_number(x) for x in calldata]
 
         return max_fee, nonce, calldata
 
+    async def _get_nonce(self, nonce):
+        """Return the nonce to build a transaction with, and whether it's managed."""
+        if nonce is None:
+            # taken from the nonce manager only when the transaction is submitted
+            return await get_nonce_manager(self.address, self.network).peek(), True
+
+        return nonce, False
+
 
 def _get_signer_and_alias(signer, predeployed_info):
     if predeployed_info is None:
@@ -277,13 +311,33 @@ async def _set_estimated_fee_if_none(max_fee, tx):
         # Avoid logging the fee estimation in CLI
         logger.setLevel(logging.WARNING)
 
-        estimated_fee = await tx.estimate_fee()
-
-        logger.setLevel(current_level)
+        try:
+            estimated_fee = await _estimate_fee(tx)
+        finally:
+            logger.setLevel(current_level)
 
         tx.update_fee(estimated_fee)
 
 
+async def _estimate_fee(tx):
+    """Estimate the fee of a transaction, retrying once on a stale nonce."""
+    nonce_manager = get_nonce_manager(tx.account_address, tx.network)
+    try:
+        return await tx.estimate_fee()
+    except Exception as e:
+        # e.g. an outdated nonce, which the network must be asked for
+        nonce_manager.resync()
+        if not (tx.managed_nonce and is_nonce_error(e)):
+            raise
+
+    tx.tx.nonce = await nonce_manager.peek()
+    try:
+        return await tx.estimate_fee()
+    except Exception:
+        nonce_manager.resync()
+        raise
+
+
 async def try_get_account(
     signer,
     network,
@@ -1,15 +1,18 @@
 """Transaction module."""
 
 import dataclasses
-import json
 import logging
-import re
 from abc import ABC, abstractmethod
 from dataclasses import field
 from typing import List
 
+from starkware.starknet.services.api.gateway.transaction import (
+    DeployAccount,
+    DeprecatedDeclare,
+    InvokeFunction,
+)
+
 from nile.common import (
-    NILE_ABIS_DIR,
     QUERY_VERSION_BASE,
     TRANSACTION_VERSION,
     get_chain_id,
@@ -17,12 +20,14 @@ from nile.common import (
     get_contract_class,
 )
 from nile.core.types.utils import (
+    get_calldata_hash,
     get_declare_hash,
     get_deploy_account_hash,
     get_invoke_hash,
 )
-from nile.starknet_cli import execute_call
-from nile.utils import hex_address
+from nile.starknet_cli import gateway
+from nile.utils import normalize_number
+from nile.utils.nonce_manager import get_nonce_manager, is_nonce_error
 from nile.utils.status import status
 
 
@@ -38,12 +43,18 @@ class Transaction(ABC):
     @param nonce: The nonce of the transaction.
     @param network: The chain the transaction will be executed on.
     @param version: The version of the transaction.
+    @param managed_nonce: Whether the nonce is taken from the nonce manager of
+      the account on submission (until then, it's the one it would get).
 
     Generated internally.
 
     @param hash: The hash of the transaction.
     @param query_hash: The hash of the transaction with QUERY_VERSION.
     @param chain_id: The id of the chain the transaction will be executed on.
+
+    The hashes are computed on first use, and computed again after any field
+    is assigned (e.g. by `update_fee`). Mutating a field in place (e.g.
+    appending to `calldata`) is not detected: assign a new value instead.
     """
 
     account_address: int = 0
@@ -51,107 +62,129 @@ class Transaction(ABC):
     nonce: int = 0
     network: str = "localhost"
     version: int = TRANSACTION_VERSION
+    managed_nonce: bool = False
 
     # Public fields not expected in construction time
     tx_type: int = field(init=False)
-    hash: int = field(init=False, default=0)
-    query_hash: int = field(init=False, default=0)
     chain_id: int = field(init=False)
 
     def __post_init__(self):
         """Populate pending fields."""
         self.chain_id = get_chain_id(self.network)
-        self.hash = self._get_tx_hash()
-        self.query_hash = self._get_tx_hash(QUERY_VERSION_BASE + self.version)
 
-        # Validate the transaction object
-        self._validate()
+    def __setattr__(self, name, value):
+        """Set an attribute, forgetting the hashes computed so far."""
+        if not name.startswith("_"):
+            super().__setattr__("_hashes", {})
+        super().__setattr__(name, value)
 
-    async def execute(self, signer, watch_mode=None, **kwargs):
-        """Execute the transaction."""
-        sig_r, sig_s = signer.sign(message_hash=self.hash)
+    @property
+    def hash(self):
+        """Return the hash of the transaction."""
+        if "hash" not in self._hashes:
+            self._hashes["hash"] = self._get_tx_hash()
 
-        type_specific_args = self._get_execute_call_args()
+            # Validate the transaction object
+            self._validate()
 
-        output = await execute_call(
-            self.tx_type,
-            self.network,
-            signature=[sig_r, sig_s],
-            max_fee=self.max_fee,
-            query_flag=None,
-            **type_specific_args,
-            **kwargs,
-        )
+        return self._hashes["hash"]
 
-        match = re.search(r"Transaction hash: (0x[\da-f]{1,64})", output)
-        output_tx_hash = match.groups()[0] if match else None
+    @hash.setter
+    def hash(self, value):
+        self._hashes["hash"] = value
 
-        assert output_tx_hash == hex(
-            self.hash
-        ), "Resulting transaction hash is different than expected"
+    @property
+    def query_hash(self):
+        """Return the hash of the transaction with QUERY_VERSION."""
+        if "query_hash" not in self._hashes:
+            self._hashes["query_hash"] = self._get_tx_hash(
+                QUERY_VERSION_BASE + self.version
+            )
 
-        tx_status = await status(self.hash, self.network, watch_mode)
-        return tx_status, output
+        return self._hashes["query_hash"]
 
-    async def estimate_fee(self, signer, **kwargs):
-        """Estimate the fee of execution."""
-        sig_r, sig_s = signer.sign(message_hash=self.query_hash)
+    @query_hash.setter
+    def query_hash(self, value):
+        self._hashes["query_hash"] = value
 
-        type_specific_args = self._get_execute_call_args()
+    async def execute(self, signer, watch_mode=None):
+        """Execute the transaction."""
+        pending = await self.submit(signer)
+        tx_status = await pending.wait(watch_mode)
+        return tx_status, pending.output
+
+    async def submit(self, signer):
+        """Submit the transaction, returning a PendingTransaction to track it."""
+        nonce_manager = get_nonce_manager(self.account_address, self.network)
+        if self.managed_nonce:
+            # nonces are only taken by the transactions actually sent
+            self.nonce = await nonce_manager.next()
+        else:
+            nonce_manager.advance_past(self.nonce)
+
+        try:
+            response = await self._add_transaction(signer)
+        except Exception as e:
+            # e.g. an invalid nonce, which the network must be asked for
+            nonce_manager.resync()
+            if not (self.managed_nonce and is_nonce_error(e)):
+                raise
+
+            # the local counter was stale: retry once with the network's nonce
+            self.nonce = await nonce_manager.next()
+            try:
+                response = await self._add_transaction(signer)
+            except Exception:
+                nonce_manager.resync()
+                raise
+
+        assert (
+            normalize_number(response["transaction_hash"]) == self.hash
+        ), "Resulting transaction hash is different than expected"
 
-        output = await execute_call(
-            self.tx_type,
-            self.network,
-            signature=[sig_r, sig_s],
-            max_fee=self.max_fee,
-            query_flag="estimate_fee",
-            **type_specific_args,
-            **kwargs,
-        )
+        return PendingTransaction(tx=self, output=response)
+
+    async def _add_transaction(self, signer):
+        sig_r, sig_s = signer.sign(message_hash=self.hash)
+        tx = self._get_gateway_tx(signature=[sig_r, sig_s], version=self.version)
+        return await gateway.add_transaction(tx, self.network)
 
-        match = re.search(r"The estimated fee is: [\d]{1,64}", output)
-        output_value = (
-            int(match.group(0).replace("The estimated fee is: ", "")) if match else None
+    async def estimate_fee(self, signer):
+        """Estimate the fee of execution."""
+        fee_estimation = await gateway.estimate_fee(
+            self._get_query_tx(signer), self.network
         )
 
-        logging.info(output)
-        return output_value
+        logging.info(_format_fee_estimation(fee_estimation))
+        return fee_estimation.overall_fee
 
-    async def simulate(self, signer, **kwargs):
+    async def simulate(self, signer):
         """Simulate the execution."""
-        sig_r, sig_s = signer.sign(message_hash=self.query_hash)
-
-        type_specific_args = self._get_execute_call_args()
-
-        output = await execute_call(
-            self.tx_type,
-            self.network,
-            signature=[sig_r, sig_s],
-            max_fee=self.max_fee,
-            query_flag="simulate",
-            **type_specific_args,
-            **kwargs,
+        simulation = await gateway.simulate_transaction(
+            self._get_query_tx(signer), self.network
         )
 
-        json_str = output.split("\n", 4)[4]
-        output_value = json.loads(json_str)
-
-        logging.info(output)
-        return output_value
+        logging.info(_format_fee_estimation(simulation.fee_estimation))
+        return simulation.trace.dump()
 
     def update_fee(self, max_fee):
         """Update the tx from a new max_fee."""
         self.max_fee = max_fee
-        self.hash = self._get_tx_hash()
-        self.query_hash = self._get_tx_hash(QUERY_VERSION_BASE + self.version)
 
         # Allow chaining with execute
         return self
 
+    def _get_query_tx(self, signer):
+        """Return the gateway transaction signed for a query (fee estimation)."""
+        sig_r, sig_s = signer.sign(message_hash=self.query_hash)
+        return self._get_gateway_tx(
+            signature=[sig_r, sig_s], version=QUERY_VERSION_BASE + self.version
+        )
+
     @abstractmethod
-    def _get_execute_call_args(self):
+    def _get_gateway_tx(self, signature, version):
         """
-        Return specific arguments from transaction type.
+        Return the starkware gateway transaction object for the transaction type.
 
         This method must be overridden on each specific implementation.
         """
@@ -169,6 +202,28 @@ class Transaction(ABC):
         assert self.hash > 0, "Transaction hash is empty after transaction creation!"
 
 
+@dataclasses.dataclass
+class PendingTransaction:
+    """
+    Transaction submitted to the network, not tracked yet.
+
+    @param tx: The submitted transaction.
+    @param output: The gateway response to the submission.
+    """
+
+    tx: Transaction
+    output: dict
+
+    async def wait(self, watch_mode="track"):
+        """Return the status of the transaction, tracking it if watch_mode is set."""
+        tx_status = await status(self.tx.hash, self.tx.network, watch_mode)
+        if tx_status.status.is_rejected:
+            # rejected transactions don't consume their nonce
+            get_nonce_manager(self.tx.account_address, self.tx.network).resync()
+
+        return tx_status
+
+
 @dataclasses.dataclass
 class InvokeTransaction(Transaction):
     """
@@ -194,15 +249,28 @@ class InvokeTransaction(Transaction):
             self.nonce,
             version or self.version,
             self.chain_id,
+            calldata_hash=self._get_calldata_hash(),
         )
 
-    def _get_execute_call_args(self):
-        return {
-            "inputs": self.calldata,
-            "address": hex_address(self.account_address),
-            "abi": f"{NILE_ABIS_DIR}/Account.json",
-            "method": self.entry_point,
-        }
+    def _get_calldata_hash(self):
+        """Return the calldata hash chain, only recomputed if the calldata changed."""
+        # hashing is linear in the calldata size, comparing it is much cheaper
+        calldata = tuple(self.calldata or [])
+        cached = getattr(self, "_calldata_hash", None)
+        if cached is None or cached[0] != calldata:
+            self._calldata_hash = (calldata, get_calldata_hash(calldata))
+
+        return self._calldata_hash[1]
+
+    def _get_gateway_tx(self, signature, version):
+        return InvokeFunction(
+            sender_address=self.account_address,
+            calldata=self.calldata or [],
+            max_fee=self.max_fee,
+            nonce=self.nonce,
+            signature=signature,
+            version=version,
+        )
 
 
 @dataclasses.dataclass
@@ -213,11 +281,13 @@ class DeclareTransaction(Transaction):
     @param contract_to_submit: Contract name for declarations or deployments.
     @param contract_class: Contract class required for declarations.
     @param overriding_path: Utility for artifacts resolution.
+    @param class_hash: Hash of the contract class, shared by every tx hash.
     """
 
     contract_to_submit: str = None
     contract_class: str = field(init=False)
     overriding_path: str = None
+    class_hash: int = field(init=False)
 
     def __post_init__(self):
         """Populate pending fields."""
@@ -225,26 +295,32 @@ class DeclareTransaction(Transaction):
             contract_name=self.contract_to_submit,
             overriding_path=self.overriding_path,
         )
+        self.class_hash = get_class_hash(
+            contract_name=self.contract_to_submit,
+            overriding_path=self.overriding_path,
+        )
         self.tx_type = "declare"
         super().__post_init__()
 
     def _get_tx_hash(self, version=None):
         return get_declare_hash(
             self.account_address,
-            self.contract_class,
+            self.class_hash,
             self.max_fee,
             self.nonce,
             version or self.version,
             self.chain_id,
         )
 
-    def _get_execute_call_args(self):
-        return {
-            "contract_name": self.contract_to_submit,
-            "overriding_path": self.overriding_path,
-            "sender": hex_address(self.account_address),
-            "deprecated": True,
-        }
+    def _get_gateway_tx(self, signature, version):
+        return DeprecatedDeclare(
+            contract_class=self.contract_class,
+            sender_address=self.account_address,
+            max_fee=self.max_fee,
+            nonce=self.nonce,
+            signature=signature,
+            version=version,
+        )
 
 
 @dataclasses.dataclass
@@ -288,10 +364,22 @@ class DeployAccountTransaction(Transaction):
             self.chain_id,
         )
 
-    def _get_execute_call_args(self):
-        return {
-            "salt": self.salt,
-            "contract_name": self.contract_to_submit,
-            "overriding_path": self.overriding_path,
-            "calldata": self.calldata,
-        }
+    def _get_gateway_tx(self, signature, version):
+        return DeployAccount(
+            class_hash=self.class_hash,
+            constructor_calldata=self.calldata or [],
+            contract_address_salt=self.salt,
+            max_fee=self.max_fee,
+            nonce=self.nonce,
+            signature=signature,
+            version=version,
+        )
+
+
+def _format_fee_estimation(fee_estimation):
+    fee_eth = fee_estimation.overall_fee / 10**18
+    return (
+        f"The estimated fee is: {fee_estimation.overall_fee} WEI ({fee_eth:.6f} ETH).\n"
+        f"Gas usage: {fee_estimation.gas_usage}\n"
+        f"Gas price: {fee_estimation.gas_price} WEI"
+    )
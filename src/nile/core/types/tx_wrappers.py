@@ -42,7 +42,9 @@ class BaseTxWrapper:
 class InvokeTxWrapper(BaseTxWrapper):
     """Wrapper for send."""
 
-    pass
+    async def submit(self):
+        """Submit the wrapped transaction without waiting for its status."""
+        return await self.tx.submit(signer=self.account.signer)
 
 
 @dataclasses.dataclass
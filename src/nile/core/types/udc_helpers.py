@@ -35,6 +35,7 @@ async def create_udc_deploy_transaction(
     max_fee, nonce, calldata = await account._process_arguments(
         max_fee, nonce, calldata
     )
+    nonce, managed_nonce = await account._get_nonce(nonce)
     class_hash = get_class_hash(contract_name, overriding_path)
 
     execute_calldata = get_execute_calldata(
@@ -53,6 +54,7 @@ async def create_udc_deploy_transaction(
         max_fee=max_fee,
         nonce=nonce,
         network=account.network,
+        managed_nonce=managed_nonce,
     )
 
     predicted_address = calculate_contract_address_from_hash(
@@ -1,17 +1,17 @@
 """Utils for handling types logic."""
 
+from starkware.cairo.common.hash_state import compute_hash_on_elements
 from starkware.starknet.core.os.contract_address.contract_address import (
     calculate_contract_address_from_hash,
 )
 from starkware.starknet.core.os.transaction_hash.transaction_hash import (
     TransactionHashPrefix,
     calculate_deploy_account_transaction_hash,
-    calculate_deprecated_declare_transaction_hash,
     calculate_transaction_hash_common,
 )
 from starkware.starknet.public.abi import get_selector_from_name
 
-from nile.common import get_account_class_hash
+from nile.common import QUERY_VERSION_BASE, get_account_class_hash
 
 
 def get_execute_calldata(calls):
@@ -44,29 +44,60 @@ def from_call_to_call_array(calls):
     return (call_array, calldata)
 
 
-def get_invoke_hash(account, calldata, max_fee, nonce, version, chain_id):
-    """Compute the hash of an invoke transaction."""
+def get_invoke_hash(
+    account, calldata, max_fee, nonce, version, chain_id, calldata_hash=None
+):
+    """
+    Compute the hash of an invoke transaction.
+
+    Equivalent to `calculate_transaction_hash_common`, but a `calldata_hash`
+    (see `get_calldata_hash`) can be given to skip hashing the calldata.
+    """
+    if calldata_hash is None:
+        calldata_hash = get_calldata_hash(calldata)
+
+    return compute_hash_on_elements(
+        [
+            TransactionHashPrefix.INVOKE.value,
+            version,
+            account,
+            0,  # entry_point_selector
+            calldata_hash,
+            max_fee,
+            chain_id,
+            nonce,
+        ]
+    )
+
+
+def get_calldata_hash(calldata):
+    """Compute the hash chain of a transaction calldata."""
+    return compute_hash_on_elements(calldata)
+
+
+def get_declare_hash(account, class_hash, max_fee, nonce, version, chain_id):
+    """
+    Compute the hash of a declare transaction.
+
+    Equivalent to `calculate_deprecated_declare_transaction_hash`, but taking
+    the class hash, so the (expensive) hash of the class is computed only once.
+    """
+    if version in [0, QUERY_VERSION_BASE]:
+        calldata = []
+        additional_data = [class_hash]
+    else:
+        calldata = [class_hash]
+        additional_data = [nonce]
+
     return calculate_transaction_hash_common(
-        tx_hash_prefix=TransactionHashPrefix.INVOKE,
+        tx_hash_prefix=TransactionHashPrefix.DECLARE,
         version=version,
         contract_address=account,
         entry_point_selector=0,
         calldata=calldata,
         max_fee=max_fee,
         chain_id=chain_id,
-        additional_data=[nonce],
-    )
-
-
-def get_declare_hash(account, contract_class, max_fee, nonce, version, chain_id):
-    """Compute the hash of a declare transaction."""
-    return calculate_deprecated_declare_transaction_hash(
-        version=version,
-        sender_address=account,
-        contract_class=contract_class,
-        max_fee=max_fee,
-        nonce=nonce,
-        chain_id=chain_id,
+        additional_data=additional_data,
     )
 
 
@@ -0,0 +1,241 @@
+"""Command to continuously rebuild cairo contracts."""
+
+import logging
+import os
+import queue
+import time
+
+from nile.common import BUILD_DIRECTORY, CONTRACTS_DIRECTORY, get_all_contracts
+from nile.core.build_cache import BuildCache
+from nile.core.compile import compile, get_compiler_pool
+from nile.core.imports import DependencyGraph, get_cairo_path, is_entry_point
+
+DEBOUNCE_SECONDS = 0.3
+POLL_INTERVAL_SECONDS = 0.5
+WATCHED_EVENTS = ("created", "modified", "deleted", "moved")
+
+# remove filesystem events debug logs coming from watchdog
+logging.getLogger("watchdog").setLevel(logging.WARNING)
+
+
+def watch(
+    directory=None,
+    cairo_path=None,
+    account_contract=False,
+    disable_hint_validation=False,
+    jobs=1,
+    debounce=DEBOUNCE_SECONDS,
+):
+    """
+    Compile cairo contracts, then recompile the affected ones on every change.
+
+    Watches the contracts directory and the `cairo_path` roots, using inotify
+    (through `watchdog`, if installed) or polling otherwise. Compilation runs
+    in warm worker processes kept alive for the whole session.
+    """
+    contracts_directory = directory if directory else CONTRACTS_DIRECTORY
+    directories = get_watched_directories(contracts_directory, cairo_path)
+    options = {
+        "directory": contracts_directory,
+        "cairo_path": cairo_path,
+        "account_contract": account_contract,
+        "disable_hint_validation": disable_hint_validation,
+        "jobs": jobs,
+    }
+
+    with get_compiler_pool(jobs) as executor:
+        # spawn the workers (importing the compiler) right away, before the
+        # watcher starts its thread: forking a multithreaded process may leave
+        # the workers with locks held by the other threads
+        executor.submit(os.getpid).result()
+
+        with get_watcher(directories) as watcher:
+            compile([], executor=executor, **options)
+
+            logging.info(f"👀 Watching {', '.join(directories)} for changes...")
+            try:
+                while True:
+                    changes = wait_for_changes(watcher, debounce)
+                    graph = DependencyGraph(
+                        get_cairo_path(cairo_path, contracts_directory)
+                    )
+                    contracts = _get_affected_contracts(
+                        changes, contracts_directory, graph
+                    )
+                    if len(contracts) > 0:
+                        compile(contracts, executor=executor, **options)
+                        logging.info("👀 Waiting for changes...")
+            except KeyboardInterrupt:
+                logging.info("👋 Stopped watching")
+
+
+def get_watched_directories(directory, cairo_path=None):
+    """Return the existing directories to watch, without duplicates."""
+    paths = [directory, *(cairo_path.split(":") if cairo_path else [])]
+    directories = {}
+    for path in paths:
+        if path and os.path.isdir(path):
+            directories.setdefault(os.path.realpath(path), path)
+
+    return list(directories.values())
+
+
+def get_watcher(directories):
+    """Return an inotify based watcher if available, or a polling one."""
+    try:
+        return InotifyWatcher(directories)
+    except ImportError:
+        logging.debug("watchdog is not installed, polling for changes instead")
+        return PollingWatcher(directories)
+
+
+def wait_for_changes(watcher, debounce=DEBOUNCE_SECONDS):
+    """
+    Block until Cairo files change, and return the changed paths.
+
+    Changes are accumulated until no new one arrives for `debounce`
+    seconds, so a burst of editor writes triggers a single rebuild.
+    """
+    changes = set()
+    while len(changes) == 0:
+        changes = watcher.get_changes(timeout=POLL_INTERVAL_SECONDS)
+
+    while True:
+        more = watcher.get_changes(timeout=debounce)
+        if len(more) == 0:
+            return changes
+        changes |= more
+
+
+class InotifyWatcher:
+    """Report file changes from filesystem events."""
+
+    def __init__(self, directories):
+        """Schedule the observation of the directories (recursively)."""
+        from watchdog.events import FileSystemEventHandler
+        from watchdog.observers import Observer
+
+        events = queue.Queue()
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                # ignore opened/closed events, the compiler reads the sources
+                if event.event_type in WATCHED_EVENTS and not event.is_directory:
+                    events.put(event.src_path)
+                    if hasattr(event, "dest_path"):
+                        events.put(event.dest_path)
+
+        self.events = events
+        self.observer = Observer()
+        for directory in directories:
+            self.observer.schedule(Handler(), directory, recursive=True)
+
+    def __enter__(self):
+        """Start the observer thread."""
+        self.observer.start()
+        return self
+
+    def __exit__(self, *_):
+        """Stop the observer thread."""
+        self.observer.stop()
+        self.observer.join()
+
+    def get_changes(self, timeout):
+        """Return the Cairo files changed, waiting up to timeout seconds."""
+        changes = set()
+        try:
+            changes.add(self.events.get(timeout=timeout))
+            while True:
+                changes.add(self.events.get_nowait())
+        except queue.Empty:
+            pass
+
+        return {os.path.relpath(path) for path in changes if _is_source(path)}
+
+
+class PollingWatcher:
+    """Report file changes by comparing snapshots of modification times."""
+
+    def __init__(self, directories):
+        """Take the initial snapshot of the directories."""
+        self.directories = directories
+        self.snapshot = self._scan()
+
+    def __enter__(self):
+        """Support the same interface as InotifyWatcher."""
+        return self
+
+    def __exit__(self, *_):
+        """Support the same interface as InotifyWatcher."""
+        pass
+
+    def get_changes(self, timeout):
+        """Return the Cairo files changed since the last call, after timeout."""
+        time.sleep(timeout)
+        snapshot = self._scan()
+        changes = {
+            path
+            for path in snapshot.keys() | self.snapshot.keys()
+            if snapshot.get(path) != self.snapshot.get(path)
+        }
+        self.snapshot = snapshot
+        return changes
+
+    def _scan(self):
+        snapshot = {}
+        for directory in self.directories:
+            for dirpath, _, filenames in os.walk(directory):
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    if _is_source(path):
+                        try:
+                            stat = os.stat(path)
+                        except FileNotFoundError:
+                            continue
+                        snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+
+        return snapshot
+
+
+def _get_affected_contracts(changes, directory, graph):
+    """
+    Return the paths to hand to `compile` for a set of changed files.
+
+    Files in the contracts directory are left for `compile` to expand,
+    files in other cairo_path roots are replaced by the contracts importing
+    them, and deleted files by the contracts last built with them.
+    """
+    contracts = []
+    entry_points = None
+    build_cache = None
+
+    for path in sorted(changes):
+        if not os.path.isfile(path):
+            build_cache = build_cache or BuildCache()
+            contracts += [
+                contract
+                for contract, entry in build_cache.entries.items()
+                if path in entry["sources"] and os.path.isfile(contract)
+            ]
+        elif _is_within(path, directory):
+            contracts.append(path)
+        else:
+            if entry_points is None:
+                entry_points = [
+                    contract
+                    for contract in get_all_contracts(directory=directory)
+                    if is_entry_point(contract)
+                ]
+            contracts += graph.get_dependents(path, entry_points)
+
+    return contracts
+
+
+def _is_source(path):
+    return path.endswith(".cairo") and not _is_within(path, BUILD_DIRECTORY)
+
+
+def _is_within(path, directory):
+    path = os.path.abspath(path)
+    directory = os.path.abspath(directory)
+    return os.path.commonpath([path, directory]) == directory
@@ -0,0 +1,471 @@
+"""
+Nile SQLite store of deployments, declarations and accounts.
+
+When `nile.db` exists in the project, the `nile.deployments` and
+`nile.accounts` APIs read and write it instead of the `<NETWORK>.*.txt`
+and `<NETWORK>.accounts.json` files. Every lookup is served by an index,
+and updates and deletes change single rows instead of rewriting a file.
+Use `nile db import` to create it from the files, and `nile db export`
+to write the files back.
+"""
+
+import glob
+import json
+import logging
+import os
+import sqlite3
+
+from nile.common import (
+    ACCOUNTS_FILENAME,
+    DATABASE_FILENAME,
+    DECLARATIONS_FILENAME,
+    DEPLOYMENTS_FILENAME,
+)
+from nile.utils import hex_address, hex_class_hash, normalize_number
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS deployments (
+    id INTEGER PRIMARY KEY,
+    network TEXT NOT NULL,
+    address TEXT NOT NULL,
+    abi TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deployments_address ON deployments (network, address);
+CREATE INDEX IF NOT EXISTS deployments_abi ON deployments (network, abi);
+
+CREATE TABLE IF NOT EXISTS deployment_aliases (
+    deployment_id INTEGER NOT NULL REFERENCES deployments (id) ON DELETE CASCADE,
+    network TEXT NOT NULL,
+    alias TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deployment_aliases_alias
+    ON deployment_aliases (network, alias);
+CREATE INDEX IF NOT EXISTS deployment_aliases_deployment
+    ON deployment_aliases (deployment_id);
+
+CREATE TABLE IF NOT EXISTS declarations (
+    id INTEGER PRIMARY KEY,
+    network TEXT NOT NULL,
+    class_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS declarations_class_hash
+    ON declarations (network, class_hash);
+
+CREATE TABLE IF NOT EXISTS declaration_aliases (
+    declaration_id INTEGER NOT NULL REFERENCES declarations (id) ON DELETE CASCADE,
+    network TEXT NOT NULL,
+    alias TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS declaration_aliases_alias
+    ON declaration_aliases (network, alias);
+CREATE INDEX IF NOT EXISTS declaration_aliases_declaration
+    ON declaration_aliases (declaration_id);
+
+CREATE TABLE IF NOT EXISTS accounts (
+    network TEXT NOT NULL,
+    public_key TEXT NOT NULL,
+    address TEXT NOT NULL,
+    account_index INTEGER NOT NULL,
+    alias TEXT,
+    PRIMARY KEY (network, public_key)
+);
+CREATE INDEX IF NOT EXISTS accounts_address ON accounts (network, address);
+"""
+
+_connections = {}
+
+
+def is_enabled():
+    """Return whether the project keeps its deployments and accounts in nile.db."""
+    return os.path.exists(DATABASE_FILENAME)
+
+
+def get_connection(path=DATABASE_FILENAME):
+    """Return the connection to a database, creating its tables if needed."""
+    path = os.path.abspath(path)
+    connection, inode = _connections.get(path, (None, None))
+
+    # the file may have been deleted and created again meanwhile
+    if connection is None or not os.path.exists(path) or os.stat(path).st_ino != inode:
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA foreign_keys = ON")
+        connection.executescript(SCHEMA)
+        _connections[path] = connection, os.stat(path).st_ino
+
+    return connection
+
+
+def register_deployment(address, abi, network, aliases):
+    """Insert a deployment."""
+    with get_connection() as db:
+        cursor = db.execute(
+            "INSERT INTO deployments (network, address, abi) VALUES (?, ?, ?)",
+            (network, hex_address(normalize_number(address)), abi),
+        )
+        db.executemany(
+            "INSERT INTO deployment_aliases (deployment_id, network, alias) "
+            "VALUES (?, ?, ?)",
+            [(cursor.lastrowid, network, alias) for alias in aliases],
+        )
+
+
+def unregister_deployment(address, network, alias=None, abi=None):
+    """Delete the deployments of an address (with that abi and aliases, if any)."""
+    query = "SELECT id, abi FROM deployments WHERE network = ? AND address = ?"
+    with get_connection() as db:
+        for deployment_id, current_abi in db.execute(
+            query, (network, hex_address(normalize_number(address)))
+        ).fetchall():
+            aliases = _get_aliases(db, "deployment", deployment_id)
+            if (abi is None or abi == current_abi) and _matches(aliases, alias):
+                db.execute("DELETE FROM deployments WHERE id = ?", (deployment_id,))
+
+
+def update_abi(address_or_alias, abi, network):
+    """Update the abi of the first deployment matching, returning its address."""
+    with get_connection() as db:
+        row = next(_find_deployments(db, address_or_alias, network), None)
+        if row is None:
+            return None
+
+        deployment_id, address, _ = row
+        db.execute("UPDATE deployments SET abi = ? WHERE id = ?", (abi, deployment_id))
+        return normalize_number(address)
+
+
+def load_deployments(address_or_alias, network):
+    """Return the (address, abi) of the deployments matching an identifier."""
+    db = get_connection()
+    return [
+        (normalize_number(address), abi)
+        for _, address, abi in _find_deployments(db, address_or_alias, network)
+    ]
+
+
+def register_declaration(class_hash, network, aliases):
+    """Insert a declaration."""
+    with get_connection() as db:
+        cursor = db.execute(
+            "INSERT INTO declarations (network, class_hash) VALUES (?, ?)",
+            (network, hex_class_hash(normalize_number(class_hash))),
+        )
+        db.executemany(
+            "INSERT INTO declaration_aliases (declaration_id, network, alias) "
+            "VALUES (?, ?, ?)",
+            [(cursor.lastrowid, network, alias) for alias in aliases],
+        )
+
+
+def unregister_declaration(class_hash, network, alias=None):
+    """Delete the declarations of a class hash (with those aliases, if any)."""
+    query = "SELECT id FROM declarations WHERE network = ? AND class_hash = ?"
+    with get_connection() as db:
+        for (declaration_id,) in db.execute(
+            query, (network, hex_class_hash(normalize_number(class_hash)))
+        ).fetchall():
+            aliases = _get_aliases(db, "declaration", declaration_id)
+            if _matches(aliases, alias):
+                db.execute("DELETE FROM declarations WHERE id = ?", (declaration_id,))
+
+
+def load_declarations(hash_or_alias, network):
+    """Return the class hashes of the declarations matching an identifier."""
+    db = get_connection()
+    if type(hash_or_alias) is int:
+        rows = db.execute(
+            "SELECT class_hash FROM declarations WHERE network = ? AND class_hash = ? "
+            "ORDER BY id",
+            (network, hex_class_hash(hash_or_alias)),
+        )
+    else:
+        rows = db.execute(
+            "SELECT d.class_hash FROM declarations d "
+            "JOIN declaration_aliases a ON a.declaration_id = d.id "
+            "WHERE a.network = ? AND a.alias = ? ORDER BY d.id",
+            (network, hash_or_alias),
+        )
+
+    return [normalize_number(class_hash) for (class_hash,) in rows]
+
+
+def register_account(pubkey, address, index, alias, network):
+    """Insert an account."""
+    with get_connection() as db:
+        db.execute(
+            "INSERT INTO accounts (network, public_key, address, account_index, alias) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                network,
+                hex(pubkey),
+                hex_address(normalize_number(address)),
+                index,
+                alias,
+            ),
+        )
+
+
+def unregister_account(address, network):
+    """Delete the account of an address."""
+    with get_connection() as db:
+        db.execute(
+            "DELETE FROM accounts WHERE network = ? AND address = ?",
+            (network, hex_address(normalize_number(address))),
+        )
+
+
+def load_account(pubkey, network):
+    """Return the data of the account of a public key, or None if unknown."""
+    row = (
+        get_connection()
+        .execute(
+            "SELECT address, account_index, alias FROM accounts "
+            "WHERE network = ? AND public_key = ?",
+            (network, hex(pubkey)),
+        )
+        .fetchone()
+    )
+    if row is None:
+        return None
+
+    address, index, alias = row
+    return {"address": normalize_number(address), "index": index, "alias": alias}
+
+
+def load_accounts(network):
+    """Return the data of every account, by hex public key (as accounts.json)."""
+    rows = get_connection().execute(
+        "SELECT public_key, address, account_index, alias FROM accounts "
+        "WHERE network = ? ORDER BY rowid",
+        (network,),
+    )
+    return {
+        pubkey: {"address": address, "index": index, "alias": alias}
+        for pubkey, address, index, alias in rows
+    }
+
+
+def count_accounts(network):
+    """Return the number of accounts of a network."""
+    query = "SELECT COUNT(*) FROM accounts WHERE network = ?"
+    return get_connection().execute(query, (network,)).fetchone()[0]
+
+
+def clear(network):
+    """Delete the deployments, declarations and accounts of a network."""
+    with get_connection() as db:
+        _clear(db, network)
+
+
+def get_networks():
+    """Return the networks with deployments, declarations or accounts."""
+    rows = get_connection().execute(
+        "SELECT network FROM deployments UNION SELECT network FROM declarations "
+        "UNION SELECT network FROM accounts"
+    )
+    return sorted(network for (network,) in rows)
+
+
+def import_files():
+    """
+    Copy the deployments, declarations and accounts files into nile.db.
+
+    The rows of each imported network are replaced. The import is built
+    into a copy of nile.db, in a single transaction, which only replaces
+    nile.db once complete. Returns the networks.
+    """
+    networks = sorted(
+        {
+            os.path.basename(path).split(".")[0]
+            for filename in (
+                DEPLOYMENTS_FILENAME,
+                DECLARATIONS_FILENAME,
+                ACCOUNTS_FILENAME,
+            )
+            for path in glob.glob(f"*.{filename}")
+        }
+    )
+
+    path = os.path.abspath(DATABASE_FILENAME)
+    tmp_path = f"{path}.tmp"
+    if os.path.exists(tmp_path):
+        # left over by an interrupted import
+        os.remove(tmp_path)
+
+    db = sqlite3.connect(tmp_path)
+    try:
+        if is_enabled():
+            source = get_connection(path)
+            source.backup(db)
+        db.execute("PRAGMA foreign_keys = ON")
+        db.executescript(SCHEMA)
+
+        with db:
+            for network in networks:
+                logging.info(f"📥 Importing {network} into {DATABASE_FILENAME}")
+                _import_network(db, network)
+        db.close()
+    except BaseException:
+        db.close()
+        os.remove(tmp_path)
+        raise
+
+    _close(path)
+    os.replace(tmp_path, path)
+    return networks
+
+
+def export_files():
+    """
+    Write the deployments, declarations and accounts in nile.db to files.
+
+    Existing files of the exported networks are overwritten. Returns the networks.
+    """
+    if not is_enabled():
+        raise Exception(f"{DATABASE_FILENAME} does not exist")
+
+    db = get_connection()
+    networks = get_networks()
+
+    for network in networks:
+        logging.info(f"📤 Exporting {network} from {DATABASE_FILENAME}")
+
+        with open(f"{network}.{DEPLOYMENTS_FILENAME}", "w") as fp:
+            for deployment_id, address, abi in db.execute(
+                "SELECT id, address, abi FROM deployments WHERE network = ? "
+                "ORDER BY id",
+                (network,),
+            ).fetchall():
+                aliases = _get_aliases(db, "deployment", deployment_id)
+                fp.write(":".join([address, abi, *aliases]) + "\n")
+
+        with open(f"{network}.{DECLARATIONS_FILENAME}", "w") as fp:
+            for declaration_id, class_hash in db.execute(
+                "SELECT id, class_hash FROM declarations WHERE network = ? "
+                "ORDER BY id",
+                (network,),
+            ).fetchall():
+                aliases = _get_aliases(db, "declaration", declaration_id)
+                fp.write(":".join([class_hash, *aliases]) + "\n")
+
+        with open(f"{network}.{ACCOUNTS_FILENAME}", "w") as fp:
+            json.dump(load_accounts(network), fp, indent=2)
+
+    return networks
+
+
+def _import_network(db, network):
+    _clear(db, network)
+
+    deployments = [
+        line.split(":") for line in _read_lines(f"{network}.{DEPLOYMENTS_FILENAME}")
+    ]
+    first_id = _get_next_id(db, "deployments")
+    db.executemany(
+        "INSERT INTO deployments (id, network, address, abi) VALUES (?, ?, ?, ?)",
+        [
+            (first_id + i, network, hex_address(normalize_number(address)), abi)
+            for i, (address, abi, *_) in enumerate(deployments)
+        ],
+    )
+    db.executemany(
+        "INSERT INTO deployment_aliases (deployment_id, network, alias) "
+        "VALUES (?, ?, ?)",
+        [
+            (first_id + i, network, alias)
+            for i, (_, _, *aliases) in enumerate(deployments)
+            for alias in aliases
+        ],
+    )
+
+    declarations = [
+        line.split(":") for line in _read_lines(f"{network}.{DECLARATIONS_FILENAME}")
+    ]
+    first_id = _get_next_id(db, "declarations")
+    db.executemany(
+        "INSERT INTO declarations (id, network, class_hash) VALUES (?, ?, ?)",
+        [
+            (first_id + i, network, hex_class_hash(normalize_number(class_hash)))
+            for i, (class_hash, *_) in enumerate(declarations)
+        ],
+    )
+    db.executemany(
+        "INSERT INTO declaration_aliases (declaration_id, network, alias) "
+        "VALUES (?, ?, ?)",
+        [
+            (first_id + i, network, alias)
+            for i, (_, *aliases) in enumerate(declarations)
+            for alias in aliases
+        ],
+    )
+
+    accounts_file = f"{network}.{ACCOUNTS_FILENAME}"
+    if os.path.exists(accounts_file):
+        with open(accounts_file) as fp:
+            accounts = json.load(fp)
+
+        db.executemany(
+            "INSERT INTO accounts (network, public_key, address, account_index, alias) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    network,
+                    hex(normalize_number(pubkey)),
+                    hex_address(normalize_number(data["address"])),
+                    data["index"],
+                    data["alias"],
+                )
+                for pubkey, data in accounts.items()
+            ],
+        )
+
+
+def _get_next_id(db, table):
+    return db.execute(f"SELECT COALESCE(MAX(id), 0) + 1 FROM {table}").fetchone()[0]
+
+
+def _clear(db, network):
+    for table in ("deployments", "declarations", "accounts"):
+        db.execute(f"DELETE FROM {table} WHERE network = ?", (network,))
+
+
+def _close(path):
+    connection, _ = _connections.pop(path, (None, None))
+    if connection is not None:
+        connection.close()
+
+
+def _find_deployments(db, address_or_alias, network):
+    if type(address_or_alias) is int:
+        return db.execute(
+            "SELECT id, address, abi FROM deployments "
+            "WHERE network = ? AND address = ? ORDER BY id",
+            (network, hex_address(address_or_alias)),
+        )
+
+    return db.execute(
+        "SELECT d.id, d.address, d.abi FROM deployments d "
+        "JOIN deployment_aliases a ON a.deployment_id = d.id "
+        "WHERE a.network = ? AND a.alias = ? ORDER BY d.id",
+        (network, address_or_alias),
+    )
+
+
+def _get_aliases(db, kind, row_id):
+    rows = db.execute(
+        f"SELECT alias FROM {kind}_aliases WHERE {kind}_id = ? ORDER BY rowid",
+        (row_id,),
+    )
+    return [alias for (alias,) in rows]
+
+
+def _matches(aliases, alias):
+    # like the files, where lines are matched by prefix
+    return not alias or ":".join(aliases).startswith(alias)
+
+
+def _read_lines(file):
+    if not os.path.exists(file):
+        return []
+
+    with open(file) as fp:
+        return [line.strip() for line in fp if line.strip()]
@@ -3,34 +3,145 @@
 import logging
 import os
 
-from nile.common import DECLARATIONS_FILENAME, DEPLOYMENTS_FILENAME
+from nile import database
+from nile.common import DATABASE_FILENAME, DECLARATIONS_FILENAME, DEPLOYMENTS_FILENAME
 from nile.utils import hex_address, hex_class_hash, normalize_number
 
+_registries = {}
+
+
+def get_registry(file):
+    """Return the registry of a deployments or declarations file."""
+    path = os.path.abspath(file)
+    if path not in _registries:
+        parse_line = (
+            _parse_declaration
+            if file.endswith(DECLARATIONS_FILENAME)
+            else _parse_deployment
+        )
+        _registries[path] = Registry(path, parse_line)
+
+    return _registries[path]
+
+
+class Registry:
+    """
+    In-memory index of a deployments or declarations file.
+
+    The file is parsed once into dictionaries by address (or class hash) and
+    by alias, and parsed again only when its modification time or size
+    changes, so lookups don't read the file every time.
+    """
+
+    def __init__(self, path, parse_line):
+        """Construct a registry that will parse path on first use."""
+        self.path = path
+        self.parse_line = parse_line
+        self.stamp = None
+        self.by_key = {}
+        self.by_alias = {}
+
+    def find(self, identifier):
+        """
+        Return the entries matching an identifier, in file order.
+
+        If identifier is an int, address (or class hash) is assumed.
+
+        If identifier is a str, alias is assumed.
+        """
+        self._refresh()
+        index = self.by_key if type(identifier) is int else self.by_alias
+        return list(index.get(identifier, ()))
+
+    def append(self, line):
+        """Append a line to the file, indexing it without parsing the file again."""
+        self._refresh()
+        with open(self.path, "a") as fp:
+            fp.write(line)
+
+        self._index(line)
+        self.stamp = self._get_stamp()
+
+    def invalidate(self):
+        """Parse the file again on next use (e.g. after rewriting it)."""
+        self.stamp = None
+
+    def _refresh(self):
+        stamp = self._get_stamp()
+        if stamp is not None and stamp == self.stamp:
+            return
+
+        self.by_key = {}
+        self.by_alias = {}
+        if stamp is not None:
+            with open(self.path) as fp:
+                for line in fp:
+                    self._index(line)
+
+        self.stamp = stamp
+
+    def _index(self, line):
+        key, entry, aliases = self.parse_line(line)
+        self.by_key.setdefault(key, []).append(entry)
+        for alias in aliases:
+            self.by_alias.setdefault(alias, []).append(entry)
+
+    def _get_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size
+
+
+def _parse_deployment(line):
+    [address, abi, *aliases] = line.strip().split(":")
+    address = normalize_number(address)
+    return address, (address, abi), aliases
+
+
+def _parse_declaration(line):
+    [hash, *aliases] = line.strip().split(":")
+    hash = normalize_number(hash)
+    return hash, hash, aliases
+
 
 def register(address, abi, network, alias):
     """Register a new deployment."""
-    file = f"{network}.{DEPLOYMENTS_FILENAME}"
+    file = _get_file(network, DEPLOYMENTS_FILENAME)
 
     if alias is not None:
         if exists(alias, network):
             raise Exception(f"Alias {alias} already exists in {file}")
 
-    with open(file, "a") as fp:
-        # Save address as hex
-        address = hex_address(address)
-        if alias is not None:
-            logging.info(f"📦 Registering deployment as {alias} in {file}")
-        else:
-            logging.info(f"📦 Registering {address} in {file}")
+    # Save address as hex
+    address = hex_address(address)
+    if alias is not None:
+        logging.info(f"📦 Registering deployment as {alias} in {file}")
+    else:
+        logging.info(f"📦 Registering {address} in {file}")
 
-        fp.write(f"{address}:{abi}")
-        if alias is not None:
-            fp.write(f":{alias}")
-        fp.write("\n")
+    if database.is_enabled():
+        aliases = alias.split(":") if alias is not None else []
+        database.register_deployment(address, abi, network, aliases)
+        return
+
+    line = f"{address}:{abi}"
+    if alias is not None:
+        line += f":{alias}"
+    get_registry(file).append(f"{line}\n")
 
 
 def unregister(address_or_class_hash, network, alias, abi=None, is_declaration=False):
     """Unregister deployment or class hash from file."""
+    if database.is_enabled():
+        if is_declaration:
+            database.unregister_declaration(address_or_class_hash, network, alias)
+        else:
+            database.unregister_deployment(address_or_class_hash, network, alias, abi)
+        return
+
     file = (
         f"{network}.{DECLARATIONS_FILENAME}"
         if is_declaration
@@ -55,6 +166,8 @@ def unregister(address_or_class_hash, network, alias, abi=None, is_declaration=F
                 if not line.startswith(to_delete):
                     new_fp.write(line)
 
+    get_registry(file).invalidate()
+
 
 def update_abi(address_or_alias, abi, network):
     """
@@ -64,6 +177,19 @@ def update_abi(address_or_alias, abi, network):
 
     If address_or_alias is a str, alias is assumed.
     """
+    if database.is_enabled():
+        address = database.update_abi(address_or_alias, abi, network)
+        if address is None:
+            raise Exception(
+                f"Deployment {address_or_alias} does not exist in {DATABASE_FILENAME}"
+            )
+
+        identifier = address_or_alias
+        if type(address_or_alias) is int:
+            identifier = hex_address(address)
+        logging.info(f"📦 Updating {identifier} in {DATABASE_FILENAME}")
+        return
+
     file = f"{network}.{DEPLOYMENTS_FILENAME}"
 
     if not os.path.exists(file):
@@ -104,10 +230,12 @@ def update_abi(address_or_alias, abi, network):
         with open(file, "w+") as fp:
             fp.writelines(lines)
 
+        get_registry(file).invalidate()
+
 
 def register_class_hash(hash, network, alias):
     """Register a new deployment."""
-    file = f"{network}.{DECLARATIONS_FILENAME}"
+    file = _get_file(network, DECLARATIONS_FILENAME)
 
     padded_hash = hex_class_hash(hash)
 
@@ -116,16 +244,20 @@ def register_class_hash(hash, network, alias):
             f"Hash {padded_hash[:6]}...{padded_hash[-6:]} already exists in {file}"
         )
 
-    with open(file, "a") as fp:
-        if alias is not None:
-            logging.info(f"📦 Registering {alias} in {file}")
-        else:
-            logging.info(f"📦 Registering {padded_hash} in {file}")
+    if alias is not None:
+        logging.info(f"📦 Registering {alias} in {file}")
+    else:
+        logging.info(f"📦 Registering {padded_hash} in {file}")
 
-        fp.write(f"{padded_hash}")
-        if alias is not None:
-            fp.write(f":{alias}")
-        fp.write("\n")
+    if database.is_enabled():
+        aliases = alias.split(":") if alias is not None else []
+        database.register_declaration(hash, network, aliases)
+        return
+
+    line = padded_hash
+    if alias is not None:
+        line += f":{alias}"
+    get_registry(file).append(f"{line}\n")
 
 
 def exists(address_or_alias, network):
@@ -154,20 +286,11 @@ def load(address_or_alias, network):
 
     If address_or_alias is a str, alias is assumed.
     """
-    file = f"{network}.{DEPLOYMENTS_FILENAME}"
-
-    if not os.path.exists(file):
+    if database.is_enabled():
+        yield from database.load_deployments(address_or_alias, network)
         return
 
-    with open(file) as fp:
-        for line in fp:
-            [address, abi, *alias] = line.strip().split(":")
-            address = normalize_number(address)
-            identifiers = [address]
-            if type(address_or_alias) is not int:
-                identifiers = alias
-            if address_or_alias in identifiers:
-                yield address, abi
+    yield from get_registry(f"{network}.{DEPLOYMENTS_FILENAME}").find(address_or_alias)
 
 
 def load_class(hash_or_alias, network):
@@ -178,17 +301,16 @@ def load_class(hash_or_alias, network):
 
     If hash_or_alias is a str, alias is assumed.
     """
-    file = f"{network}.{DECLARATIONS_FILENAME}"
-
-    if not os.path.exists(file):
+    if database.is_enabled():
+        yield from database.load_declarations(hash_or_alias, network)
         return
 
-    with open(file) as fp:
-        for line in fp:
-            [hash, *alias] = line.strip().split(":")
-            hash = normalize_number(hash)
-            identifiers = [hash]
-            if type(hash_or_alias) is not int:
-                identifiers = alias
-            if hash_or_alias in identifiers:
-                yield hash
+    yield from get_registry(f"{network}.{DECLARATIONS_FILENAME}").find(hash_or_alias)
+
+
+def _get_file(network, filename):
+    """Return where the deployments or declarations of a network are kept."""
+    if database.is_enabled():
+        return DATABASE_FILENAME
+
+    return f"{network}.{filename}"
@@ -1,5 +1,6 @@
 """Nile runtime environment."""
 
+import asyncio
 from functools import partial
 
 from nile import deployments
@@ -24,9 +25,9 @@ class NileRuntimeEnvironment:
             partial_obj = partial(object, self)
             setattr(self, name, skip_click_exit(partial_obj))
 
-    def compile(self, contracts, cairo_path=None):
+    def compile(self, contracts, cairo_path=None, jobs=1, backend="subprocess"):
         """Compile a list of contracts."""
-        return compile(contracts, cairo_path=cairo_path)
+        return compile(contracts, cairo_path=cairo_path, jobs=jobs, backend=backend)
 
     def call(self, address_or_alias, method, params=None, abi=None):
         """Call a view function in a smart contract."""
@@ -52,12 +53,29 @@ class NileRuntimeEnvironment:
         """Get or deploy an Account contract."""
         return Account(signer=signer, network=self.network, watch_mode=watch_mode)
 
-    def get_accounts(self, predeployed=False):
+    def send_many(self, account, calls, nonce=None, max_fee=None):
+        """Pack many [address_or_alias, method, calldata] calls in one invoke."""
+        return account.send_many(calls, nonce=nonce, max_fee=max_fee)
+
+    async def as_completed(self, transactions, watch_mode="track"):
+        """
+        Submit invoke transactions, then yield their statuses as they resolve.
+
+        Transactions are submitted one after the other (in nonce order) without
+        waiting for each other, then tracked concurrently.
+        """
+        pending = [await tx.submit() for tx in transactions]
+        for tx_status in asyncio.as_completed(
+            [transaction.wait(watch_mode) for transaction in pending]
+        ):
+            yield await tx_status
+
+    def get_accounts(self, predeployed=False, seed=None):
         """Retrieve and manage deployed accounts."""
         if not predeployed:
             return get_accounts(self.network)
         else:
-            return get_predeployed_accounts(self.network)
+            return get_predeployed_accounts(self.network, seed)
 
     def get_nonce(self, contract_address):
         """Retrieve the nonce for a contract."""
@@ -2,7 +2,7 @@
 
 from starkware.crypto.signature.signature import private_to_stark_key, sign
 
-from nile.common import TRANSACTION_VERSION, get_chain_id
+from nile.common import TRANSACTION_VERSION, compute_class_hash, get_chain_id
 from nile.core.types.utils import (
     get_declare_hash,
     get_deploy_account_hash,
@@ -10,6 +10,17 @@ from nile.core.types.utils import (
     get_invoke_hash,
 )
 
+# public keys by private key, as deriving one is an elliptic curve multiplication
+_public_keys = {}
+
+
+def get_public_key(private_key):
+    """Return the public key of a private key (derived once per process)."""
+    if private_key not in _public_keys:
+        _public_keys[private_key] = private_to_stark_key(private_key)
+
+    return _public_keys[private_key]
+
 
 class Signer:
     """Utility for signing transactions for an Account on Starknet."""
@@ -17,7 +28,7 @@ class Signer:
     def __init__(self, private_key, network="testnet"):
         """Construct a Signer object. Takes a private key."""
         self.private_key = private_key
-        self.public_key = private_to_stark_key(private_key)
+        self.public_key = get_public_key(private_key)
         self.chain_id = get_chain_id(network)
 
     def sign(self, message_hash):
@@ -40,16 +51,19 @@ class Signer:
 
         return self.sign(message_hash=transaction_hash)
 
-    def sign_declare(self, sender, contract_class, nonce, max_fee):
+    def sign_declare(
+        self, sender, contract_class, nonce, max_fee, version=TRANSACTION_VERSION
+    ):
         """Sign a declare transaction."""
         if isinstance(sender, str):
             sender = int(sender, 16)
 
         transaction_hash = get_declare_hash(
-            sender=sender,
-            contract_class=contract_class,
+            account=sender,
+            class_hash=compute_class_hash(contract_class),
             max_fee=max_fee,
             nonce=nonce,
+            version=version,
             chain_id=self.chain_id,
         )
 
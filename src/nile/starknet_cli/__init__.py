@@ -3,6 +3,7 @@
 import io
 import re
 import sys
+from contextvars import ContextVar
 from types import SimpleNamespace
 
 from starkware.starknet.cli import starknet_cli
@@ -22,6 +23,8 @@ from nile.starknet_cli.deploy_account import (
     update_deploy_account_context,
 )
 
+_captured_stdout = ContextVar("captured_stdout", default=None)
+
 ARGS = [
     "abi",
     "address",
@@ -56,14 +59,46 @@ async def get_gateway_response(network, tx, token):
 
 
 async def capture_stdout(func):
-    """Return the stdout during the passed function call."""
-    stdout = sys.stdout
-    sys.stdout = io.StringIO()
-    await func
-    output = sys.stdout.getvalue()
-    sys.stdout = stdout
-    result = output.rstrip()
-    return result
+    """
+    Return the stdout during the passed function call.
+
+    Only the output of the current task (and the tasks it spawns) is
+    captured, so calls can run concurrently (e.g. under `asyncio.gather`).
+    """
+    _install_stdout_proxy()
+
+    token = _captured_stdout.set(io.StringIO())
+    try:
+        await func
+        output = _captured_stdout.get().getvalue()
+    finally:
+        _captured_stdout.reset(token)
+
+    return output.rstrip()
+
+
+class _StdoutProxy:
+    """Route writes to the capture buffer of the current context, if any."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        buffer = _captured_stdout.get()
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        buffer = _captured_stdout.get()
+        return (buffer or self.stream).flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _install_stdout_proxy():
+    # sys.stdout may have been replaced since (e.g. by a test runner)
+    if not isinstance(sys.stdout, _StdoutProxy):
+        sys.stdout = _StdoutProxy(sys.stdout)
 
 
 def set_context(network):
@@ -0,0 +1,243 @@
+"""Query the StarkNet gateways directly, returning structured results."""
+
+import asyncio
+from urllib.parse import urljoin
+
+import aiohttp
+from services.external_api.client import BadRequest, RetryConfig
+from starkware.starknet.cli.starknet_cli import assert_tx_received
+from starkware.starknet.public.abi import get_selector_from_name
+from starkware.starknet.services.api.feeder_gateway.feeder_gateway_client import (
+    FeederGatewayClient,
+)
+from starkware.starknet.services.api.feeder_gateway.request_objects import CallFunction
+from starkware.starknet.services.api.gateway.gateway_client import GatewayClient
+
+from nile.common import (
+    GATEWAY_CONNECTIONS_LIMIT,
+    GATEWAY_CONNECTIONS_LIMIT_PER_HOST,
+    GATEWAY_KEEPALIVE_SECONDS,
+)
+from nile.starknet_cli import get_feeder_url, get_gateway_url
+
+
+class ClientPool:
+    """
+    Gateway clients of every network, sharing one keep-alive HTTP session.
+
+    starkware clients open a new connection (and TLS handshake) for every
+    request; the pooled ones reuse the connections of a single session,
+    opened on first use and kept until `close` (e.g. when the command ends).
+    """
+
+    def __init__(
+        self,
+        limit=GATEWAY_CONNECTIONS_LIMIT,
+        limit_per_host=GATEWAY_CONNECTIONS_LIMIT_PER_HOST,
+        keepalive_timeout=GATEWAY_KEEPALIVE_SECONDS,
+    ):
+        """Construct an empty pool, with the limits of the session to open."""
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._clients = {}
+        self._session = None
+        self._loop = None
+
+    async def __aenter__(self):
+        """Use the pool, closing the session on exit."""
+        return self
+
+    async def __aexit__(self, *_):
+        """Close the session."""
+        await self.close()
+
+    def get_gateway_client(self, network):
+        """Return the client of the gateway of a network."""
+        return self._get_client(_PooledGatewayClient, get_gateway_url(network))
+
+    def get_feeder_gateway_client(self, network):
+        """Return the client of the feeder gateway of a network."""
+        return self._get_client(_PooledFeederGatewayClient, get_feeder_url(network))
+
+    def get_session(self):
+        """Return the shared session, opening it if needed."""
+        # sessions are bound to the event loop they were opened in
+        loop = asyncio.get_running_loop()
+        if self._session is not None and self._loop is not loop:
+            self._discard_session()
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._loop = loop
+
+        return self._session
+
+    def configure(self, limit=None, limit_per_host=None, keepalive_timeout=None):
+        """Set the limits given, used from the next session opened."""
+        if limit is not None:
+            self.limit = limit
+        if limit_per_host is not None:
+            self.limit_per_host = limit_per_host
+        if keepalive_timeout is not None:
+            self.keepalive_timeout = keepalive_timeout
+
+    async def close(self):
+        """Close the shared session (a new one is opened on next use)."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _discard_session(self):
+        """Close the session of another event loop, which can't be awaited here."""
+        session, self._session = self._session, None
+        connector = session.connector
+        session.detach()
+        if connector is not None:
+            # closes the connections without waiting for the other loop
+            connector._close()
+
+    def _get_client(self, client_class, url):
+        key = (client_class, url)
+        if key not in self._clients:
+            # same retries as the starknet CLI
+            retry_config = RetryConfig(n_retries=1)
+            self._clients[key] = client_class(
+                pool=self, url=url, retry_config=retry_config
+            )
+
+        return self._clients[key]
+
+
+class _PooledClient:
+    """Send the requests of a starkware client through the session of a pool."""
+
+    def __init__(self, pool, **kwargs):
+        super().__init__(**kwargs)
+        self.pool = pool
+
+    async def _send_request(self, send_method, uri, data=None):
+        # mirrors ClientBase._send_request, without opening a session per request
+        url = urljoin(base=self.url, url=self.format_uri(uri))
+        limited_retries = self.retry_config.n_retries > 0
+        n_retries_left = self.retry_config.n_retries
+
+        while True:
+            n_retries_left -= 1
+            try:
+                async with self.pool.get_session().request(
+                    method=send_method, url=url, data=self._prepare_data(data=data)
+                ) as response:
+                    return await self._parse_response(
+                        request_url=url, request_data=data, response=response
+                    )
+            except (aiohttp.ClientError, BadRequest) as exception:
+                retry_code = (
+                    not isinstance(exception, BadRequest)
+                    or exception.status_code in self.retry_config.retry_codes
+                )
+                if limited_retries and (n_retries_left == 0 or not retry_code):
+                    raise
+
+            await asyncio.sleep(1)
+
+
+class _PooledGatewayClient(_PooledClient, GatewayClient):
+    pass
+
+
+class _PooledFeederGatewayClient(_PooledClient, FeederGatewayClient):
+    pass
+
+
+_pool = ClientPool()
+
+
+def get_client_pool(limit=None, limit_per_host=None, keepalive_timeout=None):
+    """
+    Return the pool of gateway clients of the process.
+
+    @param limit: Total number of connections of the session.
+    @param limit_per_host: Number of connections of the session to one host.
+    @param keepalive_timeout: Seconds idle connections are kept open.
+
+    The limits given replace the ones of the pool (see `ClientPool.configure`),
+    so set them before the first request.
+    """
+    _pool.configure(limit, limit_per_host, keepalive_timeout)
+    return _pool
+
+
+def get_gateway_client(network):
+    """Return the pooled client of the gateway of a network."""
+    return _pool.get_gateway_client(network)
+
+
+def get_feeder_gateway_client(network):
+    """Return the pooled client of the feeder gateway of a network."""
+    return _pool.get_feeder_gateway_client(network)
+
+
+async def add_transaction(tx, network):
+    """
+    Send a transaction, and return the gateway response.
+
+    @param tx: A starkware gateway transaction (e.g. `InvokeFunction`).
+    @param network: Network to send the transaction to.
+    @return: A dict with the `transaction_hash` (and the `class_hash` or
+      `address` of declarations and account deployments).
+    """
+    response = await get_gateway_client(network).add_transaction(tx=tx)
+    assert_tx_received(response)
+    return response
+
+
+async def estimate_fee(tx, network):
+    """Return the `FeeEstimationInfo` of a transaction, on the pending block."""
+    client = get_feeder_gateway_client(network)
+    return await client.estimate_fee(tx=tx, block_number="pending")
+
+
+async def simulate_transaction(tx, network):
+    """Return the `TransactionSimulationInfo` of a transaction, on the pending block."""
+    client = get_feeder_gateway_client(network)
+    return await client.simulate_transaction(tx=tx, block_number="pending")
+
+
+async def get_nonce(contract_address, network):
+    """Return the nonce of a contract, on the pending block."""
+    client = get_feeder_gateway_client(network)
+    return await client.get_nonce(
+        contract_address=contract_address, block_number="pending"
+    )
+
+
+async def call_contract(contract_address, method, calldata, network):
+    """Call a view function of a contract, and return the result as integers."""
+    call_function = CallFunction(
+        contract_address=contract_address,
+        entry_point_selector=get_selector_from_name(method),
+        calldata=calldata,
+    )
+    client = get_feeder_gateway_client(network)
+    response = await client.call_contract(
+        call_function=call_function, block_number="pending"
+    )
+    return [int(felt, 16) for felt in response["result"]]
+
+
+async def get_transaction_status(tx_hash, network):
+    """Return the status of a transaction (a dict, as the `tx_status` command)."""
+    client = get_feeder_gateway_client(network)
+    return await client.get_transaction_status(tx_hash=tx_hash)
+
+
+async def get_block(network, block_number="latest"):
+    """Return a block (a `StarknetBlock`) by number, or the latest one."""
+    client = get_feeder_gateway_client(network)
+    return await client.get_block(block_number=block_number)
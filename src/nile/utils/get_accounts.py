@@ -1,58 +1,75 @@
 """Retrieve and manage deployed accounts."""
 
+import asyncio
 import json
 import logging
+import os
 
-import requests
+import aiohttp
 
-from nile.accounts import current_index
-from nile.common import get_gateways
+from nile import accounts
+from nile.common import PREDEPLOYED_ACCOUNTS_FILENAME, get_gateways
 from nile.core.types.account import Account
+from nile.starknet_cli.gateway import get_client_pool
 from nile.utils import hex_address, normalize_number
 
 GATEWAYS = get_gateways()
 
-# remove requests info logs coming from urllib3
-logging.getLogger("urllib3").setLevel(logging.WARNING)
+# devnet responses, by endpoint and seed
+_predeployed_accounts = {}
 
 
 async def get_accounts(network):
     """Retrieve deployed accounts."""
     try:
-        total_accounts = current_index(network)
-        logging.info(f"\nTotal registered accounts: {total_accounts}\n")
+        account_data = accounts.load_all(network)
     except FileNotFoundError:
         print(f"\n❌ No registered accounts detected in {network}.accounts.json")
         print("For more info, see https://github.com/OpenZeppelin/nile#get-accounts\n")
         return
 
-    with open(f"{network}.accounts.json", "r") as f:
-        account_data = json.load(f)
-
-    accounts = []
-    pubkeys = [normalize_number(i) for i in account_data.keys()]
-    addresses = [normalize_number(i["address"]) for i in account_data.values()]
-    signers = [i["alias"] for i in account_data.values()]
-
-    for i in range(total_accounts):
-        logging.info(f"{i}: {hex_address(addresses[i])}")
-
-        _account = await _check_and_return_account(signers[i], pubkeys[i], network)
-        accounts.append(_account)
+    logging.info(f"\nTotal registered accounts: {len(account_data)}\n")
+
+    for i, data in enumerate(account_data.values()):
+        logging.info(f"{i}: {hex_address(normalize_number(data['address']))}")
+
+    # the accounts were already loaded, so they are built from this data
+    # instead of looking each one up again
+    deployed_accounts = await asyncio.gather(
+        *[
+            _check_and_return_account(
+                normalize_number(os.environ[data["alias"]]),
+                normalize_number(pubkey),
+                network,
+                {
+                    "address": normalize_number(data["address"]),
+                    "alias": data["alias"],
+                    "index": data["index"],
+                },
+            )
+            for pubkey, data in account_data.items()
+        ]
+    )
 
     logging.info("\n🚀 Successfully retrieved deployed accounts")
-    return accounts
+    return list(deployed_accounts)
 
 
-async def get_predeployed_accounts(network):
-    """Retrieve pre-deployed accounts."""
+async def get_predeployed_accounts(network, seed=None):
+    """
+    Retrieve pre-deployed accounts.
+
+    The devnet response is kept for the whole process. Pass the `seed` the
+    devnet was started with to also keep it in `<NETWORK>.predeployed_accounts.json`
+    for later runs, since the accounts of a seed never change.
+    """
     endpoint = f"{GATEWAYS.get(network)}/predeployed_accounts"
+    file = f"{network}.{PREDEPLOYED_ACCOUNTS_FILENAME}"
 
     try:
         # get the account objects from the rest api
-        response = requests.get(endpoint)
-        _accounts = response.json()
-    except requests.exceptions.MissingSchema:
+        _accounts = await _fetch_predeployed_accounts(endpoint, seed, file)
+    except aiohttp.InvalidURL:
         logging.error("\n❌ Failed to retrieve gateway from provided network")
         return
     except Exception:
@@ -60,29 +77,70 @@ async def get_predeployed_accounts(network):
         logging.error("Check you are connected to a starknet-devnet implementation")
         return
 
-    # the account instances from core/account
-    accounts = []
-
     for i in range(len(_accounts)):
         logging.info(f"{i}: {_accounts[i]['address']}")
 
-        predeployed_info = {
-            "address": normalize_number(_accounts[i]["address"]),
-            "alias": f"account-{i}",
-            "index": i,
-        }
+    # the account instances from core/account
+    predeployed_accounts = await asyncio.gather(
+        *[
+            _check_and_return_account(
+                normalize_number(_account["private_key"]),
+                normalize_number(_account["public_key"]),
+                network,
+                {
+                    "address": normalize_number(_account["address"]),
+                    "alias": f"account-{i}",
+                    "index": i,
+                },
+            )
+            for i, _account in enumerate(_accounts)
+        ]
+    )
 
-        _account = await _check_and_return_account(
-            normalize_number(_accounts[i]["private_key"]),
-            normalize_number(_accounts[i]["public_key"]),
-            network,
-            predeployed_info,
-        )
+    logging.info("\n🚀 Successfully retrieved pre-deployed accounts")
+    return list(predeployed_accounts)
 
-        accounts.append(_account)
 
-    logging.info("\n🚀 Successfully retrieved pre-deployed accounts")
-    return accounts
+async def _fetch_predeployed_accounts(endpoint, seed, file=None):
+    key = (endpoint, seed)
+    if key not in _predeployed_accounts:
+        # without a seed, a restarted devnet may have other accounts
+        cached = _load_predeployed_accounts(file, endpoint, seed)
+        if cached is None:
+            session = get_client_pool().get_session()
+            async with session.get(endpoint, raise_for_status=True) as response:
+                cached = await response.json()
+            _save_predeployed_accounts(file, endpoint, seed, cached)
+
+        _predeployed_accounts[key] = cached
+
+    return _predeployed_accounts[key]
+
+
+def _load_predeployed_accounts(file, endpoint, seed):
+    if file is None or seed is None:
+        return None
+
+    try:
+        with open(file, "r") as fp:
+            return json.load(fp).get(endpoint, {}).get(str(seed))
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _save_predeployed_accounts(file, endpoint, seed, predeployed_accounts):
+    if file is None or seed is None:
+        return
+
+    try:
+        with open(file, "r") as fp:
+            responses = json.load(fp)
+    except (OSError, ValueError):
+        responses = {}
+
+    responses.setdefault(endpoint, {})[str(seed)] = predeployed_accounts
+    with open(file, "w") as fp:
+        json.dump(responses, fp, indent=2)
 
 
 async def _check_and_return_account(signer, pubkey, network, predeployed_info=None):
@@ -2,7 +2,8 @@
 
 import logging
 
-from nile.starknet_cli import execute_call
+from nile.starknet_cli import gateway
+from nile.utils import normalize_number
 
 
 async def get_nonce(contract_address, network):
@@ -16,9 +17,4 @@ async def get_nonce(contract_address, network):
 
 async def get_nonce_without_log(contract_address, network):
     """Get the current nonce without logging."""
-    # Starknet CLI requires a hex string for get_nonce command
-    if not str(contract_address).startswith("0x"):
-        contract_address = hex(int(contract_address))
-
-    output = await execute_call("get_nonce", network, contract_address=contract_address)
-    return int(output)
+    return await gateway.get_nonce(normalize_number(contract_address), network)
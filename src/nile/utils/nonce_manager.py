@@ -0,0 +1,68 @@
+"""Hand out account nonces locally, fetching them from the network only once."""
+
+from nile.utils import normalize_number
+from nile.utils.get_nonce import get_nonce_without_log as get_nonce
+
+_managers = {}
+
+
+def get_nonce_manager(address, network):
+    """Return the nonce manager of an account (shared by the whole process)."""
+    key = (normalize_number(address), network)
+    if key not in _managers:
+        _managers[key] = NonceManager(*key)
+
+    return _managers[key]
+
+
+class NonceManager:
+    """
+    Local nonce counter of an account.
+
+    The current nonce is fetched on first use, then incremented locally for
+    every submitted transaction, so transactions can be submitted back to
+    back without waiting for the previous ones to be accepted. Transactions
+    that are only queried (e.g. for fee estimation) `peek` at the nonce
+    without taking it. Call `resync` whenever a nonce may have been handed
+    out without being consumed (e.g. a rejected transaction), so the next one
+    is fetched from the network again. Transactions with a managed nonce
+    failing on a nonce error are retried once after a resync.
+    """
+
+    def __init__(self, address, network):
+        """Construct a manager that will fetch the nonce on first use."""
+        self.address = address
+        self.network = network
+        self.nonce = None
+
+    async def peek(self):
+        """Return the nonce the next transaction will get, without taking it."""
+        if self.nonce is None:
+            nonce = await get_nonce(self.address, self.network)
+
+            # another task may have fetched it meanwhile
+            if self.nonce is None:
+                self.nonce = nonce
+
+        return self.nonce
+
+    async def next(self):
+        """Return the nonce to use for the next transaction."""
+        nonce = await self.peek()
+        self.nonce = nonce + 1
+        return nonce
+
+    def advance_past(self, nonce):
+        """Hand out nonces after one used explicitly by a transaction."""
+        if self.nonce is None or nonce >= self.nonce:
+            self.nonce = nonce + 1
+
+    def resync(self):
+        """Fetch the nonce from the network again on next use."""
+        self.nonce = None
+
+
+def is_nonce_error(error):
+    """Return whether a gateway error is due to an invalid nonce."""
+    # e.g. StarknetErrorCode.INVALID_TRANSACTION_NONCE
+    return "nonce" in str(error).lower()
@@ -0,0 +1,109 @@
+"""Keep the receipts of finalized transactions locally."""
+
+import json
+import logging
+import os
+from collections import OrderedDict
+
+from nile.common import RECEIPT_CACHE_SIZE, RECEIPTS_FILENAME
+from nile.utils import hex_class_hash
+
+_caches = {}
+
+
+def get_receipt_cache(network):
+    """Return the receipt cache of a network (shared by the whole process)."""
+    path = os.path.abspath(f"{network}.{RECEIPTS_FILENAME}")
+    if path not in _caches:
+        _caches[path] = ReceiptCache(path)
+
+    return _caches[path]
+
+
+class ReceiptCache:
+    """
+    Least recently used store of finalized transaction receipts.
+
+    Receipts of transactions ACCEPTED ON L1 or REJECTED never change, so they
+    are kept in `<NETWORK>.receipts.jsonl` and served from there instead of
+    querying the network again. At most `size` receipts are kept, evicting
+    the least recently used ones first.
+
+    The file is an append-only log: a `[tx_hash, receipt]` line per stored
+    receipt and a `[tx_hash]` line per cache hit (to keep recency across
+    processes). It is compacted once it grows past twice the cache size.
+    """
+
+    def __init__(self, path, size=RECEIPT_CACHE_SIZE):
+        """Construct a cache persisted in path."""
+        self.path = path
+        self.size = size
+        self.receipts = OrderedDict()
+        self.log_length = 0
+
+        try:
+            with open(path, "r") as fp:
+                for line in fp:
+                    self._replay(line)
+        except FileNotFoundError:
+            pass
+
+    def get(self, tx_hash):
+        """Return the receipt of a finalized transaction, or None if unknown."""
+        key = hex_class_hash(tx_hash)
+        receipt = self.receipts.get(key)
+        if receipt is not None:
+            self.receipts.move_to_end(key)
+            self._append([key])
+
+        return receipt
+
+    def put(self, tx_hash, receipt):
+        """Store the receipt of a finalized transaction."""
+        key = hex_class_hash(tx_hash)
+        self._store(key, receipt)
+        self._append([key, receipt])
+
+    def _store(self, key, receipt):
+        self.receipts[key] = receipt
+        self.receipts.move_to_end(key)
+        while len(self.receipts) > self.size:
+            self.receipts.popitem(last=False)
+
+    def _replay(self, line):
+        self.log_length += 1
+        try:
+            key, *receipt = json.loads(line)
+        except ValueError:
+            # e.g. a line cut short by an interrupted write
+            logging.warning(f"⚠ Ignoring corrupted line in receipts file {self.path}")
+            return
+
+        if receipt:
+            self._store(key, receipt[0])
+        elif key in self.receipts:
+            self.receipts.move_to_end(key)
+
+    def _append(self, entry):
+        if self.log_length >= 2 * self.size:
+            self._compact()
+            return
+
+        try:
+            with open(self.path, "a") as fp:
+                fp.write(json.dumps(entry) + "\n")
+            self.log_length += 1
+        except OSError as e:
+            logging.warning(f"⚠ Could not save receipts to {self.path}: {e}")
+
+    def _compact(self):
+        # rewrite the log with one line per receipt, oldest first
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as fp:
+                for key, receipt in self.receipts.items():
+                    fp.write(json.dumps([key, receipt]) + "\n")
+            os.replace(tmp_path, self.path)
+            self.log_length = len(self.receipts)
+        except OSError as e:
+            logging.warning(f"⚠ Could not save receipts to {self.path}: {e}")
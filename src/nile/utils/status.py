@@ -1,20 +1,26 @@
 """Functions used to find/track/debug a transaction status."""
 
-import json
+import asyncio
 import logging
 import os
-import time
 from collections import namedtuple
 from enum import Enum
 
+from nile import database, deployments
 from nile.common import (
     BUILD_DIRECTORY,
     DEPLOYMENTS_FILENAME,
+    POLL_BACKOFF_FACTOR,
+    POLL_FAST_ATTEMPTS,
+    POLL_INITIAL_SECONDS,
     RETRY_AFTER_SECONDS,
+    TRACKER_MAX_BLOCKS_PER_POLL,
+    TRACKER_STRAGGLER_POLLS,
     get_addresses_from_string,
 )
-from nile.starknet_cli import execute_call
-from nile.utils import hex_class_hash
+from nile.starknet_cli import execute_call, gateway
+from nile.utils import hex_address, hex_class_hash, normalize_number
+from nile.utils.receipt_cache import get_receipt_cache
 
 TransactionStatus = namedtuple(
     "TransactionStatus", ["tx_hash", "status", "error_message"]
@@ -22,37 +28,188 @@ TransactionStatus = namedtuple(
 
 
 async def status(
-    tx_hash, network, watch_mode=None, contracts_file=None
+    tx_hash, network, watch_mode=None, contracts_file=None, poll_intervals=None
 ) -> TransactionStatus:
     """Fetch a transaction status.
 
     Optionally track until resolved (accepted on L2 or rejected) and/or
     use available artifacts to help locate the error. Debug implies track.
+
+    While tracking, the network is polled after each of the `poll_intervals`
+    (in seconds, `get_poll_intervals()` by default) without blocking the
+    event loop, so other transactions can be tracked concurrently.
     """
     logging.info(f"⏳ Transaction hash: {hex_class_hash(tx_hash)}")
     logging.info("⏳ Querying the network for transaction status...")
 
+    intervals = iter(poll_intervals or get_poll_intervals())
     while True:
-        tx_status = await execute_call(
-            "tx_status", network, hash=hex_class_hash(tx_hash)
-        )
-        raw_receipt = json.loads(tx_status)
-        receipt = _get_tx_receipt(tx_hash, raw_receipt, watch_mode)
+        raw_receipt = await _fetch_receipt(tx_hash, network)
+        retry_after = next(intervals, RETRY_AFTER_SECONDS)
+        receipt = _get_tx_receipt(tx_hash, raw_receipt, watch_mode, retry_after)
         if receipt is not None:
             break
 
-    if not receipt.status.is_rejected:
-        return TransactionStatus(tx_hash, receipt.status, None)
+        await asyncio.sleep(retry_after)
 
-    error_message = receipt.receipt["tx_failure_reason"]["error_message"]
-    if watch_mode == "debug":
-        error_message = await debug_message(
-            error_message, tx_hash, network, contracts_file
+    return await _get_transaction_status(receipt, network, watch_mode, contracts_file)
+
+
+async def track(
+    tx_hashes, network, watch_mode="track", contracts_file=None, poll_intervals=None
+):
+    """
+    Track many transactions until resolved, and return their statuses.
+
+    See `StatusTracker`. The statuses are returned in the order of `tx_hashes`.
+    """
+    tracker = StatusTracker(network, watch_mode, contracts_file, poll_intervals)
+    return await tracker.track(tx_hashes)
+
+
+class StatusTracker:
+    """
+    Track the status of many transactions at once, following the new blocks.
+
+    Instead of polling each transaction, the new blocks are fetched once per
+    poll interval, resolving every tracked transaction they contain. The
+    transactions not found in a block after `straggler_polls` polls (e.g.
+    rejected ones, which never make it into a block, or ones included while
+    more than `max_blocks` blocks were produced between two polls) are then
+    queried one by one with `tx_status`.
+    """
+
+    def __init__(
+        self,
+        network,
+        watch_mode="track",
+        contracts_file=None,
+        poll_intervals=None,
+        max_blocks=TRACKER_MAX_BLOCKS_PER_POLL,
+        straggler_polls=TRACKER_STRAGGLER_POLLS,
+    ):
+        """Construct a tracker for the transactions of a network."""
+        self.network = network
+        self.watch_mode = watch_mode
+        self.contracts_file = contracts_file
+        self.poll_intervals = poll_intervals
+        self.max_blocks = max_blocks
+        self.straggler_polls = straggler_polls
+        self.block_number = None
+
+    async def track(self, tx_hashes):
+        """Wait for the transactions to be resolved and return their statuses."""
+        tx_hashes = [normalize_number(tx_hash) for tx_hash in tx_hashes]
+        # polls since each pending transaction was last queried
+        pending = dict.fromkeys(tx_hashes, 0)
+        statuses = {}
+
+        logging.info(f"⏳ Tracking {len(pending)} transactions...")
+
+        receipt_cache = get_receipt_cache(self.network)
+        for tx_hash in [h for h in pending if receipt_cache.get(h) is not None]:
+            statuses[tx_hash] = await self._query(tx_hash)
+            del pending[tx_hash]
+
+        intervals = iter(self.poll_intervals or get_poll_intervals())
+        while True:
+            for tx_hash, tx_status in await self._get_block_statuses(pending):
+                logging.info(f"✅ {hex_class_hash(tx_hash)}: {tx_status}")
+                statuses[tx_hash] = TransactionStatus(tx_hash, tx_status, None)
+                del pending[tx_hash]
+
+            stragglers = [
+                tx_hash
+                for tx_hash, polls in pending.items()
+                if polls >= self.straggler_polls
+            ]
+            for tx_hash in stragglers:
+                tx_status = await self._query(tx_hash)
+                if tx_status is None:
+                    pending[tx_hash] = 0
+                else:
+                    statuses[tx_hash] = tx_status
+                    del pending[tx_hash]
+
+            if not pending:
+                break
+
+            for tx_hash in pending:
+                pending[tx_hash] += 1
+
+            await asyncio.sleep(next(intervals, RETRY_AFTER_SECONDS))
+
+        return [statuses[tx_hash] for tx_hash in tx_hashes]
+
+    async def _get_block_statuses(self, pending):
+        """Return the pending transactions found in the new blocks, with status."""
+        latest = await self._get_block("latest")
+        latest_number = latest.block_number
+
+        if self.block_number is None:
+            numbers = []
+        else:
+            first_number = max(
+                self.block_number + 1, latest_number - self.max_blocks + 1
+            )
+            numbers = range(first_number, latest_number)
+
+        found = []
+        for block in [*[await self._get_block(n) for n in numbers], latest]:
+            if block.block_number == self.block_number:
+                continue
+
+            tx_status = TxStatus.__members__.get(block.status.name)
+            if tx_status is None or not tx_status.is_accepted:
+                continue
+
+            for tx in block.transactions:
+                tx_hash = tx.transaction_hash
+                if tx_hash in pending:
+                    found.append((tx_hash, tx_status))
+
+        self.block_number = latest_number
+        return found
+
+    async def _get_block(self, number):
+        return await gateway.get_block(self.network, block_number=number)
+
+    async def _query(self, tx_hash):
+        """Return the status of a transaction if resolved, None otherwise."""
+        raw_receipt = await _fetch_receipt(tx_hash, self.network)
+        receipt = _TransactionReceipt(
+            tx_hash, TxStatus.from_receipt(raw_receipt), raw_receipt
         )
+        if not (receipt.status.is_accepted or receipt.status.is_rejected):
+            return None
 
-    logging.info(f"🧾 Error message:\n{error_message}")
+        icon = "❌" if receipt.status.is_rejected else "✅"
+        logging.info(f"{icon} {hex_class_hash(tx_hash)}: {receipt.status}")
+        return await _get_transaction_status(
+            receipt, self.network, self.watch_mode, self.contracts_file
+        )
+
+
+def get_poll_intervals(
+    initial=POLL_INITIAL_SECONDS,
+    fast_attempts=POLL_FAST_ATTEMPTS,
+    factor=POLL_BACKOFF_FACTOR,
+    maximum=RETRY_AFTER_SECONDS,
+):
+    """
+    Yield the waits (in seconds) between transaction status polls.
 
-    return TransactionStatus(tx_hash, receipt.status, error_message)
+    The first `fast_attempts` polls are `initial` seconds apart, so a
+    transaction accepted right away (e.g. on a devnet) is reported without
+    delay. The wait is then multiplied by `factor` on each poll, up to `maximum`.
+    """
+    interval = initial
+    for _ in range(fast_attempts):
+        yield min(interval, maximum)
+
+    while True:
+        interval = min(interval * factor, maximum)
+        yield interval
 
 
 _TransactionReceipt = namedtuple("TransactionReceipt", ["tx_hash", "status", "receipt"])
@@ -99,6 +256,13 @@ async def debug_message(error_message, tx_hash, network, contracts_file=None):
 
 
 def _get_contracts_data(contracts_file, network, addresses):
+    if not contracts_file and database.is_enabled():
+        return [
+            f"{hex_address(deployed_address)}:{_abi_to_path(abi)}"
+            for address in addresses
+            for deployed_address, abi in deployments.load(address, network)
+        ]
+
     file = contracts_file or f"{network}.{DEPLOYMENTS_FILENAME}"
     to_contract = (lambda x: x) if contracts_file else _abi_to_path
     contracts = _locate_error_lines_with_abis(file, addresses, to_contract)
@@ -137,7 +301,38 @@ def _locate_error_lines_with_abis(file, addresses, to_contract):
     return contracts
 
 
-def _get_tx_receipt(tx_hash, raw_receipt, watch_mode) -> _TransactionReceipt:
+async def _fetch_receipt(tx_hash, network):
+    """Return the receipt of a transaction, from the receipt cache if finalized."""
+    receipt_cache = get_receipt_cache(network)
+    raw_receipt = receipt_cache.get(tx_hash)
+    if raw_receipt is None:
+        raw_receipt = await gateway.get_transaction_status(
+            hex_class_hash(tx_hash), network
+        )
+        if TxStatus.from_receipt(raw_receipt).is_final:
+            receipt_cache.put(tx_hash, raw_receipt)
+
+    return raw_receipt
+
+
+async def _get_transaction_status(receipt, network, watch_mode, contracts_file):
+    if not receipt.status.is_rejected:
+        return TransactionStatus(receipt.tx_hash, receipt.status, None)
+
+    error_message = receipt.receipt["tx_failure_reason"]["error_message"]
+    if watch_mode == "debug":
+        error_message = await debug_message(
+            error_message, receipt.tx_hash, network, contracts_file
+        )
+
+    logging.info(f"🧾 Error message:\n{error_message}")
+
+    return TransactionStatus(receipt.tx_hash, receipt.status, error_message)
+
+
+def _get_tx_receipt(
+    tx_hash, raw_receipt, watch_mode, retry_after=RETRY_AFTER_SECONDS
+) -> _TransactionReceipt:
     receipt = _TransactionReceipt(
         tx_hash, TxStatus.from_receipt(raw_receipt), raw_receipt
     )
@@ -156,8 +351,7 @@ def _get_tx_receipt(tx_hash, raw_receipt, watch_mode) -> _TransactionReceipt:
         logging.info(f"🕒 {log_output}.")
         return receipt
 
-    logging.info(f"🕒 {log_output}. Trying again in {RETRY_AFTER_SECONDS} seconds...")
-    time.sleep(RETRY_AFTER_SECONDS)
+    logging.info(f"🕒 {log_output}. Trying again in {retry_after:g} seconds...")
 
 
 class TxStatus(Enum):
@@ -180,6 +374,11 @@ class TxStatus(Enum):
         """Whether transaction status is considered rejected."""
         return self == TxStatus.REJECTED
 
+    @property
+    def is_final(self):
+        """Whether transaction status can no longer change."""
+        return self in {TxStatus.ACCEPTED_ON_L1, TxStatus.REJECTED}
+
     def __str__(self):
         """Restore StarkNet status label (with spaces)."""
         return self.name.replace("_", " ")
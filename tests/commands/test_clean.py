@@ -10,6 +10,8 @@ from nile.common import (
     BUILD_DIRECTORY,
     DECLARATIONS_FILENAME,
     DEPLOYMENTS_FILENAME,
+    PREDEPLOYED_ACCOUNTS_FILENAME,
+    RECEIPTS_FILENAME,
 )
 from nile.core.clean import clean
 
@@ -34,6 +36,8 @@ def test_clean_already_clean(mock_os_remove, mock_shutil_rmtree):
         f"localhost.{ACCOUNTS_FILENAME}",
         f"localhost.{DEPLOYMENTS_FILENAME}",
         f"localhost.{DECLARATIONS_FILENAME}",
+        f"localhost.{RECEIPTS_FILENAME}",
+        f"localhost.{PREDEPLOYED_ACCOUNTS_FILENAME}",
     ],
 )
 @patch("nile.core.clean.shutil.rmtree")
@@ -5,12 +5,27 @@ Only unit tests for now. No contracts are actually compiled.
 """
 
 import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import Mock, patch
 
 import pytest
 
-from nile.common import ABIS_DIRECTORY, CONTRACTS_DIRECTORY
-from nile.core.compile import _compile_contract, compile
+from nile.common import (
+    ABIS_DIRECTORY,
+    BUILD_CACHE_MANIFEST,
+    BUILD_DIRECTORY,
+    CONTRACTS_DIRECTORY,
+    load_class_hash_index,
+)
+from nile.core.compile import (
+    _compile_contract,
+    _compile_contract_in_process,
+    _load_compiler,
+    compile,
+)
 
 CONTRACT = "foo.cairo"
 
@@ -180,3 +195,191 @@ def test__compile_cairo_path(
         stdout=mock_subprocess.PIPE,
     )
     mock_process.communicate.assert_called_once()
+
+
+@patch("nile.core.compile._compile_contract")
+def test_compile_jobs_failure_order(mock__compile_contract, caplog):
+    logging.getLogger().setLevel(logging.INFO)
+    contracts = [f"contract_{i}.cairo" for i in range(6)]
+
+    mock__compile_contract.side_effect = lambda path, *_: int(path[-7]) % 2
+    compile(contracts, jobs=4)
+
+    assert mock__compile_contract.call_count == len(contracts)
+    failed = [message.strip() for message in caplog.messages[-3:]]
+    assert failed == ["contract_1.cairo", "contract_3.cairo", "contract_5.cairo"]
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _fake_compile(path, *_):
+    filename = os.path.splitext(os.path.basename(path))[0]
+    for directory in (BUILD_DIRECTORY, ABIS_DIRECTORY):
+        with open(f"{directory}/{filename}.json", "w") as fp:
+            fp.write("{}")
+    return 0
+
+
+@patch("nile.core.compile._compile_contract", side_effect=_fake_compile)
+def test_compile_skips_up_to_date_contracts(mock__compile_contract, tmp_working_dir):
+    _write(tmp_working_dir / "contracts/lib/math.cairo", "func add() {}")
+    _write(
+        tmp_working_dir / "contracts/token.cairo",
+        "from lib.math import add\nfrom starkware.cairo.common.bool import TRUE\n",
+    )
+    _write(tmp_working_dir / "contracts/other.cairo", "")
+
+    compile([])
+    assert mock__compile_contract.call_count == 3
+    assert (tmp_working_dir / BUILD_CACHE_MANIFEST).exists()
+
+    mock__compile_contract.reset_mock()
+    compile([])
+    mock__compile_contract.assert_not_called()
+
+    # changing an imported module invalidates its dependents only
+    _write(tmp_working_dir / "contracts/lib/math.cairo", "func add() {}\n")
+    compile([])
+    compiled = sorted(c.args[0] for c in mock__compile_contract.call_args_list)
+    assert compiled == ["contracts/lib/math.cairo", "contracts/token.cairo"]
+
+    mock__compile_contract.reset_mock()
+    compile([], disable_hint_validation=True)
+    assert mock__compile_contract.call_count == 3
+
+    mock__compile_contract.reset_mock()
+    compile(["contracts/other.cairo"], disable_hint_validation=True, force=True)
+    mock__compile_contract.assert_called_once()
+
+
+@patch("nile.core.compile._compile_contract", side_effect=_fake_compile)
+def test_compile_rebuilds_missing_or_failed_artifacts(
+    mock__compile_contract, tmp_working_dir
+):
+    _write(tmp_working_dir / "contracts/token.cairo", "")
+    compile([])
+
+    os.remove(f"{BUILD_DIRECTORY}/token.json")
+    compile([])
+    assert mock__compile_contract.call_count == 2
+
+    mock__compile_contract.side_effect = [1]
+    (tmp_working_dir / "contracts/token.cairo").write_text("bad")
+    compile([])
+
+    mock__compile_contract.side_effect = _fake_compile
+    compile([])
+    assert mock__compile_contract.call_count == 4
+
+
+@patch("nile.common.get_class_hash", return_value=0x777)
+@patch("nile.core.compile._compile_contract", side_effect=_fake_compile)
+def test_compile_indexes_class_hashes(mock__compile_contract, mock_get_class_hash):
+    contracts = ["contracts/token.cairo", "contracts/broken.cairo"]
+    mock__compile_contract.side_effect = lambda path, *args: (
+        1 if "broken" in path else _fake_compile(path, *args)
+    )
+    compile(contracts)
+
+    assert list(load_class_hash_index()) == ["token"]
+    assert load_class_hash_index()["token"]["class_hash"] == "0x777"
+
+
+@patch("nile.core.compile._compile_contract", side_effect=_fake_compile)
+def test_compile_hashes_in_workers(mock__compile_contract):
+    threads = []
+
+    def get_class_hash(*args):
+        threads.append(threading.current_thread())
+        return 0x777
+
+    with patch("nile.common.get_class_hash", side_effect=get_class_hash):
+        compile(["contracts/token.cairo", "contracts/vault.cairo"], jobs=2)
+
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
+    assert sorted(load_class_hash_index()) == ["token", "vault"]
+
+
+@patch("nile.core.compile._compile_contract", side_effect=_fake_compile)
+def test_compile_expands_library_files(mock__compile_contract, tmp_working_dir):
+    _write(tmp_working_dir / "contracts/lib/math.cairo", "func add() {}")
+    _write(tmp_working_dir / "contracts/lib/unused.cairo", "func sub() {}")
+    _write(
+        tmp_working_dir / "contracts/token.cairo",
+        "from lib.math import add\n@external\nfunc mint() {}",
+    )
+    _write(
+        tmp_working_dir / "contracts/vault.cairo",
+        "from lib.math import add\n@view\nfunc total() {}",
+    )
+    _write(tmp_working_dir / "contracts/other.cairo", "@view\nfunc x() {}")
+
+    compile(
+        [
+            "contracts/lib/math.cairo",
+            "contracts/lib/unused.cairo",
+            "contracts/token.cairo",
+        ]
+    )
+
+    compiled = [c.args[0] for c in mock__compile_contract.call_args_list]
+    assert sorted(compiled) == [
+        "contracts/lib/unused.cairo",
+        "contracts/token.cairo",
+        "contracts/vault.cairo",
+    ]
+
+
+@pytest.mark.parametrize(
+    "outcome, expected",
+    [(lambda: 0, 0), (lambda: 1, 1), (lambda: sys.exit(2), 2), (lambda: 1 / 0, 1)],
+)
+def test__compile_contract_in_process(outcome, expected):
+    argv = sys.argv
+    calls = []
+
+    def main():
+        calls.append(sys.argv)
+        return outcome()
+
+    with patch("nile.core.compile._load_compiler", return_value=main):
+        result = _compile_contract_in_process(
+            "path/to/Account.cairo", disable_hint_validation=True
+        )
+
+    assert result == expected
+    assert sys.argv is argv
+    assert calls == [
+        [
+            "starknet-compile-deprecated",
+            "path/to/Account.cairo",
+            f"--cairo_path={CONTRACTS_DIRECTORY}",
+            "--output",
+            "artifacts/Account.json",
+            "--abi",
+            "artifacts/abis/Account.json",
+            "--account_contract",
+            "--disable_hint_validation",
+        ]
+    ]
+
+
+@patch("nile.core.compile.ProcessPoolExecutor")
+@patch("nile.core.compile._compile_contract_in_process", return_value=0)
+def test_compile_in_process_backend(
+    mock__compile_contract_in_process, mock_process_pool, mock_subprocess
+):
+    # run the "worker processes" as threads
+    mock_process_pool.side_effect = lambda max_workers, initializer: (
+        ThreadPoolExecutor(max_workers)
+    )
+
+    compile([CONTRACT, "bar.cairo"], jobs=4, backend="in-process")
+
+    mock_process_pool.assert_called_once_with(max_workers=2, initializer=_load_compiler)
+    assert mock__compile_contract_in_process.call_count == 2
+    mock_subprocess.Popen.assert_not_called()
@@ -29,9 +29,9 @@ ALIAS = "alias"
 PATH = (BUILD_DIRECTORY, ABIS_DIRECTORY)
 OVERRIDING_PATH = ("new_path", ABIS_DIRECTORY)
 MAX_FEE = 432
-CALL_OUTPUT = b"output"
 HASH = 111
 TX_HASH = 222
+CALL_OUTPUT = {"class_hash": hex(HASH), "transaction_hash": hex(TX_HASH)}
 TX_STATUS = TransactionStatus(TX_HASH, TxStatus.ACCEPTED_ON_L2, None)
 
 
@@ -49,18 +49,18 @@ def test_alias_exists():
 @pytest.mark.parametrize("alias", ["my_contract"])
 @pytest.mark.parametrize("overriding_path", [OVERRIDING_PATH, None])
 @pytest.mark.parametrize("watch_mode", ["track", None])
-@patch("nile.core.declare.parse_information", return_value=[HASH, TX_HASH])
 @patch("nile.core.declare.deployments.register_class_hash")
 @patch(
     "nile.core.types.transactions.Transaction.execute",
     return_value=(TX_STATUS, CALL_OUTPUT),
 )
 @patch("nile.core.types.transactions.get_contract_class", return_value="ContractClass")
+@patch("nile.core.types.transactions.get_class_hash", return_value=HASH)
 async def test_declare(
+    mock_get_class_hash,
     mock_get_contract_class,
     mock_execute,
     mock_register,
-    mock_parse,
     caplog,
     alias,
     overriding_path,
@@ -96,7 +96,6 @@ async def test_declare(
             signer=account.signer,
             watch_mode=watch_mode,
         )
-        mock_parse.assert_called_once_with(CALL_OUTPUT)
         mock_register.assert_called_once_with(HASH, account.network, alias)
 
         # check logs
@@ -1,22 +1,25 @@
 """Tests for get-accounts command."""
 
+import json
 import logging
 from unittest.mock import MagicMock, patch
 
 import pytest
-from requests.exceptions import MissingSchema
+from aiohttp import InvalidURL, test_utils, web
 
+from nile.common import PREDEPLOYED_ACCOUNTS_FILENAME
 from nile.core.types.account import Account
 from nile.core.types.tx_wrappers import DeployAccountTxWrapper
+from nile.starknet_cli.gateway import get_client_pool
 from nile.utils import hex_address
 from nile.utils import normalize_number as normalize
 from nile.utils.get_accounts import (
     _check_and_return_account,
+    _fetch_predeployed_accounts,
     get_accounts,
     get_predeployed_accounts,
 )
 from nile.utils.status import TransactionStatus, TxStatus
-from tests.mocks.mock_response import MockResponse
 
 NETWORK = "localhost"
 GATEWAYS = {"localhost": "http://127.0.0.1:5050/"}
@@ -27,6 +30,7 @@ PUBKEYS = [
 ADDRESSES = [333, 333]
 INDEXES = [0, 1]
 ALIASES = ["TEST_KEY", "TEST_KEY_2"]
+PRIVATE_KEYS = [1234, 4321]
 MOCK_TX_HASH = 1
 TX_STATUS = TransactionStatus(MOCK_TX_HASH, TxStatus.ACCEPTED_ON_L2, None)
 MOCK_DEPLOY_ACC_TX_WRAPPER = DeployAccountTxWrapper(None, None)
@@ -66,6 +70,18 @@ def tmp_working_dir(monkeypatch, tmp_path):
     return tmp_path
 
 
+@pytest.fixture(autouse=True)
+def private_keys(monkeypatch):
+    for alias, private_key in zip(ALIASES, PRIVATE_KEYS):
+        monkeypatch.setenv(alias, str(private_key))
+
+
+@pytest.fixture(autouse=True)
+def predeployed_accounts():
+    with patch("nile.utils.get_accounts._predeployed_accounts", new={}) as responses:
+        yield responses
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "private_keys, public_keys",
@@ -135,12 +151,7 @@ async def test_get_accounts_no_activated_accounts_feedback(mock_deploy, capsys):
 
 @pytest.mark.asyncio
 @patch(
-    "nile.utils.get_accounts.current_index",
-    MagicMock(return_value=len(PUBKEYS)),
-)
-@patch("nile.utils.get_accounts.open", MagicMock())
-@patch(
-    "nile.utils.get_accounts.json.load",
+    "nile.utils.get_accounts.accounts.load_all",
     MagicMock(return_value=MOCK_ACCOUNTS),
 )
 @patch(
@@ -174,12 +185,7 @@ async def test_get_accounts_activated_accounts_feedback(
     "nile.core.types.account.Account.deploy", return_value=(MOCK_ADDRESS, MOCK_INDEX)
 )
 @patch(
-    "nile.utils.get_accounts.current_index",
-    MagicMock(return_value=len(PUBKEYS)),
-)
-@patch("nile.utils.get_accounts.open", MagicMock())
-@patch(
-    "nile.utils.get_accounts.json.load",
+    "nile.utils.get_accounts.accounts.load_all",
     MagicMock(return_value=MOCK_ACCOUNTS),
 )
 async def test_get_accounts_with_keys(mock_deploy):
@@ -190,7 +196,12 @@ async def test_get_accounts_with_keys(mock_deploy):
 
         # Check correct args are passed to `_check_and_receive_account`
         for i in range(len(PUBKEYS)):
-            mock_return_account.assert_any_call(ALIASES[i], PUBKEYS[i], NETWORK)
+            mock_return_account.assert_any_call(
+                PRIVATE_KEYS[i],
+                PUBKEYS[i],
+                NETWORK,
+                {"address": ADDRESSES[i], "alias": ALIASES[i], "index": INDEXES[i]},
+            )
 
         # Assert call count equals correct number of accounts
         assert mock_return_account.call_count == len(PUBKEYS)
@@ -199,18 +210,40 @@ async def test_get_accounts_with_keys(mock_deploy):
         assert len(result) == len(PUBKEYS)
 
 
+@pytest.mark.asyncio
+async def test_get_accounts_from_file(tmp_working_dir):
+    accounts_file = tmp_working_dir / f"{NETWORK}.accounts.json"
+    accounts_file.write_text(
+        json.dumps(
+            {
+                hex(pubkey): {"address": hex(0x1000 + i), "index": i, "alias": alias}
+                for i, (pubkey, alias) in enumerate(zip(PUBKEYS, ALIASES))
+            }
+        )
+    )
+
+    # accounts are not looked up in the file one by one
+    with patch("nile.accounts.load") as mock_load:
+        result = await get_accounts(NETWORK)
+
+    mock_load.assert_not_called()
+    assert [account.address for account in result] == [0x1000, 0x1001]
+    assert [account.alias for account in result] == ALIASES
+    assert [account.signer.public_key for account in result] == PUBKEYS
+
+
 @pytest.mark.asyncio
 @patch("nile.common.get_gateways", return_value=GATEWAYS)
 @patch("nile.utils.get_accounts._check_and_return_account")
-@patch("requests.get", return_value=MockResponse(JSON_DATA, 200))
-async def test_get_predeployed_accounts(
-    mock_response, mock_return_account, mock_gateways
-):
+@patch("nile.utils.get_accounts._fetch_predeployed_accounts", return_value=JSON_DATA)
+async def test_get_predeployed_accounts(mock_fetch, mock_return_account, mock_gateways):
     result = await get_predeployed_accounts("localhost")
 
     # Assert the correct endpoint is used
-    mock_response.assert_called_once_with(
-        f"{GATEWAYS.get('localhost')}/predeployed_accounts"
+    mock_fetch.assert_called_once_with(
+        f"{GATEWAYS.get('localhost')}/predeployed_accounts",
+        None,
+        f"localhost.{PREDEPLOYED_ACCOUNTS_FILENAME}",
     )
 
     # Check correct args are passed to `_check_and_receive_account`
@@ -240,9 +273,9 @@ async def test_get_predeployed_accounts(
 )
 @patch("nile.common.get_gateways", return_value=GATEWAYS)
 @patch("nile.utils.get_accounts._check_and_return_account")
-@patch("requests.get", return_value=MockResponse(JSON_DATA, 200))
+@patch("nile.utils.get_accounts._fetch_predeployed_accounts", return_value=JSON_DATA)
 async def test_get_predeployed_accounts_logging(
-    mock_response, mock_return_account, mock_gateways, mock_deploy, caplog
+    mock_fetch, mock_return_account, mock_gateways, mock_deploy, caplog
 ):
     # make logs visible to test
     logger = logging.getLogger()
@@ -255,15 +288,71 @@ async def test_get_predeployed_accounts_logging(
     # test exceptions
     logger.setLevel(logging.ERROR)
 
-    # test missing schema first
-    mock_response.side_effect = MissingSchema
+    # test invalid url first
+    mock_fetch.side_effect = InvalidURL("None/predeployed_accounts")
     await get_predeployed_accounts("localhost")
 
     assert "❌ Failed to retrieve gateway from provided network" in caplog.text
 
     # test generic exceptions
-    mock_response.side_effect = Exception
+    mock_fetch.side_effect = Exception
     await get_predeployed_accounts("localhost")
 
     assert "❌ Error querying the account from the gateway" in caplog.text
     assert "Check you are connected to a starknet-devnet implementation" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_fetch_predeployed_accounts_cached():
+    responses = []
+
+    async def handler(request):
+        responses.append(request)
+        return web.json_response(JSON_DATA)
+
+    app = web.Application()
+    app.router.add_get("/predeployed_accounts", handler)
+    async with test_utils.TestServer(app) as server:
+        endpoint = str(server.make_url("/predeployed_accounts"))
+
+        assert await _fetch_predeployed_accounts(endpoint, None) == JSON_DATA
+        assert await _fetch_predeployed_accounts(endpoint, None) == JSON_DATA
+        assert len(responses) == 1
+
+        # another seed means another set of accounts
+        await _fetch_predeployed_accounts(endpoint, 42)
+        assert len(responses) == 2
+
+        await get_client_pool().close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_predeployed_accounts_persisted(
+    tmp_path, monkeypatch, predeployed_accounts
+):
+    monkeypatch.chdir(tmp_path)
+    file = f"localhost.{PREDEPLOYED_ACCOUNTS_FILENAME}"
+    responses = []
+
+    async def handler(request):
+        responses.append(request)
+        return web.json_response(JSON_DATA)
+
+    app = web.Application()
+    app.router.add_get("/predeployed_accounts", handler)
+    async with test_utils.TestServer(app) as server:
+        endpoint = str(server.make_url("/predeployed_accounts"))
+
+        assert await _fetch_predeployed_accounts(endpoint, 42, file) == JSON_DATA
+        await _fetch_predeployed_accounts(endpoint, None, file)
+        assert len(responses) == 2
+
+        # a new process only finds the response of the seeded devnet
+        predeployed_accounts.clear()
+        assert await _fetch_predeployed_accounts(endpoint, 42, file) == JSON_DATA
+        assert len(responses) == 2
+
+        await _fetch_predeployed_accounts(endpoint, None, file)
+        assert len(responses) == 3
+
+        await get_client_pool().close()
@@ -1,18 +1,19 @@
-"""Tests for get-nonce command."""
+"""Tests for get-balance command."""
 
 from unittest.mock import patch
 
 import pytest
 
-from nile.common import ETH_TOKEN_ABI, ETH_TOKEN_ADDRESS
+from nile.common import ETH_TOKEN_ADDRESS
+from nile.utils import normalize_number
 from nile.utils.get_balance import get_balance
 
 NETWORKS = ["mainnet", "goerli", "goerli2", "localhost"]
 CONTRACTS = ["0x4d2", "1234", 1234]
 EXPECTED_VALUES = [
-    ("1000 0", 1000),
-    ("0 0", 0),
-    ("1234564321 5432124", 1848456012128035929902520326020686465121776865),
+    ([1000, 0], 1000),
+    ([0, 0], 0),
+    ([1234564321, 5432124], 1848456012128035929902520326020686465121776865),
 ]
 
 
@@ -22,18 +23,16 @@ EXPECTED_VALUES = [
 @pytest.mark.parametrize("mock_return", EXPECTED_VALUES)
 async def test_get_balance(contract_address, network, mock_return):
     with patch(
-        "nile.utils.get_balance.call_or_invoke",
+        "nile.starknet_cli.gateway.call_contract",
         return_value=mock_return[0],
     ) as mock_call:
         res = await get_balance(contract_address, network)
 
         mock_call.assert_called_once_with(
-            ETH_TOKEN_ADDRESS,
-            "call",
+            normalize_number(ETH_TOKEN_ADDRESS),
             "balanceOf",
-            [contract_address],
-            abi=ETH_TOKEN_ABI,
-            network=network,
+            [1234],
+            network,
         )
 
         assert res == mock_return[1]
@@ -19,13 +19,12 @@ NETWORK = "localhost"
 async def test_get_nonce(contract_address, network, caplog):
     logging.getLogger().setLevel(logging.INFO)
 
-    with patch("nile.utils.get_nonce.execute_call", new=AsyncMock()) as mock_cli_call:
-        mock_cli_call.return_value = NONCE
+    with patch("nile.starknet_cli.gateway.get_nonce", new=AsyncMock()) as mock_get:
+        mock_get.return_value = NONCE
         nonce = await get_nonce(contract_address, network)
         assert nonce == NONCE
 
-        command_args = {"contract_address": contract_address}
-        mock_cli_call.assert_called_once_with("get_nonce", network, **command_args)
+        mock_get.assert_called_once_with(0xFFFF, network)
 
         # Check log
         assert f"Current Nonce: {NONCE}" in caplog.text
@@ -37,9 +36,8 @@ async def test_get_nonce(contract_address, network, caplog):
     ["0x4d2", "1234", 1234],
 )
 async def test_get_nonce_without_log_address_formats(contract_address):
-    with patch("nile.utils.get_nonce.execute_call", new=AsyncMock()) as mock_cli_call:
-        mock_cli_call.return_value = NONCE
+    with patch("nile.starknet_cli.gateway.get_nonce", new=AsyncMock()) as mock_get:
+        mock_get.return_value = NONCE
         await get_nonce_without_log(contract_address, NETWORK)
 
-        command_args = {"contract_address": "0x4d2"}
-        mock_cli_call.assert_called_once_with("get_nonce", NETWORK, **command_args)
+        mock_get.assert_called_once_with(0x4D2, NETWORK)
@@ -0,0 +1,206 @@
+"""Tests for the nonce manager."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from nile.core.types.transactions import InvokeTransaction
+from nile.utils.nonce_manager import NonceManager, get_nonce_manager
+from nile.utils.status import TransactionStatus, TxStatus
+from tests.mocks.mock_account import MockAccount
+
+ADDRESS = 0x123
+NONCE = 5
+NETWORK = "localhost"
+TX_HASH = 0x777
+ADD_TRANSACTION = AsyncMock(return_value={"transaction_hash": hex(TX_HASH)})
+
+
+@pytest.fixture(autouse=True)
+def managers():
+    with patch("nile.utils.nonce_manager._managers", new={}) as managers:
+        yield managers
+
+
+@pytest.mark.asyncio
+@patch("nile.utils.nonce_manager.get_nonce", return_value=NONCE)
+async def test_next(mock_get_nonce):
+    manager = NonceManager(ADDRESS, NETWORK)
+
+    assert await manager.next() == NONCE
+    assert await manager.next() == NONCE + 1
+    mock_get_nonce.assert_called_once_with(ADDRESS, NETWORK)
+
+    manager.resync()
+    assert await manager.next() == NONCE
+    assert mock_get_nonce.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("nile.utils.nonce_manager.get_nonce", return_value=NONCE)
+async def test_next_concurrent(mock_get_nonce):
+    manager = NonceManager(ADDRESS, NETWORK)
+
+    nonces = await asyncio.gather(*[manager.next() for _ in range(5)])
+    assert sorted(nonces) == list(range(NONCE, NONCE + 5))
+
+
+def test_get_nonce_manager():
+    manager = get_nonce_manager(ADDRESS, NETWORK)
+
+    assert get_nonce_manager(hex(ADDRESS), NETWORK) is manager
+    assert get_nonce_manager(ADDRESS, "goerli") is not manager
+
+
+def test_advance_past():
+    manager = NonceManager(ADDRESS, NETWORK)
+
+    manager.advance_past(NONCE)
+    assert manager.nonce == NONCE + 1
+
+    # never moves back
+    manager.advance_past(NONCE - 1)
+    assert manager.nonce == NONCE + 1
+
+
+@pytest.mark.asyncio
+@patch("nile.utils.nonce_manager.get_nonce", return_value=NONCE)
+@patch("nile.core.types.account._set_estimated_fee_if_none")
+async def test_account_nonces(mock_set_fee, mock_get_nonce):
+    account = await MockAccount("TEST_KEY", NETWORK)
+
+    with patch(
+        "nile.core.types.transactions.InvokeTransaction._get_tx_hash",
+        return_value=TX_HASH,
+    ), patch("nile.starknet_cli.gateway.add_transaction", new=ADD_TRANSACTION):
+        txs = [await account.send(ADDRESS, "method", []) for _ in range(3)]
+
+        # nonces are only taken on submission
+        assert [tx.nonce for tx in txs] == [NONCE] * 3
+
+        for tx in txs:
+            await tx.submit()
+
+    assert [tx.nonce for tx in txs] == [NONCE, NONCE + 1, NONCE + 2]
+    mock_get_nonce.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("nile.utils.nonce_manager.get_nonce", return_value=NONCE)
+@patch("nile.core.types.transactions._format_fee_estimation", return_value="")
+async def test_estimate_then_execute(mock_format, mock_get_nonce):
+    account = await MockAccount("TEST_KEY", NETWORK)
+    fee_estimation = SimpleNamespace(overall_fee=10)
+
+    with patch(
+        "nile.core.types.transactions.InvokeTransaction._get_tx_hash",
+        return_value=TX_HASH,
+    ), patch(
+        "nile.starknet_cli.gateway.estimate_fee",
+        new=AsyncMock(return_value=fee_estimation),
+    ), patch(
+        "nile.starknet_cli.gateway.add_transaction", new=ADD_TRANSACTION
+    ):
+        # only queried, so its nonce is not used up
+        query = await account.send(ADDRESS, "method", [], max_fee=0)
+        await query.estimate_fee()
+
+        tx = await account.send(ADDRESS, "method", [])
+        await tx.submit()
+
+    assert tx.tx.nonce == NONCE
+
+
+@pytest.mark.asyncio
+@patch("nile.utils.nonce_manager.get_nonce", return_value=NONCE)
+async def test_explicit_nonce(mock_get_nonce):
+    account = await MockAccount("TEST_KEY", NETWORK)
+
+    with patch(
+        "nile.core.types.transactions.InvokeTransaction._get_tx_hash",
+        return_value=TX_HASH,
+    ), patch("nile.starknet_cli.gateway.add_transaction", new=ADD_TRANSACTION):
+        explicit = await account.send(ADDRESS, "method", [], nonce=NONCE, max_fee=0)
+        await explicit.submit()
+
+        tx = await account.send(ADDRESS, "method", [], max_fee=0)
+        await tx.submit()
+
+    assert tx.tx.nonce == NONCE + 1
+
+
+@pytest.mark.asyncio
+@patch("nile.utils.nonce_manager.get_nonce", return_value=NONCE)
+@patch("nile.core.types.transactions._format_fee_estimation", return_value="")
+async def test_stale_nonce_recovers(mock_format, mock_get_nonce):
+    account = await MockAccount("TEST_KEY", NETWORK)
+    manager = get_nonce_manager(account.address, NETWORK)
+    sent = []
+
+    def check_nonce(tx):
+        if tx.nonce != NONCE:
+            raise Exception(f"Invalid transaction nonce. Expected: {NONCE}")
+
+    async def estimate_fee(tx, network):
+        check_nonce(tx)
+        return SimpleNamespace(overall_fee=10)
+
+    async def add_transaction(tx, network):
+        check_nonce(tx)
+        sent.append(tx.nonce)
+        return {"transaction_hash": hex(TX_HASH)}
+
+    with patch(
+        "nile.core.types.transactions.InvokeTransaction._get_tx_hash",
+        return_value=TX_HASH,
+    ), patch("nile.starknet_cli.gateway.estimate_fee", new=estimate_fee), patch(
+        "nile.starknet_cli.gateway.add_transaction", new=add_transaction
+    ):
+        # e.g. after a rejected transaction nobody tracked
+        manager.nonce = NONCE + 1
+        tx = await account.send(ADDRESS, "method", [])
+        assert tx.tx.nonce == NONCE
+        assert tx.tx.max_fee == 10
+
+        manager.nonce = NONCE + 1
+        await tx.submit()
+
+        # explicit nonces are never retried
+        with pytest.raises(Exception, match="Invalid transaction nonce"):
+            await account.send(ADDRESS, "method", [], nonce=NONCE + 1)
+
+    assert sent == [NONCE]
+    assert manager.nonce is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "add_transaction, tx_status",
+    [
+        (AsyncMock(side_effect=Exception("Invalid transaction nonce")), None),
+        (
+            AsyncMock(return_value={"transaction_hash": hex(TX_HASH)}),
+            TransactionStatus(TX_HASH, TxStatus.REJECTED, "error"),
+        ),
+    ],
+)
+@patch("nile.core.types.transactions.InvokeTransaction._get_tx_hash")
+async def test_resync_on_failure(mock_get_tx_hash, add_transaction, tx_status):
+    mock_get_tx_hash.return_value = TX_HASH
+    manager = get_nonce_manager(ADDRESS, NETWORK)
+    manager.nonce = NONCE + 1
+
+    tx = InvokeTransaction(account_address=ADDRESS, nonce=NONCE)
+    signer = (await MockAccount("TEST_KEY", NETWORK)).signer
+
+    with patch("nile.starknet_cli.gateway.add_transaction", new=add_transaction), patch(
+        "nile.core.types.transactions.status", new=AsyncMock(return_value=tx_status)
+    ):
+        try:
+            await tx.execute(signer)
+        except Exception:
+            pass
+
+    assert manager.nonce is None
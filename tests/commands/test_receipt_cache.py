@@ -0,0 +1,95 @@
+"""Tests for the receipt cache."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from nile.common import RECEIPTS_FILENAME
+from nile.utils import hex_class_hash
+from nile.utils.receipt_cache import ReceiptCache, get_receipt_cache
+from nile.utils.status import status
+
+NETWORK = "goerli"
+TX_HASH = 0x123
+RECEIPT = {"tx_status": "ACCEPTED_ON_L1"}
+
+
+@pytest.fixture(autouse=True)
+def tmp_working_dir(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    with patch("nile.utils.receipt_cache._caches", new={}):
+        yield tmp_path
+
+
+def test_receipt_cache_persisted(tmp_working_dir):
+    get_receipt_cache(NETWORK).put(TX_HASH, RECEIPT)
+
+    path = tmp_working_dir / f"{NETWORK}.{RECEIPTS_FILENAME}"
+    assert json.loads(path.read_text()) == [hex_class_hash(TX_HASH), RECEIPT]
+    assert ReceiptCache(str(path)).get(hex(TX_HASH)) == RECEIPT
+    assert ReceiptCache(str(path)).get(0x456) is None
+
+
+def test_receipt_cache_lru(tmp_working_dir):
+    cache = ReceiptCache(str(tmp_working_dir / RECEIPTS_FILENAME), size=2)
+    cache.put(1, RECEIPT)
+    cache.put(2, RECEIPT)
+    cache.get(1)
+    cache.put(3, RECEIPT)
+
+    assert cache.get(2) is None
+    assert cache.get(1) == cache.get(3) == RECEIPT
+
+
+def test_receipt_cache_lru_persisted(tmp_working_dir):
+    path = str(tmp_working_dir / RECEIPTS_FILENAME)
+    cache = ReceiptCache(path, size=2)
+    cache.put(1, RECEIPT)
+    cache.put(2, RECEIPT)
+
+    # recency is kept across processes
+    ReceiptCache(path, size=2).get(1)
+    ReceiptCache(path, size=2).put(3, RECEIPT)
+
+    cache = ReceiptCache(path, size=2)
+    assert cache.get(2) is None
+    assert cache.get(1) == cache.get(3) == RECEIPT
+
+
+def test_receipt_cache_compacted(tmp_working_dir):
+    path = tmp_working_dir / RECEIPTS_FILENAME
+    cache = ReceiptCache(str(path), size=2)
+    for tx_hash in range(1, 10):
+        cache.put(tx_hash, RECEIPT)
+
+    # the log never grows past twice the cache size
+    assert len(path.read_text().splitlines()) <= 4
+    assert list(ReceiptCache(str(path), size=2).receipts) == list(cache.receipts)
+
+
+def test_receipt_cache_corrupted(tmp_working_dir):
+    path = tmp_working_dir / RECEIPTS_FILENAME
+    path.write_text(json.dumps([hex_class_hash(1), RECEIPT]) + "\n[")
+
+    cache = ReceiptCache(str(path))
+    assert cache.get(TX_HASH) is None
+    assert cache.get(1) == RECEIPT
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "output, cached",
+    [
+        ({"tx_status": "ACCEPTED_ON_L1"}, True),
+        ({"tx_status": "ACCEPTED_ON_L2"}, False),
+    ],
+)
+async def test_status_uses_receipt_cache(output, cached):
+    with patch(
+        "nile.starknet_cli.gateway.get_transaction_status", return_value=output
+    ) as mock_call:
+        await status(TX_HASH, NETWORK)
+        await status(TX_HASH, NETWORK)
+
+    assert mock_call.call_count == (1 if cached else 2)
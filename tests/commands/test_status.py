@@ -1,17 +1,26 @@
 """Tests for debug command."""
 
+import itertools
 import logging
 import sys
 from pathlib import Path
-from unittest.mock import patch
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 import pytest
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    BlockStatus,
+)
 
 from nile.common import BUILD_DIRECTORY, DEPLOYMENTS_FILENAME
+from nile.utils import hex_class_hash
 from nile.utils.status import (
+    StatusTracker,
+    TxStatus,
     _abi_to_path,
     _get_contracts_data,
     _locate_error_lines_with_abis,
+    get_poll_intervals,
     status,
 )
 
@@ -21,8 +30,9 @@ DEBUG_ADDRESS = "0x07826b88e404632d9835ab1ec2076c6cf1910e6ecb2ed270647fc211ff55e
 ABI_PATH = "path/to/abis/test_contract.json"
 ALIAS = "contract_alias"
 MOCK_FILE = 123
-ACCEPTED_OUT = b'{"tx_status": "ACCEPTED_ON_L2"}'
-REJECTED_OUT = b'{"tx_failure_reason": {"error_message": "E"}, "tx_status": "REJECTED"}'
+PENDING_OUT = {"tx_status": "PENDING"}
+ACCEPTED_OUT = {"tx_status": "ACCEPTED_ON_L2"}
+REJECTED_OUT = {"tx_failure_reason": {"error_message": "E"}, "tx_status": "REJECTED"}
 ADDRESSES = {0x123, 0x456}
 
 
@@ -86,7 +96,7 @@ def test__locate_error_lines_with_abis_misformatted_line(mock_path, caplog):
     reason="Issue in cairo-lang. "
     "See https://github.com/starkware-libs/cairo-lang/issues/27",
 )
-@patch("nile.utils.status.execute_call")
+@patch("nile.starknet_cli.gateway.get_transaction_status")
 async def test_status_feedback_with_message(mock_output, output, expected, caplog):
     logging.getLogger().setLevel(logging.INFO)
     mock_output.return_value = output
@@ -114,3 +124,92 @@ def test__get_contracts_data(mock_locate, contracts_file, expected):
     else:
         _contracts_file = mock_locate.call_args[0][0]
         assert _contracts_file == expected
+
+
+def test_get_poll_intervals():
+    intervals = get_poll_intervals(initial=1, fast_attempts=2, factor=3, maximum=20)
+
+    assert list(itertools.islice(intervals, 6)) == [1, 1, 3, 9, 20, 20]
+
+
+@pytest.mark.asyncio
+@patch("nile.utils.status.asyncio.sleep", new_callable=AsyncMock)
+@patch("nile.starknet_cli.gateway.get_transaction_status")
+async def test_status_track_backoff(mock_output, mock_sleep, caplog):
+    logging.getLogger().setLevel(logging.INFO)
+    mock_output.side_effect = [PENDING_OUT, PENDING_OUT, ACCEPTED_OUT]
+
+    tx_status = await status(MOCK_HASH, NETWORK, "track", poll_intervals=[0.5, 2])
+
+    assert tx_status.status.is_accepted
+    assert [call.args[0] for call in mock_sleep.await_args_list] == [0.5, 2]
+    assert "Trying again in 0.5 seconds" in caplog.text
+
+
+@pytest.mark.asyncio
+@patch("nile.utils.status.asyncio.sleep", new_callable=AsyncMock)
+@patch("nile.starknet_cli.gateway.get_transaction_status", return_value=PENDING_OUT)
+async def test_status_no_track(mock_output, mock_sleep):
+    await status(MOCK_HASH, NETWORK)
+
+    mock_output.assert_called_once()
+    mock_sleep.assert_not_called()
+
+
+def _block(number, *tx_hashes, status="ACCEPTED_ON_L2"):
+    transactions = [SimpleNamespace(transaction_hash=tx_hash) for tx_hash in tx_hashes]
+    return SimpleNamespace(
+        block_number=number, status=BlockStatus[status], transactions=transactions
+    )
+
+
+@pytest.mark.asyncio
+@patch("nile.utils.status.asyncio.sleep", new_callable=AsyncMock)
+async def test_status_tracker(mock_sleep):
+    responses = {
+        "latest": [
+            _block(10, 0x1),
+            _block(12, 0x3),
+            _block(12, 0x3),
+        ],
+        11: [_block(11, 0x2, 0x4)],
+        hex_class_hash(0x5): [REJECTED_OUT],
+    }
+
+    async def get_block(network, block_number):
+        return responses[block_number].pop(0)
+
+    async def get_transaction_status(tx_hash, network):
+        return responses[tx_hash].pop(0)
+
+    tracker = StatusTracker(NETWORK, poll_intervals=[1], straggler_polls=2)
+    with patch("nile.starknet_cli.gateway.get_block", new=get_block), patch(
+        "nile.starknet_cli.gateway.get_transaction_status", new=get_transaction_status
+    ):
+        statuses = await tracker.track([0x3, "0x2", 0x1, 0x5])
+
+    assert [(s.tx_hash, s.status) for s in statuses] == [
+        (0x3, TxStatus.ACCEPTED_ON_L2),
+        (0x2, TxStatus.ACCEPTED_ON_L2),
+        (0x1, TxStatus.ACCEPTED_ON_L2),
+        (0x5, TxStatus.REJECTED),
+    ]
+    assert statuses[-1].error_message == "E"
+    # only the straggler is queried on its own, each block is fetched once
+    assert all(len(response) == 0 for response in responses.values())
+
+
+@pytest.mark.asyncio
+@patch("nile.utils.status.asyncio.sleep", new_callable=AsyncMock)
+async def test_status_tracker_pending_straggler(mock_sleep):
+    with patch(
+        "nile.starknet_cli.gateway.get_block", side_effect=[_block(1), _block(1)]
+    ), patch(
+        "nile.starknet_cli.gateway.get_transaction_status",
+        side_effect=[PENDING_OUT, ACCEPTED_OUT],
+    ):
+        tracker = StatusTracker(NETWORK, poll_intervals=[1], straggler_polls=0)
+        (tx_status,) = await tracker.track([MOCK_HASH])
+
+    assert tx_status.status == TxStatus.ACCEPTED_ON_L2
+    mock_sleep.assert_awaited_once()
@@ -0,0 +1,125 @@
+"""Tests for compile --watch."""
+
+import os
+from unittest.mock import Mock, patch
+
+import pytest
+
+from nile.core.build_cache import BuildCache
+from nile.core.imports import DependencyGraph
+from nile.core.watch import (
+    PollingWatcher,
+    _get_affected_contracts,
+    get_watched_directories,
+    wait_for_changes,
+    watch,
+)
+
+
+@pytest.fixture(autouse=True)
+def tmp_working_dir(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _write(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def test_get_watched_directories(tmp_working_dir):
+    (tmp_working_dir / "contracts").mkdir()
+    (tmp_working_dir / "lib").mkdir()
+
+    directories = get_watched_directories("contracts", "lib:./contracts:missing")
+    assert directories == ["contracts", "lib"]
+
+
+def test_polling_watcher(tmp_working_dir):
+    _write(tmp_working_dir / "contracts/a.cairo")
+    _write(tmp_working_dir / "contracts/b.cairo")
+    _write(tmp_working_dir / "contracts/notes.txt")
+    watcher = PollingWatcher(["contracts"])
+
+    assert watcher.get_changes(timeout=0) == set()
+
+    _write(tmp_working_dir / "contracts/a.cairo", "changed")
+    _write(tmp_working_dir / "contracts/lib/c.cairo")
+    _write(tmp_working_dir / "contracts/notes.txt", "changed")
+    os.remove(tmp_working_dir / "contracts/b.cairo")
+
+    assert watcher.get_changes(timeout=0) == {
+        "contracts/a.cairo",
+        "contracts/b.cairo",
+        "contracts/lib/c.cairo",
+    }
+    assert watcher.get_changes(timeout=0) == set()
+
+
+def test_wait_for_changes_debounces_bursts():
+    watcher = Mock()
+    watcher.get_changes.side_effect = [set(), {"a"}, {"a", "b"}, {"c"}, set(), {"d"}]
+
+    assert wait_for_changes(watcher, debounce=0) == {"a", "b", "c"}
+    assert watcher.get_changes.call_count == 5
+
+
+def test__get_affected_contracts(tmp_working_dir):
+    _write(tmp_working_dir / "contracts/token.cairo", "from utils import x\n@view")
+    _write(tmp_working_dir / "contracts/other.cairo", "@view")
+    _write(tmp_working_dir / "contracts/lib.cairo")
+    _write(tmp_working_dir / "vendor/utils.cairo")
+    _write(tmp_working_dir / "vendor/preset.cairo", "@external")
+
+    cache = BuildCache()
+    cache.update("contracts/other.cairo", {"sources": {"contracts/gone.cairo": ""}})
+    cache.save()
+
+    graph = DependencyGraph(["contracts", "vendor"])
+    changes = {
+        "contracts/lib.cairo",
+        "vendor/utils.cairo",
+        "vendor/preset.cairo",
+        "contracts/gone.cairo",
+    }
+
+    assert _get_affected_contracts(changes, "contracts", graph) == [
+        "contracts/other.cairo",
+        "contracts/lib.cairo",
+        "contracts/token.cairo",
+    ]
+
+
+@patch("nile.core.watch.get_watcher")
+@patch("nile.core.watch.get_compiler_pool")
+@patch("nile.core.watch.wait_for_changes")
+@patch("nile.core.watch.compile")
+def test_watch(
+    mock_compile, mock_wait_for_changes, mock_pool, mock_watcher, tmp_working_dir
+):
+    _write(tmp_working_dir / "contracts/token.cairo", "@view")
+    executor = mock_pool.return_value.__enter__.return_value
+    forked = []
+
+    def submit(*args):
+        # the workers are forked before the watcher starts its thread
+        forked.append(not mock_watcher.called)
+        return Mock()
+
+    executor.submit.side_effect = submit
+    mock_wait_for_changes.side_effect = [
+        {"contracts/token.cairo"},
+        {"contracts/notes.cairo"},
+        KeyboardInterrupt,
+    ]
+
+    watch(jobs=2)
+
+    assert forked == [True]
+    mock_pool.assert_called_once_with(2)
+    assert [c.args[0] for c in mock_compile.call_args_list] == [
+        [],
+        ["contracts/token.cairo"],
+    ]
+    for call in mock_compile.call_args_list:
+        assert call.kwargs["executor"] is executor
@@ -0,0 +1,103 @@
+"""Tests for Cairo imports resolution."""
+
+import pytest
+
+from nile.core.imports import (
+    DependencyGraph,
+    get_cairo_path,
+    get_imports,
+    is_entry_point,
+)
+
+CODE = """%lang starknet
+
+from starkware.cairo.common.cairo_builtins import HashBuiltin
+from lib.math import (
+    add,
+    sub,
+)
+// from lib.unused import nothing
+import lib.utils
+"""
+
+
+@pytest.fixture(autouse=True)
+def tmp_working_dir(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("CAIRO_PATH", raising=False)
+    return tmp_path
+
+
+def _write(path, content=""):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def test_get_imports(tmp_working_dir):
+    _write(tmp_working_dir / "contract.cairo", CODE)
+
+    assert get_imports("contract.cairo") == [
+        "starkware.cairo.common.cairo_builtins",
+        "lib.math",
+        "lib.utils",
+    ]
+
+
+@pytest.mark.parametrize(
+    "cairo_path, directory, expected",
+    [
+        (None, None, ["contracts", "."]),
+        (None, "src", ["src", "."]),
+        ("src:missing:contracts", None, ["src", "contracts", "."]),
+    ],
+)
+def test_get_cairo_path(tmp_working_dir, cairo_path, directory, expected):
+    (tmp_working_dir / "contracts").mkdir()
+    (tmp_working_dir / "src").mkdir()
+
+    assert get_cairo_path(cairo_path, directory) == expected
+
+
+def test_get_dependencies(tmp_working_dir):
+    _write(tmp_working_dir / "contracts/contract.cairo", CODE)
+    _write(tmp_working_dir / "contracts/lib/math.cairo", "from lib.utils import x")
+    _write(tmp_working_dir / "contracts/lib/utils.cairo", "from lib.math import y")
+    _write(tmp_working_dir / "contracts/lib/unused.cairo")
+
+    graph = DependencyGraph(["contracts", "."])
+    dependencies = graph.get_dependencies("contracts/contract.cairo")
+    assert dependencies == ["contracts/lib/math.cairo", "contracts/lib/utils.cairo"]
+    assert graph.get_imports("contracts/lib/utils.cairo") == [
+        "contracts/lib/math.cairo"
+    ]
+
+
+def test_get_dependents(tmp_working_dir):
+    _write(tmp_working_dir / "contracts/a.cairo", "from lib.math import add")
+    _write(tmp_working_dir / "contracts/b.cairo", "from lib.token import mint")
+    _write(tmp_working_dir / "contracts/c.cairo", "from lib.other import x")
+    _write(tmp_working_dir / "contracts/lib/token.cairo", "from lib.math import add")
+    _write(tmp_working_dir / "contracts/lib/math.cairo")
+
+    graph = DependencyGraph(["contracts"])
+    candidates = ["contracts/a.cairo", "contracts/b.cairo", "contracts/c.cairo"]
+
+    dependents = graph.get_dependents("./contracts/lib/math.cairo", candidates)
+    assert dependents == ["contracts/a.cairo", "contracts/b.cairo"]
+    assert graph.get_dependents("contracts/a.cairo", candidates) == []
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        ("@external\nfunc mint() {}", True),
+        ("  @view\nfunc balance() {}", True),
+        ("@constructor\nfunc constructor() {}", True),
+        ("@event\nfunc Transfer() {}", False),
+        ("// @external\nfunc mint() {}", False),
+        ("namespace Lib {}", False),
+    ],
+)
+def test_is_entry_point(tmp_working_dir, code, expected):
+    _write(tmp_working_dir / "contract.cairo", code)
+    assert is_entry_point("contract.cairo") is expected
@@ -13,6 +13,7 @@ from nile.common import (
 )
 from nile.core.types.account import Account
 from nile.core.types.tx_wrappers import DeployAccountTxWrapper
+from nile.core.types.utils import get_execute_calldata
 from nile.utils import normalize_number
 from nile.utils.status import TransactionStatus, TxStatus
 from tests.mocks.mock_account import MockAccount
@@ -130,9 +131,11 @@ async def test_deploy_accounts_register(
 @pytest.mark.parametrize("alias", ["my_contract"])
 @pytest.mark.parametrize("overriding_path", [(BUILD_DIRECTORY, ABIS_DIRECTORY), None])
 @patch("nile.core.types.transactions.get_contract_class", return_value="ContractClass")
+@patch("nile.core.types.transactions.get_class_hash", return_value=CLASS_HASH)
 @patch("nile.core.types.account.Account._process_arguments")
 async def test_declare(
     mock_process_arguments,
+    mock_get_class_hash,
     mock_get_class,
     contract_name,
     max_fee,
@@ -211,6 +214,7 @@ async def test_declare_account(
         nonce=0,
         network=account.network,
         overriding_path=overriding_path,
+        managed_nonce=False,
     )
 
 
@@ -338,3 +342,41 @@ async def test_send(
 
         # Check '_process_arguments' call
         mock_process_arguments.assert_called_once_with(max_fee, nonce, calldata)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("max_fee", [0, None])
+@patch("nile.utils.nonce_manager.get_nonce", return_value=5)
+@patch("nile.core.types.account._set_estimated_fee_if_none")
+@patch("nile.core.types.account.deployments.load")
+async def test_send_many(mock_load, mock_set_fee, mock_get_nonce, max_fee):
+    account = await MockAccount(KEY, NETWORK)
+    mock_load.return_value = iter([(0x123, 0)])
+
+    calls = [["my_contract", "method", [1, "0x2"]], [0x456, "other", []]]
+
+    with patch(
+        "nile.core.types.transactions.InvokeTransaction._get_tx_hash"
+    ) as mock_get_tx_hash, patch.dict("nile.utils.nonce_manager._managers", clear=True):
+        mock_get_tx_hash.return_value = 0x777
+
+        tx_wrapper = await account.send_many(calls, max_fee=max_fee)
+
+        tx = tx_wrapper.tx
+        assert tx.nonce == 5
+        assert tx.max_fee == (max_fee or 0)
+        assert tx.calldata == get_execute_calldata(
+            [[0x123, "method", [1, 2]], [0x456, "other", []]]
+        )
+
+        # One nonce fetch and one fee estimation for all the calls
+        mock_get_nonce.assert_called_once_with(account.address, NETWORK)
+        mock_set_fee.assert_called_once_with(max_fee, tx_wrapper)
+
+
+@pytest.mark.asyncio
+async def test_send_many_no_calls():
+    account = await MockAccount(KEY, NETWORK)
+
+    with pytest.raises(AssertionError, match="No calls to send"):
+        await account.send_many([])
@@ -5,6 +5,7 @@ A high-level synchronization check between the Account artifacts and Signer modu
 """
 
 import asyncio
+from unittest.mock import patch
 
 import pytest
 from starkware.starknet.business_logic.transaction.objects import InternalTransaction
@@ -17,7 +18,7 @@ from starkware.starknet.testing.starknet import Starknet
 
 from nile.common import TRANSACTION_VERSION
 from nile.core.types.utils import from_call_to_call_array
-from nile.signer import Signer
+from nile.signer import Signer, get_public_key
 
 PRIVATE_KEY = 12345678987654321
 SIGNER = Signer(PRIVATE_KEY)
@@ -137,3 +138,13 @@ def get_raw_invoke(sender, calls):
     call_array, calldata = from_call_to_call_array(calls)
     raw_invocation = sender.__execute__(call_array, calldata)
     return raw_invocation
+
+
+def test_get_public_key_cached():
+    with patch(
+        "nile.signer.private_to_stark_key", return_value=SIGNER.public_key
+    ) as mock_derive, patch("nile.signer._public_keys", new={}):
+        assert get_public_key(PRIVATE_KEY) == SIGNER.public_key
+        assert Signer(PRIVATE_KEY).public_key == SIGNER.public_key
+
+    mock_derive.assert_called_once_with(PRIVATE_KEY)
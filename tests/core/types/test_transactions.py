@@ -1,30 +1,46 @@
 """Test transactions module."""
 
 import logging
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
-
-from nile.common import (
-    NETWORKS_CHAIN_ID,
-    NILE_ABIS_DIR,
-    QUERY_VERSION_BASE,
-    TRANSACTION_VERSION,
+from starkware.starknet.core.os.transaction_hash.transaction_hash import (
+    TransactionHashPrefix,
+    calculate_deprecated_declare_transaction_hash,
+    calculate_transaction_hash_common,
+)
+from starkware.starknet.services.api.contract_class.contract_class import (
+    DeprecatedCompiledClass,
+)
+from starkware.starknet.services.api.feeder_gateway.response_objects import (
+    FeeEstimationInfo,
 )
+from starkware.starknet.services.api.gateway.transaction import (
+    DeployAccount,
+    DeprecatedDeclare,
+    InvokeFunction,
+)
+
+from nile.common import NETWORKS_CHAIN_ID, QUERY_VERSION_BASE, TRANSACTION_VERSION
 from nile.core.types.transactions import (
     DeclareTransaction,
     DeployAccountTransaction,
     InvokeTransaction,
 )
-from nile.utils import hex_address
+from nile.core.types.utils import get_declare_hash
 from nile.utils.status import TransactionStatus, TxStatus
 from tests.mocks.mock_account import MockAccount
 
 TX_HASH = 123
 TX_HASH_2 = 1234
+CALLDATA_HASH = 12345
 KEY = "TEST_KEY"
 NETWORK = "localhost"
 TX_STATUS = TransactionStatus(TX_HASH, TxStatus.ACCEPTED_ON_L2, None)
+GATEWAY_TX = "gateway_tx"
+GATEWAY_RESPONSE = {"code": "TRANSACTION_RECEIVED", "transaction_hash": hex(TX_HASH)}
+CONTRACT_CLASS = MagicMock(spec=DeprecatedCompiledClass)
+FEE_ESTIMATION = FeeEstimationInfo(overall_fee=1000, gas_price=10, gas_usage=100)
 
 
 @pytest.mark.asyncio
@@ -87,7 +103,9 @@ async def test_invoke_transaction_init(
 @pytest.mark.parametrize("overriding_path", [None])
 @patch("nile.core.types.transactions.Transaction._validate")
 @patch("nile.core.types.transactions.get_contract_class", return_value="ContractClass")
+@patch("nile.core.types.transactions.get_class_hash", return_value=777)
 async def test_declare_transaction_init(
+    mock_get_class_hash,
     mock_validate,
     mock_get_class,
     account_address,
@@ -211,7 +229,10 @@ async def test_invoke_transaction_init_defaults():
 
 @pytest.mark.asyncio
 @patch("nile.core.types.transactions.get_contract_class", return_value="ContractClass")
-async def test_declare_transaction_init_defaults(mock_get_contract_class):
+@patch("nile.core.types.transactions.get_class_hash", return_value=777)
+async def test_declare_transaction_init_defaults(
+    mock_get_class_hash, mock_get_contract_class
+):
     with patch(
         "nile.core.types.transactions.DeclareTransaction._get_tx_hash"
     ) as mock_get_tx_hash:
@@ -222,6 +243,7 @@ async def test_declare_transaction_init_defaults(mock_get_contract_class):
         assert tx.tx_type == "declare"
         assert tx.contract_to_submit is None
         assert tx.contract_class == "ContractClass"
+        assert tx.class_hash == 777
         assert tx.overriding_path is None
         assert tx.account_address == 0
         assert tx.max_fee == 0
@@ -267,40 +289,33 @@ async def test_deploy_account_transaction_init_defaults(mock_get_class_hash):
     return_value=TX_HASH,
 )
 @patch(
-    "nile.core.types.transactions.InvokeTransaction._get_execute_call_args",
-    return_value={"param": "value"},
+    "nile.core.types.transactions.InvokeTransaction._get_gateway_tx",
+    return_value=GATEWAY_TX,
 )
 @patch(
     "nile.core.types.transactions.status",
     return_value=TX_STATUS,
 )
 async def test_transaction_execute(
-    mock_status, mock_call_args, mock_get_tx_hash, watch_mode
+    mock_status, mock_gateway_tx, mock_get_tx_hash, watch_mode
 ):
     account = await MockAccount(KEY, NETWORK)
     mock_sig_r, mock_sig_s = account.signer.sign(TX_HASH)
-    with patch("nile.core.types.transactions.execute_call") as mock_execute_call:
-        mock_execute_call.return_value = f"Transaction hash: {hex(TX_HASH)}"
+    with patch("nile.starknet_cli.gateway.add_transaction") as mock_add_transaction:
+        mock_add_transaction.return_value = GATEWAY_RESPONSE
 
         tx = InvokeTransaction()
 
-        tx_status, output = await tx.execute(
-            account.signer, watch_mode=watch_mode, extra_param="extra_value"
-        )
+        tx_status, output = await tx.execute(account.signer, watch_mode=watch_mode)
 
         assert tx_status == TX_STATUS
-        assert output == f"Transaction hash: {hex(TX_HASH)}"
+        assert output == GATEWAY_RESPONSE
 
         # Check internals
-        mock_execute_call.assert_called_once_with(
-            tx.tx_type,
-            tx.network,
-            signature=[mock_sig_r, mock_sig_s],
-            max_fee=tx.max_fee,
-            query_flag=None,
-            param="value",
-            extra_param="extra_value",
+        mock_gateway_tx.assert_called_once_with(
+            signature=[mock_sig_r, mock_sig_s], version=tx.version
         )
+        mock_add_transaction.assert_called_once_with(GATEWAY_TX, tx.network)
         mock_status.assert_called_once_with(tx.hash, tx.network, watch_mode)
 
 
@@ -309,39 +324,74 @@ async def test_transaction_execute(
     "nile.core.types.transactions.InvokeTransaction._get_tx_hash",
     return_value=TX_HASH,
 )
+async def test_transaction_execute_unexpected_hash(mock_get_tx_hash):
+    account = await MockAccount(KEY, NETWORK)
+    with patch("nile.starknet_cli.gateway.add_transaction") as mock_add_transaction:
+        mock_add_transaction.return_value = {"transaction_hash": hex(TX_HASH_2)}
+
+        with pytest.raises(AssertionError, match="transaction hash is different"):
+            tx = InvokeTransaction(account_address=0x123, calldata=[])
+            await tx.execute(account.signer)
+
+
+@pytest.mark.asyncio
 @patch(
-    "nile.core.types.transactions.InvokeTransaction._get_execute_call_args",
-    return_value={"param": "value"},
+    "nile.core.types.transactions.InvokeTransaction._get_tx_hash",
+    return_value=TX_HASH,
+)
+@patch(
+    "nile.core.types.transactions.status",
+    return_value=TX_STATUS,
 )
-async def test_transaction_estimate_fee(mock_call_args, mock_get_tx_hash, caplog):
+async def test_transaction_submit(mock_status, mock_get_tx_hash):
+    account = await MockAccount(KEY, NETWORK)
+    with patch("nile.starknet_cli.gateway.add_transaction") as mock_add_transaction:
+        mock_add_transaction.return_value = GATEWAY_RESPONSE
+
+        tx = InvokeTransaction(account_address=0x123, calldata=[])
+        pending = await tx.submit(account.signer)
+
+        assert pending.tx is tx
+        assert pending.output == GATEWAY_RESPONSE
+        mock_status.assert_not_called()
+
+        assert await pending.wait() == TX_STATUS
+        mock_status.assert_called_once_with(tx.hash, tx.network, "track")
+
+
+@pytest.mark.asyncio
+@patch(
+    "nile.core.types.transactions.InvokeTransaction._get_tx_hash",
+    return_value=TX_HASH,
+)
+@patch(
+    "nile.core.types.transactions.InvokeTransaction._get_gateway_tx",
+    return_value=GATEWAY_TX,
+)
+async def test_transaction_estimate_fee(mock_gateway_tx, mock_get_tx_hash, caplog):
     account = await MockAccount(KEY, NETWORK)
     mock_sig_r, mock_sig_s = account.signer.sign(TX_HASH)
-    exp_output = 1000
-    with patch("nile.core.types.transactions.execute_call") as mock_execute_call:
-        mock_execute_call.return_value = f"The estimated fee is: {exp_output}"
+    with patch("nile.starknet_cli.gateway.estimate_fee") as mock_estimate_fee:
+        mock_estimate_fee.return_value = FEE_ESTIMATION
 
         tx = InvokeTransaction()
 
         # make logs visible to test
         logging.getLogger().setLevel(logging.INFO)
 
-        output = await tx.estimate_fee(account.signer, extra_param="extra_value")
+        output = await tx.estimate_fee(account.signer)
 
-        assert output == exp_output
+        assert output == FEE_ESTIMATION.overall_fee
 
         # Check internals
-        mock_execute_call.assert_called_once_with(
-            tx.tx_type,
-            tx.network,
+        mock_gateway_tx.assert_called_once_with(
             signature=[mock_sig_r, mock_sig_s],
-            max_fee=tx.max_fee,
-            query_flag="estimate_fee",
-            param="value",
-            extra_param="extra_value",
+            version=QUERY_VERSION_BASE + tx.version,
         )
+        mock_estimate_fee.assert_called_once_with(GATEWAY_TX, tx.network)
 
         # Check logs
-        assert f"The estimated fee is: {exp_output}" in caplog.text
+        assert "The estimated fee is: 1000 WEI (0.000000 ETH)." in caplog.text
 
 
 @pytest.mark.asyncio
@@ -350,37 +400,30 @@ async def test_transaction_estimate_fee(mock_call_args, mock_get_tx_hash, caplog
     return_value=TX_HASH,
 )
 @patch(
-    "nile.core.types.transactions.InvokeTransaction._get_execute_call_args",
-    return_value={"param": "value"},
+    "nile.core.types.transactions.InvokeTransaction._get_gateway_tx",
+    return_value=GATEWAY_TX,
 )
-async def test_transaction_simulate(mock_call_args, mock_get_tx_hash, caplog):
+async def test_transaction_simulate(mock_gateway_tx, mock_get_tx_hash, caplog):
     account = await MockAccount(KEY, NETWORK)
-    mock_sig_r, mock_sig_s = account.signer.sign(TX_HASH)
-    with patch("nile.core.types.transactions.execute_call") as mock_execute_call:
-        mock_execute_call.return_value = '\n\n\n\n{"response" : "simulated"}'
+    simulation = MagicMock(fee_estimation=FEE_ESTIMATION)
+    simulation.trace.dump.return_value = {"response": "simulated"}
+    with patch("nile.starknet_cli.gateway.simulate_transaction") as mock_simulate:
+        mock_simulate.return_value = simulation
 
         tx = InvokeTransaction()
 
         # make logs visible to test
         logging.getLogger().setLevel(logging.INFO)
 
-        output = await tx.simulate(account.signer, extra_param="extra_value")
+        output = await tx.simulate(account.signer)
 
         assert output == {"response": "simulated"}
 
         # Check internals
-        mock_execute_call.assert_called_once_with(
-            tx.tx_type,
-            tx.network,
-            signature=[mock_sig_r, mock_sig_s],
-            max_fee=tx.max_fee,
-            query_flag="simulate",
-            param="value",
-            extra_param="extra_value",
-        )
+        mock_simulate.assert_called_once_with(GATEWAY_TX, tx.network)
 
         # Check logs
-        assert '\n\n\n\n{"response" : "simulated"}' in caplog.text
+        assert "The estimated fee is: 1000 WEI" in caplog.text
 
 
 @pytest.mark.asyncio
@@ -408,6 +451,62 @@ async def test_transaction_update_fee(mock_execute, max_fee):
         assert output == "output"
 
 
+@pytest.mark.asyncio
+async def test_transaction_hashes_cached():
+    with patch(
+        "nile.core.types.transactions.InvokeTransaction._get_tx_hash"
+    ) as mock_get_tx_hash:
+        mock_get_tx_hash.return_value = TX_HASH
+
+        tx = InvokeTransaction()
+        mock_get_tx_hash.assert_not_called()
+
+        assert tx.query_hash == TX_HASH
+        assert tx.query_hash == TX_HASH
+        mock_get_tx_hash.assert_called_once()
+
+        mock_get_tx_hash.return_value = TX_HASH_2
+        for field_name, value in (("max_fee", 1), ("nonce", 2), ("calldata", [3])):
+            setattr(tx, field_name, value)
+            assert tx.hash == TX_HASH_2
+            assert tx.query_hash == TX_HASH_2
+
+        assert mock_get_tx_hash.call_count == 7
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "version", [TRANSACTION_VERSION, QUERY_VERSION_BASE + TRANSACTION_VERSION]
+)
+async def test_invoke_hash_calldata_cached(version):
+    calldata = list(range(100))
+    tx = InvokeTransaction(calldata=calldata, version=version)
+
+    assert tx.hash == calculate_transaction_hash_common(
+        tx_hash_prefix=TransactionHashPrefix.INVOKE,
+        version=version,
+        contract_address=tx.account_address,
+        entry_point_selector=0,
+        calldata=calldata,
+        max_fee=tx.max_fee,
+        chain_id=tx.chain_id,
+        additional_data=[tx.nonce],
+    )
+
+    with patch(
+        "nile.core.types.transactions.get_calldata_hash", return_value=CALLDATA_HASH
+    ) as mock_get_calldata_hash:
+        tx.update_fee(10)
+        tx.nonce = 1
+        assert tx.hash > 0
+        mock_get_calldata_hash.assert_not_called()
+
+        tx.calldata.append(100)
+        tx.calldata = tx.calldata
+        assert tx.hash > 0
+        mock_get_calldata_hash.assert_called_once()
+
+
 @pytest.mark.asyncio
 async def test_transaction_validate():
     with patch(
@@ -429,9 +528,15 @@ async def test_transaction_validate():
 
 @pytest.mark.asyncio
 @patch("nile.core.types.transactions.get_invoke_hash", return_value=TX_HASH)
-async def test_invoke_get_tx_hash(mock_get_invoke_hash):
+@patch("nile.core.types.transactions.get_calldata_hash", return_value=CALLDATA_HASH)
+async def test_invoke_get_tx_hash(mock_get_calldata_hash, mock_get_invoke_hash):
     tx = InvokeTransaction()
 
+    # Hashes are computed on first use
+    mock_get_invoke_hash.assert_not_called()
+    assert tx.hash == TX_HASH
+    assert tx.query_hash == TX_HASH
+
     # Assert call for tx_hash
     mock_get_invoke_hash.assert_any_call(
         tx.account_address,
@@ -440,6 +545,7 @@ async def test_invoke_get_tx_hash(mock_get_invoke_hash):
         tx.nonce,
         TRANSACTION_VERSION,
         tx.chain_id,
+        calldata_hash=CALLDATA_HASH,
     )
 
     # Assert call for query_hash
@@ -450,19 +556,31 @@ async def test_invoke_get_tx_hash(mock_get_invoke_hash):
         tx.nonce,
         QUERY_VERSION_BASE + TRANSACTION_VERSION,
         tx.chain_id,
+        calldata_hash=CALLDATA_HASH,
     )
 
+    # The calldata is hashed once for every tx hash
+    mock_get_calldata_hash.assert_called_once_with(())
+
 
 @pytest.mark.asyncio
 @patch("nile.core.types.transactions.get_declare_hash", return_value=TX_HASH)
 @patch("nile.core.types.transactions.get_contract_class", return_value="ContractClass")
-async def test_declare_get_tx_hash(mock_get_contract_class, mock_get_declare_hash):
+@patch("nile.core.types.transactions.get_class_hash", return_value=777)
+async def test_declare_get_tx_hash(
+    mock_get_class_hash, mock_get_contract_class, mock_get_declare_hash
+):
     tx = DeclareTransaction()
 
+    # Hashes are computed on first use
+    mock_get_declare_hash.assert_not_called()
+    assert tx.hash == TX_HASH
+    assert tx.query_hash == TX_HASH
+
     # Assert call for tx_hash
     mock_get_declare_hash.assert_any_call(
         tx.account_address,
-        tx.contract_class,
+        tx.class_hash,
         tx.max_fee,
         tx.nonce,
         TRANSACTION_VERSION,
@@ -472,13 +590,34 @@ async def test_declare_get_tx_hash(mock_get_contract_class, mock_get_declare_has
     # Assert call for query_hash
     mock_get_declare_hash.assert_any_call(
         tx.account_address,
-        tx.contract_class,
+        tx.class_hash,
         tx.max_fee,
         tx.nonce,
         QUERY_VERSION_BASE + TRANSACTION_VERSION,
         tx.chain_id,
     )
 
+    # The class is hashed once for every tx hash
+    mock_get_class_hash.assert_called_once()
+
+
+@pytest.mark.parametrize(
+    "version", [0, TRANSACTION_VERSION, QUERY_VERSION_BASE + TRANSACTION_VERSION]
+)
+@patch(
+    "starkware.starknet.core.os.transaction_hash.transaction_hash."
+    "compute_deprecated_class_hash",
+    return_value=777,
+)
+def test_get_declare_hash(mock_compute_class_hash, version):
+    args = {"max_fee": 15, "nonce": 3, "version": version, "chain_id": 4}
+
+    assert get_declare_hash(
+        account=0x1, class_hash=777, **args
+    ) == calculate_deprecated_declare_transaction_hash(
+        sender_address=0x1, contract_class="ContractClass", **args
+    )
+
 
 @pytest.mark.asyncio
 @patch("nile.core.types.transactions.get_deploy_account_hash", return_value=TX_HASH)
@@ -489,6 +628,11 @@ async def test_deploy_account_get_tx_hash(
 ):
     tx = DeployAccountTransaction()
 
+    # Hashes are computed on first use
+    mock_get_deploy_account_hash.assert_not_called()
+    assert tx.hash == TX_HASH
+    assert tx.query_hash == TX_HASH
+
     # Assert call for tx_hash
     mock_get_deploy_account_hash.assert_any_call(
         tx.predicted_address,
@@ -516,51 +660,56 @@ async def test_deploy_account_get_tx_hash(
 
 @pytest.mark.asyncio
 @patch("nile.core.types.transactions.get_invoke_hash", return_value=TX_HASH)
-async def test_invoke_get_execute_call_args(mock_get_invoke_hash):
-    tx = InvokeTransaction()
-
-    result = tx._get_execute_call_args()
-
-    assert result == {
-        "inputs": tx.calldata,
-        "address": hex_address(tx.account_address),
-        "abi": f"{NILE_ABIS_DIR}/Account.json",
-        "method": tx.entry_point,
-    }
+async def test_invoke_get_gateway_tx(mock_get_invoke_hash):
+    tx = InvokeTransaction(account_address=0x123, max_fee=10, nonce=2, calldata=[1])
+
+    result = tx._get_gateway_tx(signature=[3, 4], version=TRANSACTION_VERSION)
+
+    assert result == InvokeFunction(
+        sender_address=0x123,
+        calldata=[1],
+        max_fee=10,
+        nonce=2,
+        signature=[3, 4],
+        version=TRANSACTION_VERSION,
+    )
 
 
 @pytest.mark.asyncio
 @patch("nile.core.types.transactions.get_declare_hash", return_value=TX_HASH)
-@patch("nile.core.types.transactions.get_contract_class", return_value="ContractClass")
-async def test_declare_get_execute_call_args(
-    mock_get_contract_class, mock_get_declare_hash
+@patch("nile.core.types.transactions.get_contract_class", return_value=CONTRACT_CLASS)
+@patch("nile.core.types.transactions.get_class_hash", return_value=777)
+async def test_declare_get_gateway_tx(
+    mock_get_class_hash, mock_get_contract_class, mock_get_declare_hash
 ):
-    tx = DeclareTransaction()
+    tx = DeclareTransaction(account_address=0x123, max_fee=10, nonce=2)
 
-    result = tx._get_execute_call_args()
+    result = tx._get_gateway_tx(signature=[3, 4], version=TRANSACTION_VERSION)
 
-    assert result == {
-        "contract_name": tx.contract_to_submit,
-        "overriding_path": tx.overriding_path,
-        "sender": hex_address(tx.account_address),
-        "deprecated": True,
-    }
+    assert isinstance(result, DeprecatedDeclare)
+    assert result.contract_class == CONTRACT_CLASS
+    assert result.sender_address == 0x123
+    assert (result.max_fee, result.nonce) == (10, 2)
+    assert (result.signature, result.version) == ([3, 4], TRANSACTION_VERSION)
 
 
 @pytest.mark.asyncio
 @patch("nile.core.types.transactions.get_deploy_account_hash", return_value=TX_HASH)
 @patch("nile.core.types.transactions.get_contract_class", return_value="ContractClass")
 @patch("nile.core.types.transactions.get_class_hash", return_value=777)
-async def test_deploy_account_get_execute_call_args(
+async def test_deploy_account_get_gateway_tx(
     mock_get_class_hash, mock_get_contract_class, mock_get_deploy_account_hash
 ):
-    tx = DeployAccountTransaction()
-
-    result = tx._get_execute_call_args()
-
-    assert result == {
-        "salt": tx.salt,
-        "contract_name": tx.contract_to_submit,
-        "overriding_path": tx.overriding_path,
-        "calldata": tx.calldata,
-    }
+    tx = DeployAccountTransaction(salt=5, calldata=[1], max_fee=10)
+
+    result = tx._get_gateway_tx(signature=[3, 4], version=TRANSACTION_VERSION)
+
+    assert result == DeployAccount(
+        class_hash=777,
+        constructor_calldata=[1],
+        contract_address_salt=5,
+        max_fee=10,
+        nonce=0,
+        signature=[3, 4],
+        version=TRANSACTION_VERSION,
+    )
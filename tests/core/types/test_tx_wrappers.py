@@ -138,9 +138,11 @@ async def test_base_wrapper_update_fee(
 @pytest.mark.asyncio
 @pytest.mark.parametrize("watch_mode", [None, "track", "debug"])
 @patch("nile.core.types.transactions.get_contract_class", return_value="ContractClass")
+@patch("nile.core.types.transactions.get_class_hash", return_value=777)
 @patch("nile.core.types.tx_wrappers.declare", return_value="ret")
 async def test_declare_wrapper_execute(
     mock_declare,
+    mock_get_class_hash,
     mock_get_contract_class,
     watch_mode,
 ):
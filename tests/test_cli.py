@@ -11,7 +11,7 @@ from pathlib import Path
 from signal import SIGINT
 from threading import Timer
 from time import sleep
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, call, patch
 from urllib.error import URLError
 from urllib.request import urlopen
 
@@ -23,9 +23,11 @@ from nile.common import (
     ABIS_DIRECTORY,
     BUILD_DIRECTORY,
     CONTRACTS_DIRECTORY,
+    DATABASE_FILENAME,
+    DEPLOYMENTS_FILENAME,
     NODE_FILENAME,
 )
-from nile.utils import hex_class_hash
+from nile.utils import hex_address, hex_class_hash
 
 RESOURCES_DIR = Path(__file__).parent / "resources"
 MOCK_HASH = "0x123"
@@ -74,6 +76,21 @@ async def test_clean():
     assert result.exit_code == 0
 
 
+@pytest.mark.asyncio
+async def test_db(tmp_working_dir):
+    (tmp_working_dir / f"localhost.{DEPLOYMENTS_FILENAME}").write_text("0x1:a.json\n")
+
+    result = await CliRunner().invoke(cli, ["db", "import"])
+    assert result.exit_code == 0
+    assert (tmp_working_dir / DATABASE_FILENAME).exists()
+
+    result = await CliRunner().invoke(cli, ["db", "export"])
+    assert result.exit_code == 0
+    assert (tmp_working_dir / f"localhost.{DEPLOYMENTS_FILENAME}").read_text() == (
+        f"{hex_address(1)}:a.json\n"
+    )
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     "args, expected",
@@ -197,8 +214,10 @@ async def test_node_runs_gateway(opts, expected):
     ],
 )
 async def test_status(args):
-    with patch("nile.utils.status.execute_call", new=AsyncMock()) as mock_execute:
-        mock_execute.return_value = json.dumps({"tx_status": "ACCEPTED_ON_L2"})
+    with patch(
+        "nile.starknet_cli.gateway.get_transaction_status", new=AsyncMock()
+    ) as mock_get_status:
+        mock_get_status.return_value = {"tx_status": "ACCEPTED_ON_L2"}
 
         result = await CliRunner().invoke(cli, ["status", *args])
 
@@ -207,9 +226,87 @@ async def test_status(args):
 
         # Check internals
         network = args[2]
-        command_args = {"hash": hex_class_hash(MOCK_HASH)}
+        mock_get_status.assert_called_once_with(hex_class_hash(MOCK_HASH), network)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("from_file", [False, True])
+async def test_status_many(tmp_working_dir, from_file):
+    hashes = ["0x1", "0x2"]
+    if from_file:
+        (tmp_working_dir / "hashes.txt").write_text("\n".join(hashes) + "\n")
+        args = ["--from-file", "hashes.txt"]
+    else:
+        args = hashes
+
+    with patch("nile.cli.track_command", new=AsyncMock()) as mock_track:
+        result = await CliRunner().invoke(cli, ["status", "--track", *args])
+
+        assert result.exit_code == 0
+        mock_track.assert_called_once_with(
+            [1, 2], "localhost", watch_mode="track", contracts_file=None
+        )
 
-        mock_execute.assert_called_once_with("tx_status", network, **command_args)
+
+@pytest.mark.asyncio
+async def test_status_default_watch_mode():
+    with patch("nile.cli.status_command", new=AsyncMock()) as mock_status:
+        result = await CliRunner().invoke(cli, ["status", "0x1"])
+
+        # a single hash is tracked and debugged by default
+        assert result.exit_code == 0
+        mock_status.assert_awaited_once_with(
+            1, "localhost", watch_mode="debug", contracts_file=None
+        )
+
+
+@pytest.mark.asyncio
+async def test_status_many_without_watch_mode():
+    with patch("nile.cli.track_command", new=AsyncMock()) as mock_track, patch(
+        "nile.cli.status_command", new=AsyncMock()
+    ) as mock_status:
+        result = await CliRunner().invoke(cli, ["status", "0x1", "0x2"])
+
+        # a single query per transaction, instead of blocking until resolved
+        assert result.exit_code == 0
+        mock_track.assert_not_called()
+        assert mock_status.await_args_list == [
+            call(tx_hash, "localhost", watch_mode=None, contracts_file=None)
+            for tx_hash in [1, 2]
+        ]
+
+
+@pytest.mark.asyncio
+async def test_get_predeployed_accounts_seed():
+    with patch(
+        "nile.cli.get_predeployed_accounts_command", new=AsyncMock()
+    ) as mock_get_predeployed_accounts:
+        result = await CliRunner().invoke(
+            cli, ["get-accounts", "--predeployed", "--seed", "42"]
+        )
+
+        assert result.exit_code == 0
+        mock_get_predeployed_accounts.assert_awaited_once_with("localhost", 42)
+
+
+@pytest.mark.asyncio
+async def test_send_batch(tmp_working_dir):
+    calls = [["my_contract", "method", [1, 2]], ["0x123", "other", []]]
+    (tmp_working_dir / "calls.json").write_text(json.dumps(calls))
+
+    with patch("nile.cli.try_get_account", new=AsyncMock()) as mock_get_account:
+        account = mock_get_account.return_value
+        account.send_many = AsyncMock()
+        tx = account.send_many.return_value
+        tx.execute = AsyncMock()
+
+        result = await CliRunner().invoke(
+            cli, ["send", "ACCOUNT", "--batch", "calls.json", "--max_fee", "10"]
+        )
+
+        assert result.exit_code == 0
+        account.send_many.assert_called_once_with(calls, max_fee=10)
+        tx.execute.assert_called_once()
 
 
 @pytest.mark.asyncio
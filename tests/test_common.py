@@ -1,16 +1,28 @@
 """Tests for common library."""
 
 import json
+import os
+import shutil
+from unittest.mock import patch
 
 import pytest
 
 from nile.common import (
     DEFAULT_GATEWAYS,
+    NILE_BUILD_DIR,
+    NILE_CLASS_HASHES,
     NODE_FILENAME,
+    clear_artifact_caches,
+    get_account_class_hash,
+    get_class_hash,
+    get_contract_class,
+    get_class_hash_index_path,
     get_gateways,
+    load_class_hash_index,
     parse_information,
     prepare_params,
     stringify,
+    update_class_hash_index,
     write_node_json,
 )
 
@@ -29,6 +41,16 @@ def tmp_working_dir(monkeypatch, tmp_path):
     return tmp_path
 
 
+@pytest.fixture
+def artifacts(tmp_path):
+    clear_artifact_caches()
+    build_dir = tmp_path / "artifacts"
+    build_dir.mkdir()
+    shutil.copy(f"{NILE_BUILD_DIR}/Account.json", build_dir)
+    yield (str(build_dir), str(build_dir / "abis"))
+    clear_artifact_caches()
+
+
 @pytest.mark.parametrize(
     "args, expected",
     [
@@ -108,3 +130,146 @@ def test_write_node_json(args1, args2, gateways):
         result = fp.read()
         expected = json.dumps(gateways, indent=2)
         assert result == expected
+
+
+def test_get_contract_class_is_cached(artifacts):
+    with patch("nile.common.DeprecatedCompiledClass.loads") as mock_loads:
+        first = get_contract_class("Account", artifacts)
+        second = get_contract_class("Account", artifacts)
+
+    assert first is second
+    mock_loads.assert_called_once()
+
+
+def test_get_class_hash_is_cached(artifacts):
+    with patch(
+        "nile.common.compute_deprecated_class_hash", return_value=0x777
+    ) as mock_compute:
+        assert get_class_hash("Account", artifacts) == 0x777
+        assert get_class_hash("Account", artifacts) == 0x777
+
+    mock_compute.assert_called_once()
+
+
+def test_get_class_hash_invalidated_on_change(artifacts):
+    path = f"{artifacts[0]}/Account.json"
+    with patch(
+        "nile.common.compute_deprecated_class_hash", side_effect=[1, 2]
+    ) as mock_compute:
+        assert get_class_hash("Account", artifacts) == 1
+
+        # rewrite the artifact with a different mtime
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert get_class_hash("Account", artifacts) == 2
+        assert get_class_hash("Account", artifacts) == 2
+
+    assert mock_compute.call_count == 2
+
+
+def test_get_class_hash_reads_index(artifacts):
+    build_directory = artifacts[0]
+    with patch("nile.common.compute_deprecated_class_hash", return_value=0x777):
+        update_class_hash_index(["Account", "Missing"], build_directory)
+
+    index = load_class_hash_index(build_directory)
+    assert list(index) == ["Account"]
+    assert index["Account"]["class_hash"] == "0x777"
+
+    # a new process would only find the index
+    clear_artifact_caches()
+    with patch("nile.common.compute_deprecated_class_hash") as mock_compute:
+        assert get_class_hash("Account", artifacts) == 0x777
+    mock_compute.assert_not_called()
+
+
+def test_get_class_hash_ignores_stale_index(artifacts):
+    build_directory = artifacts[0]
+    with patch("nile.common.compute_deprecated_class_hash", return_value=0x777):
+        update_class_hash_index(["Account"], build_directory)
+
+    clear_artifact_caches()
+    with open(f"{build_directory}/Account.json", "a") as fp:
+        fp.write("\n")
+
+    with patch(
+        "nile.common.compute_deprecated_class_hash", return_value=0x888
+    ) as mock_compute:
+        assert get_class_hash("Account", artifacts) == 0x888
+    mock_compute.assert_called_once()
+
+
+def test_load_class_hash_index_corrupt(artifacts):
+    path = get_class_hash_index_path(artifacts[0])
+    os.makedirs(os.path.dirname(path))
+    with open(path, "w") as fp:
+        fp.write("{")
+
+    assert load_class_hash_index(artifacts[0]) == {}
+
+
+def test_get_account_class_hash_precomputed(artifacts):
+    with patch("nile.common.compute_deprecated_class_hash") as mock_compute:
+        assert get_account_class_hash() == NILE_CLASS_HASHES["Account"]
+    mock_compute.assert_not_called()
+
+
+def test_get_account_class_hash_verify(artifacts):
+    # hashes the bundled artifact for real
+    assert get_account_class_hash(verify=True) == NILE_CLASS_HASHES["Account"]
+
+    clear_artifact_caches()
+    with patch("nile.common.compute_deprecated_class_hash", return_value=0x777):
+        with pytest.raises(Exception, match="does not match its artifact"):
+            get_account_class_hash(verify=True)
+
+
+def test_get_contract_class_pickled(artifacts):
+    contract_class = get_contract_class("Account", artifacts)
+    assert os.path.exists(f"{artifacts[0]}/.cache/Account.pickle")
+
+    # a new process loads the pickled class instead of parsing the artifact
+    clear_artifact_caches()
+    with patch("nile.common.DeprecatedCompiledClass.loads") as mock_loads:
+        assert get_contract_class("Account", artifacts) == contract_class
+    mock_loads.assert_not_called()
+
+    clear_artifact_caches()
+    with open(f"{artifacts[0]}/Account.json", "a") as fp:
+        fp.write("\n")
+    with patch("nile.common.DeprecatedCompiledClass.loads") as mock_loads:
+        get_contract_class("Account", artifacts)
+    mock_loads.assert_called_once()
+
+
+def test_get_contract_class_stale_pickle_not_loaded(artifacts):
+    get_contract_class("Account", artifacts)
+
+    clear_artifact_caches()
+    with open(f"{artifacts[0]}/Account.json", "a") as fp:
+        fp.write("\n")
+
+    # the header is checked before unpickling anything
+    with patch("nile.common.pickle.loads") as mock_loads:
+        assert get_contract_class("Account", artifacts).abi is not None
+    mock_loads.assert_not_called()
+
+
+def test_get_contract_class_not_pickled_outside_project(
+    monkeypatch, artifacts, tmp_path
+):
+    # pickles are only used in the project's own build directory
+    (tmp_path / "other").mkdir()
+    monkeypatch.chdir(tmp_path / "other")
+
+    get_contract_class("Account", artifacts)
+    assert not os.path.exists(f"{artifacts[0]}/.cache")
+
+
+def test_get_contract_class_corrupt_pickle(artifacts):
+    os.makedirs(f"{artifacts[0]}/.cache")
+    with open(f"{artifacts[0]}/.cache/Account.pickle", "wb") as fp:
+        fp.write(b"corrupt")
+
+    assert get_contract_class("Account", artifacts).abi is not None
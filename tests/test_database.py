@@ -0,0 +1,174 @@
+"""Tests for the SQLite store of deployments, declarations and accounts."""
+
+import os
+
+import pytest
+
+from nile import accounts, database, deployments
+from nile.common import (
+    ACCOUNTS_FILENAME,
+    DATABASE_FILENAME,
+    DECLARATIONS_FILENAME,
+    DEPLOYMENTS_FILENAME,
+)
+from nile.core.clean import clean
+from nile.utils import hex_address
+
+NETWORK = "localhost"
+
+CLASS_HASH = 111
+PUBKEY = 222
+
+A_ADDR = 1
+A_ABI = "artifacts/abis/a.json"
+A_ABI_2 = "artifacts/abis/a2.json"
+A_ALIAS = "contractA"
+A_ALIAS_ALT = "altA"
+
+B_ADDR = 2
+B_ABI = "artifacts/abis/b.json"
+
+FILES = [
+    f"{NETWORK}.{DEPLOYMENTS_FILENAME}",
+    f"{NETWORK}.{DECLARATIONS_FILENAME}",
+    f"{NETWORK}.{ACCOUNTS_FILENAME}",
+]
+
+
+@pytest.fixture(autouse=True)
+def tmp_working_dir(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def db():
+    # creating the database enables it
+    database.get_connection()
+    assert database.is_enabled()
+
+
+def test_deployments(db):
+    deployments.register(A_ADDR, A_ABI, NETWORK, f"{A_ALIAS}:{A_ALIAS_ALT}")
+    deployments.register(B_ADDR, B_ABI, NETWORK, None)
+
+    assert list(deployments.load(A_ADDR, NETWORK)) == [(A_ADDR, A_ABI)]
+    assert list(deployments.load(A_ALIAS_ALT, NETWORK)) == [(A_ADDR, A_ABI)]
+    assert list(deployments.load(B_ADDR, NETWORK)) == [(B_ADDR, B_ABI)]
+    assert not deployments.exists(A_ALIAS, "goerli")
+
+    with pytest.raises(Exception, match=f"Alias {A_ALIAS} already exists"):
+        deployments.register(B_ADDR, B_ABI, NETWORK, A_ALIAS)
+
+    deployments.update_abi(A_ALIAS, A_ABI_2, NETWORK)
+    assert list(deployments.load(A_ADDR, NETWORK)) == [(A_ADDR, A_ABI_2)]
+
+    with pytest.raises(Exception, match="does not exist"):
+        deployments.update_abi("invalid", A_ABI, NETWORK)
+
+    deployments.unregister(A_ADDR, NETWORK, A_ALIAS)
+    assert not deployments.exists(A_ALIAS_ALT, NETWORK)
+    assert deployments.exists(B_ADDR, NETWORK)
+
+    # the files are not used
+    assert not any(os.path.exists(file) for file in FILES)
+
+
+def test_declarations(db):
+    deployments.register_class_hash(CLASS_HASH, NETWORK, A_ALIAS)
+
+    assert deployments.class_hash_exists(CLASS_HASH, NETWORK)
+    assert list(deployments.load_class(A_ALIAS, NETWORK)) == [CLASS_HASH]
+
+    with pytest.raises(Exception, match="already exists"):
+        deployments.register_class_hash(CLASS_HASH, NETWORK, None)
+
+    deployments.unregister(CLASS_HASH, NETWORK, None, is_declaration=True)
+    assert not deployments.class_hash_exists(CLASS_HASH, NETWORK)
+
+
+def test_accounts(db):
+    accounts.register(PUBKEY, A_ADDR, 0, A_ALIAS, NETWORK)
+
+    assert accounts.exists(PUBKEY, NETWORK)
+    assert next(accounts.load(PUBKEY, NETWORK)) == {
+        "address": A_ADDR,
+        "index": 0,
+        "alias": A_ALIAS,
+    }
+    assert accounts.current_index(NETWORK) == 1
+    assert accounts.load_all(NETWORK) == {
+        hex(PUBKEY): {"address": hex_address(A_ADDR), "index": 0, "alias": A_ALIAS}
+    }
+
+    with pytest.raises(Exception, match=f"already exists in {DATABASE_FILENAME}"):
+        accounts.register(PUBKEY, A_ADDR, 0, A_ALIAS, NETWORK)
+
+    accounts.unregister(hex_address(A_ADDR), NETWORK)
+    assert not accounts.exists(PUBKEY, NETWORK)
+    assert accounts.current_index(NETWORK) == 0
+
+
+def test_import_export(tmp_working_dir):
+    deployments.register(A_ADDR, A_ABI, NETWORK, f"{A_ALIAS}:{A_ALIAS_ALT}")
+    deployments.register(B_ADDR, B_ABI, NETWORK, None)
+    deployments.register_class_hash(CLASS_HASH, NETWORK, A_ALIAS)
+    accounts.register(PUBKEY, A_ADDR, 0, A_ALIAS, NETWORK)
+
+    contents = [(tmp_working_dir / file).read_text() for file in FILES]
+
+    assert database.import_files() == [NETWORK]
+    for file in FILES:
+        os.remove(file)
+
+    assert list(deployments.load(A_ALIAS_ALT, NETWORK)) == [(A_ADDR, A_ABI)]
+    assert list(deployments.load_class(A_ALIAS, NETWORK)) == [CLASS_HASH]
+    assert accounts.exists(PUBKEY, NETWORK)
+
+    # importing again replaces the rows instead of duplicating them
+    database.export_files()
+    database.import_files()
+    assert list(deployments.load(A_ADDR, NETWORK)) == [(A_ADDR, A_ABI)]
+
+    assert database.export_files() == [NETWORK]
+    assert [(tmp_working_dir / file).read_text() for file in FILES] == contents
+
+
+def test_import_failure(tmp_working_dir):
+    deployments.register(A_ADDR, A_ABI, NETWORK, A_ALIAS)
+    (tmp_working_dir / FILES[2]).write_text("{")
+
+    # a failed import doesn't create nile.db
+    with pytest.raises(ValueError):
+        database.import_files()
+    assert not database.is_enabled()
+
+    os.remove(FILES[2])
+    database.import_files()
+    os.remove(FILES[0])
+    deployments.register(B_ADDR, B_ABI, NETWORK, None)
+    (tmp_working_dir / FILES[2]).write_text("{")
+
+    # nor does it leave it half filled
+    with pytest.raises(ValueError):
+        database.import_files()
+    assert list(deployments.load(A_ALIAS, NETWORK)) == [(A_ADDR, A_ABI)]
+    assert deployments.exists(B_ADDR, NETWORK)
+    assert not os.path.exists(f"{DATABASE_FILENAME}.tmp")
+
+
+def test_export_without_database():
+    with pytest.raises(Exception, match=f"{DATABASE_FILENAME} does not exist"):
+        database.export_files()
+
+    assert not database.is_enabled()
+
+
+def test_clean(db):
+    deployments.register(A_ADDR, A_ABI, NETWORK, A_ALIAS)
+    deployments.register(B_ADDR, B_ABI, "goerli", None)
+
+    clean()
+
+    assert not deployments.exists(A_ADDR, NETWORK)
+    assert deployments.exists(B_ADDR, "goerli")
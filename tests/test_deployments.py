@@ -1,11 +1,20 @@
 """Tests for deployments file."""
 
 import logging
+from unittest.mock import patch
 
 import pytest
 
 from nile.common import DECLARATIONS_FILENAME, DEPLOYMENTS_FILENAME
-from nile.deployments import register, register_class_hash, unregister, update_abi
+from nile.deployments import (
+    get_registry,
+    load,
+    load_class,
+    register,
+    register_class_hash,
+    unregister,
+    update_abi,
+)
 from nile.utils import hex_address, hex_class_hash, normalize_number
 
 LOCALHOST = "localhost"
@@ -189,3 +198,51 @@ def test_register_class_hash():
     assert len(lines) == 1
 
     assert lines[0].strip() == f"{hex_class_hash(CLASS_HASH)}:{A_ALIAS}:{A_ALIAS_ALT}"
+
+
+def test_load_indexed():
+    register(normalize_number(A_ADDR), A_ABI, LOCALHOST, f"{A_ALIAS}:{A_ALIAS_ALT}")
+    register(normalize_number(B_ADDR), B_ABI, LOCALHOST, B_ALIAS)
+    register(normalize_number(A_ADDR), A_ABI_2, LOCALHOST, None)
+
+    a_entries = [(normalize_number(A_ADDR), A_ABI), (normalize_number(A_ADDR), A_ABI_2)]
+    assert list(load(normalize_number(A_ADDR), LOCALHOST)) == a_entries
+    assert list(load(A_ALIAS_ALT, LOCALHOST)) == [a_entries[0]]
+    assert list(load(B_ADDR, LOCALHOST)) == []
+    assert list(load(normalize_number(C_ADDR), LOCALHOST)) == []
+
+
+def test_load_parses_file_once():
+    register(normalize_number(A_ADDR), A_ABI, LOCALHOST, A_ALIAS)
+    registry = get_registry(f"{LOCALHOST}.{DEPLOYMENTS_FILENAME}")
+
+    with patch.object(registry, "_index", wraps=registry._index) as mock_index:
+        for _ in range(3):
+            assert list(load(A_ALIAS, LOCALHOST)) == [(normalize_number(A_ADDR), A_ABI)]
+        register(normalize_number(B_ADDR), B_ABI, LOCALHOST, B_ALIAS)
+        assert list(load(B_ALIAS, LOCALHOST)) == [(normalize_number(B_ADDR), B_ABI)]
+
+    # only the new line is indexed
+    assert mock_index.call_count == 1
+
+
+def test_load_reloads_changed_file():
+    register(normalize_number(A_ADDR), A_ABI, LOCALHOST, A_ALIAS)
+    assert list(load(B_ALIAS, LOCALHOST)) == []
+
+    # the file is edited by hand, or by another process
+    with open(f"{LOCALHOST}.{DEPLOYMENTS_FILENAME}", "a") as fp:
+        fp.write(f"{B_ADDR}:{B_ABI}:{B_ALIAS}\n")
+
+    assert list(load(B_ALIAS, LOCALHOST)) == [(normalize_number(B_ADDR), B_ABI)]
+
+    unregister(normalize_number(A_ADDR), LOCALHOST, A_ALIAS, A_ABI)
+    assert list(load(A_ALIAS, LOCALHOST)) == []
+
+
+def test_load_class_indexed():
+    register_class_hash(CLASS_HASH, LOCALHOST, A_ALIAS)
+
+    assert list(load_class(CLASS_HASH, LOCALHOST)) == [CLASS_HASH]
+    assert list(load_class(A_ALIAS, LOCALHOST)) == [CLASS_HASH]
+    assert list(load_class(A_ALIAS_ALT, LOCALHOST)) == []
@@ -4,7 +4,8 @@ Tests for nre module.
 Only unit tests for now.
 """
 
-from unittest.mock import patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
@@ -43,3 +44,28 @@ def test_nre_loaded_plugins(mock_plugins, plugin_name_and_object, will_fail):
     else:
         nre_result = nre.dummy_params(1, 2)
         assert 3 == nre_result
+
+
+@pytest.mark.asyncio
+async def test_nre_as_completed():
+    submitted = []
+
+    def mock_tx(name, delay):
+        async def wait(watch_mode):
+            await asyncio.sleep(delay)
+            return (name, watch_mode)
+
+        async def submit():
+            submitted.append(name)
+            return Mock(wait=wait)
+
+        return Mock(submit=AsyncMock(side_effect=submit))
+
+    transactions = [mock_tx("slow", 0.02), mock_tx("fast", 0)]
+    nre = NileRuntimeEnvironment()
+
+    statuses = [tx_status async for tx_status in nre.as_completed(transactions)]
+
+    # submitted in order, resolved as they complete
+    assert submitted == ["slow", "fast"]
+    assert statuses == [("fast", "track"), ("slow", "track")]
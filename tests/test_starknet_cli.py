@@ -1,15 +1,24 @@
 """Tests for starknet_cli module."""
 
+import asyncio
+import warnings
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from aiohttp import test_utils, web
+from starkware.starknet.public.abi import get_selector_from_name
 from starkware.starkware_utils.error_handling import StarkErrorCode
 
-from nile.common import get_chain_id
+from nile.common import (
+    GATEWAY_CONNECTIONS_LIMIT,
+    GATEWAY_CONNECTIONS_LIMIT_PER_HOST,
+    get_chain_id,
+)
 from nile.starknet_cli import (
     _add_args,
     capture_stdout,
+    gateway,
     get_feeder_url,
     get_gateway_response,
     get_gateway_url,
@@ -184,3 +193,143 @@ async def test_capture_stdout():
     output = await capture_stdout(helper())
 
     assert f"{STDOUT_1}\n{STDOUT_2}" in output
+
+
+@pytest.mark.asyncio
+async def test_capture_stdout_concurrent():
+    async def helper(text):
+        for _ in range(3):
+            print(text)
+            await asyncio.sleep(0)
+
+    outputs = await asyncio.gather(
+        capture_stdout(helper(STDOUT_1)), capture_stdout(helper(STDOUT_2))
+    )
+
+    assert outputs == ["\n".join([STDOUT_1] * 3), "\n".join([STDOUT_2] * 3)]
+
+
+@pytest.mark.asyncio
+async def test_capture_stdout_restored_on_error(capsys):
+    async def helper():
+        print(STDOUT_1)
+        raise ValueError("failed")
+
+    with pytest.raises(ValueError):
+        await capture_stdout(helper())
+
+    print(STDOUT_2)
+    assert capsys.readouterr().out == f"{STDOUT_2}\n"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "success, tx_response", [(True, TX_RECEIVED), (False, TX_FAILED)]
+)
+async def test_gateway_add_transaction(success, tx_response):
+    with patch(
+        "nile.starknet_cli.GatewayClient.add_transaction", new=AsyncMock()
+    ) as mock_client:
+        mock_client.return_value = tx_response
+
+        if success:
+            assert await gateway.add_transaction("tx", NETWORK) == tx_response
+        else:
+            with pytest.raises(BaseException, match="Failed to send transaction"):
+                await gateway.add_transaction("tx", NETWORK)
+
+        mock_client.assert_called_once_with(tx="tx")
+
+
+@pytest.mark.asyncio
+async def test_gateway_call_contract():
+    with patch(
+        "starkware.starknet.services.api.feeder_gateway.feeder_gateway_client."
+        "FeederGatewayClient.call_contract",
+        new=AsyncMock(return_value={"result": ["0x3e8", "0x0"]}),
+    ) as mock_client:
+        result = await gateway.call_contract(0x1234, "balanceOf", [1], NETWORK)
+
+        assert result == [1000, 0]
+        call_function = mock_client.call_args.kwargs["call_function"]
+        assert call_function.contract_address == 0x1234
+        assert call_function.entry_point_selector == get_selector_from_name("balanceOf")
+        assert call_function.calldata == [1]
+
+
+def test_client_pool_clients():
+    pool = gateway.ClientPool()
+    client = pool.get_feeder_gateway_client(NETWORK)
+
+    assert pool.get_feeder_gateway_client(NETWORK) is client
+    assert pool.get_feeder_gateway_client("goerli") is not client
+    assert pool.get_gateway_client(NETWORK) is not client
+    assert client.url == get_feeder_url(NETWORK)
+
+
+@pytest.mark.asyncio
+async def test_client_pool_session():
+    async with gateway.ClientPool(limit=3, limit_per_host=2) as pool:
+        session = pool.get_session()
+
+        assert pool.get_session() is session
+        assert session.connector.limit == 3
+        assert session.connector.limit_per_host == 2
+
+    assert session.closed
+    assert pool.get_session() is not session
+    await pool.close()
+
+
+def test_client_pool_session_other_loop():
+    pool = gateway.ClientPool()
+
+    async def get_session():
+        return pool.get_session()
+
+    session = asyncio.run(get_session())
+    connector = session.connector
+
+    # the session of a previous loop is closed, not leaked
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", ResourceWarning)
+        other = asyncio.run(get_session())
+
+        assert other is not session
+        assert session.closed
+        assert connector.closed
+
+        asyncio.run(pool.close())
+
+
+def test_get_client_pool_limits():
+    pool = gateway.get_client_pool(limit=7)
+    try:
+        assert pool.limit == 7
+        assert pool.limit_per_host == GATEWAY_CONNECTIONS_LIMIT_PER_HOST
+    finally:
+        pool.configure(limit=GATEWAY_CONNECTIONS_LIMIT)
+
+
+@pytest.mark.asyncio
+async def test_client_pool_keep_alive():
+    requests = []
+
+    async def handler(request):
+        requests.append(request.transport)
+        return web.json_response({"tx_status": "ACCEPTED_ON_L2"})
+
+    app = web.Application()
+    app.router.add_get("/feeder_gateway/get_transaction_status", handler)
+    async with test_utils.TestServer(app) as server:
+        async with gateway.ClientPool() as pool:
+            client = pool._get_client(
+                gateway._PooledFeederGatewayClient, str(server.make_url("/"))
+            )
+            for _ in range(3):
+                response = await client.get_transaction_status(tx_hash="0x1")
+                assert response == {"tx_status": "ACCEPTED_ON_L2"}
+
+    # all the requests went through the same connection
+    assert len(requests) == 3
+    assert len(set(requests)) == 1